@@ -18,6 +18,7 @@ from datetime import datetime, timedelta
 # Custom modules
 from src.data_loader import DataLoader
 from src.features import FeatureEngineer
+from src.feature_store import FeatureStore
 from src.preprocessing import Preprocessor
 from src.optimization import PromotionOptimizer
 from src.weather_service import get_current_weather
@@ -255,13 +256,29 @@ PLOTLY_LAYOUT = dict(
 
 @st.cache_data(ttl=3600)
 def load_data():
-    """Load and merge all data."""
+    """Materialize the partitioned merged dataset and return selector metadata."""
     loader = DataLoader()
-    raw = loader.load_raw_data()
-    df = loader.merge_data(raw)
+    manifest = loader.ensure_merged()
     holidays_raw = loader.get_holidays_raw()
-    stores, families = loader.get_store_families(df)
-    return df, holidays_raw, stores, families
+    return manifest, holidays_raw, manifest['stores'], manifest['families']
+
+@st.cache_data(ttl=3600)
+def load_series(store_nbr=None, family=None):
+    """Read only the partitions for the selected store/family."""
+    loader = DataLoader()
+    df = loader.load_partition(store_nbr=store_nbr, family=family)
+    return loader.complete_panel(df) if loader.panel_enabled else df
+
+@st.cache_data(ttl=3600)
+def load_features(store_nbr, family, columns):
+    """Ready features for one series from the feature store (computed on the fly if disabled)."""
+    store = FeatureStore()
+    if store.enabled:
+        return store.features(store_nbr=store_nbr, family=family, columns=list(columns))
+    _, holidays_raw, _, _ = load_data()
+    eng = FeatureEngineer()
+    return eng.create_features(load_series(store_nbr, family).copy(), holidays_df=holidays_raw,
+                               columns=list(columns))
 
 @st.cache_data(ttl=3600)
 def engineer_features(_df, _holidays_raw):
@@ -273,9 +290,11 @@ def engineer_features(_df, _holidays_raw):
 def load_model_artifacts():
     """Load trained model and scaler using the cross-version compatible robust loader."""
     from src.model import robust_load_keras_model
+    from src.preprocessing import ScalerBank
 
     model, scaler = None, None
     model_path = None
+    v_path = None
     base = 'models'
 
     try:
@@ -313,7 +332,18 @@ def load_model_artifacts():
                     "or run `python src/model_migration.py` from the terminal."
                 )
 
-        if os.path.exists('models/scaler.pkl'):
+        # The scaler recorded in the version's metadata (a per-series bank or a
+        # global scaler); the legacy models/scaler.pkl only for versions without one
+        meta_path = os.path.join(v_path, 'metadata.json') if v_path else None
+        scaler_file = None
+        if meta_path and os.path.exists(meta_path):
+            with open(meta_path) as f:
+                scaler_file = json.load(f).get('scaler')
+        if scaler_file == 'scaler_bank.pkl':
+            scaler = ScalerBank.load(os.path.join(v_path, scaler_file))
+        elif scaler_file:
+            scaler = joblib.load(os.path.join(v_path, scaler_file))
+        elif os.path.exists('models/scaler.pkl'):
             scaler = joblib.load('models/scaler.pkl')
 
     except Exception as e:
@@ -327,16 +357,22 @@ def load_model_artifacts():
 
 @st.cache_resource
 def load_lgbm_models():
-    """Load LightGBM models if available."""
+    """
+    Load LightGBM models if available: compiled NumPy forests when saved
+    (no lightgbm import), else boosters registered to load lazily on first predict.
+    """
     try:
-        from src.model import LightGBMModel
-        lgbm = LightGBMModel()
+        from src.compiled_trees import CompiledLightGBM
         base = 'models'
         versions = [d for d in os.listdir(base) if d.startswith('v') and d[1:].isdigit()] if os.path.exists(base) else []
         if versions:
             latest = sorted(versions, key=lambda x: int(x[1:]))[-1]
             lgbm_path = os.path.join(base, latest, 'lgbm')
+            if CompiledLightGBM.available(lgbm_path):
+                return CompiledLightGBM().load(lgbm_path)
             if os.path.exists(lgbm_path):
+                from src.model import LightGBMModel
+                lgbm = LightGBMModel()
                 lgbm.load(lgbm_path)
                 return lgbm
     except Exception:
@@ -367,7 +403,7 @@ def kpi_card(label, value, delta=None, delta_type='up'):
 # ======================================================================
 
 # Load everything
-df_raw, holidays_raw, stores_list, families_list = load_data()
+data_manifest, holidays_raw, stores_list, families_list = load_data()
 model, scaler = load_model_artifacts()
 lgbm_model = load_lgbm_models()
 
@@ -421,11 +457,10 @@ with st.sidebar:
         st.metric("Quito", f"{weather_data['temp']}°C", weather_data.get('condition', ''))
 
     st.divider()
-    st.caption(f"📊 Data: {len(df_raw):,} rows • {len(families_list)} families • {len(stores_list)} stores")
+    st.caption(f"📊 Data: {data_manifest['rows']:,} rows • {len(families_list)} families • {len(stores_list)} stores")
 
 # ---- FILTER DATA ----
-loader = DataLoader()
-df_store = loader.filter_subset(df_raw, store_nbr=selected_store, family=selected_family)
+df_store = load_series(store_nbr=selected_store, family=selected_family)
 
 # ---- HEADER ----
 st.markdown(f"""
@@ -453,8 +488,8 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
 # TAB 1: EXECUTIVE OVERVIEW
 # ======================================================================
 with tab1:
-    eng = FeatureEngineer()
-    df_feat = eng.create_features(df_store.copy(), holidays_df=holidays_raw, include_lags=True)
+    # Overview only reads calendar features (weekday heatmap)
+    df_feat = load_features(selected_store, selected_family, ('sales', 'onpromotion', 'day_of_week'))
 
     recent = df_feat.tail(30)
     avg_sales = recent['sales'].mean()
@@ -545,8 +580,9 @@ with tab1:
 with tab2:
     st.markdown("### 📊 Sales Forecasting Deep Dive")
 
-    eng2 = FeatureEngineer()
-    df_forecast = eng2.create_features(df_store.copy(), holidays_df=holidays_raw, include_lags=True)
+    # Plots raw sales against a moving-average baseline; no lag/rolling nodes needed
+    df_forecast = load_features(selected_store, selected_family,
+                                ('sales',) + tuple(FeatureEngineer().get_feature_columns(mode='lstm')))
 
     fc1, fc2 = st.columns([3, 1])
     with fc1:
@@ -712,7 +748,7 @@ with tab3:
     # Promo effectiveness by family
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("#### 📈 Historical Promo Effectiveness")
-    promo_eff = optimizer.promo_effectiveness_by_family(df_raw[df_raw['store_nbr'] == selected_store])
+    promo_eff = optimizer.promo_effectiveness_by_family(load_series(store_nbr=selected_store))
     if len(promo_eff) > 0:
         top_n = promo_eff.head(15)
         fig_eff = go.Figure(go.Bar(
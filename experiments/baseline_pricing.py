@@ -13,11 +13,10 @@ def run_baseline_simulation():
     
     # 1. Load Data
     loader = DataLoader()
-    raw = loader.load_raw_data()
-    df = loader.merge_data(raw)
-    
-    # Filter for our test store/product
-    df = df[(df['store_nbr'] == 1) & (df['family'] == 'GROCERY I')].copy()
+    loader.ensure_merged()
+
+    # Read only our test store/product partition
+    df = loader.load_partition(store_nbr=1, family='GROCERY I')
     
     # 2. Define a Simple Rule: "Always Price at Moving Average"
     # Logic: If we just kept the price stable at the monthly average, how much would we make?
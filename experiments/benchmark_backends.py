@@ -0,0 +1,177 @@
+"""
+Benchmark + parity check: pandas vs Polars backend for
+merge_data → create_features → prepare_lgbm_data.
+
+Usage:
+    python experiments/benchmark_backends.py            # real train data
+    python experiments/benchmark_backends.py --synthetic --days 1684
+                                     # full 54 stores × 33 families panel
+    python experiments/benchmark_backends.py --parity
+                                     # quick parity check on a small synthetic
+                                     # panel (no raw CSVs needed)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path so we can import 'src'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_loader import DataLoader, RAW_SCHEMAS
+from src.features import FeatureEngineer
+from src.preprocessing import Preprocessor
+from src.polars_backend import PolarsBackend
+
+
+def synthetic_raw(n_days, n_stores=54, n_families=33, missing=0.0, seed=42):
+    """
+    All raw tables for a store × family × day panel, typed like load_raw_data().
+    `missing` drops that share of train rows (closed days, late stores), so
+    the per-series lags see gaps as in train.csv.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2013-01-01', periods=n_days, freq='D')
+    stores = np.arange(1, n_stores + 1)
+    families = [f'FAMILY_{i:02d}' for i in range(n_families)]
+
+    grid = pd.MultiIndex.from_product([dates, stores, families], names=['date', 'store_nbr', 'family'])
+    train = grid.to_frame(index=False)
+    if missing:
+        train = train[rng.random(len(train)) >= missing].reset_index(drop=True)
+    train.insert(0, 'id', np.arange(len(train)))
+    train['sales'] = rng.gamma(2.0, 50.0, len(train))
+    train['onpromotion'] = rng.integers(0, 5, len(train))
+
+    store_table = pd.DataFrame({
+        'store_nbr': stores,
+        'city': [f'CITY_{i % 5}' for i in stores],
+        'state': [f'STATE_{i % 3}' for i in stores],
+        'type': [chr(ord('A') + i % 5) for i in stores],
+        'cluster': stores % 17,
+    })
+    oil_days = dates[dates.dayofweek < 5]  # no prices on weekends
+    oil = pd.DataFrame({'date': oil_days, 'dcoilwtico': 60 + rng.normal(0, 2, len(oil_days)).cumsum()})
+    hol_days = dates[rng.choice(n_days, size=max(n_days // 20, 1), replace=False)]
+    holidays = pd.DataFrame({
+        'date': hol_days,
+        'type': 'Holiday',
+        'locale': rng.choice(['National', 'Regional', 'Local'], len(hol_days)),
+        'locale_name': 'Ecuador',
+        'description': 'Synthetic',
+        'transferred': rng.random(len(hol_days)) < 0.1,
+    })
+    txn = pd.MultiIndex.from_product([dates, stores], names=['date', 'store_nbr']).to_frame(index=False)
+    txn = txn[rng.random(len(txn)) >= 0.05].reset_index(drop=True)
+    txn['transactions'] = rng.integers(500, 3000, len(txn))
+
+    raw = {'train': train, 'stores': store_table, 'oil': oil, 'holidays': holidays, 'transactions': txn}
+    for name, table in raw.items():
+        raw[name] = table.astype(RAW_SCHEMAS.get(name, {}))
+    return raw
+
+
+def assert_parity(left, right, label):
+    assert list(left.columns) == list(right.columns), f"{label}: column mismatch"
+    for col in left.columns:
+        a, b = left[col], right[col]
+        if a.dtype.kind in 'fiub' and b.dtype.kind in 'fiub':
+            np.testing.assert_allclose(a.values.astype(float), b.values.astype(float),
+                                       rtol=1e-4, atol=1e-3, err_msg=f"{label}: {col}")
+        else:
+            assert (a.astype(str).values == b.astype(str).values).all(), f"{label}: {col}"
+    print(f"  ✅ {label}: parity OK ({left.shape[0]:,} rows × {left.shape[1]} cols)")
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def run_parity(n_days=120, config_path='config/config.yaml'):
+    """
+    Small self-contained parity check (no raw CSVs): merge_data and
+    create_features on a gappy synthetic panel, with and without holidays.
+    """
+    print("--- 🔍 BACKEND PARITY: pandas vs polars (synthetic) ---")
+    raw = synthetic_raw(n_days, n_stores=4, n_families=3, missing=0.1)
+    loader = DataLoader(config_path)
+    eng = FeatureEngineer(config_path)
+    loader.backend = eng.backend = 'pandas'
+    backend = PolarsBackend(eng.lag_days, eng.rolling_windows, eng.rolling_stats, eng.ewm_spans)
+
+    merged_pd = loader.merge_data(raw)
+    merged_pl = backend.merge(raw)
+    assert_parity(merged_pd, merged_pl, 'merge_data')
+    for holidays in (raw['holidays'], None):
+        label = 'create_features' + (' (no holidays)' if holidays is None else '')
+        assert_parity(eng.create_features(merged_pd, holidays_df=holidays),
+                      backend.create_features(merged_pd, holidays), label)
+
+
+def run_benchmark(synthetic=False, n_days=1684, config_path='config/config.yaml'):
+    print("--- ⏱️ BACKEND BENCHMARK: pandas vs polars ---")
+    loader = DataLoader(config_path)
+    if synthetic:
+        raw = synthetic_raw(n_days)
+        holidays = raw['holidays']
+    else:
+        raw = loader.load_raw_data()
+        holidays = loader.get_holidays_raw()
+    print(f"Train rows: {len(raw['train']):,}")
+
+    eng = FeatureEngineer(config_path)
+    pre = Preprocessor(config_path)
+    feature_cols = eng.get_feature_columns(mode='lgbm')
+    cat_cols = pre.config['model']['lightgbm'].get('categorical_features', [])
+
+    # pandas path (stage by stage)
+    loader.backend = eng.backend = pre.backend = 'pandas'
+    merged_pd, t_merge_pd = timed(loader.merge_data, raw)
+    feat_pd, t_feat_pd = timed(eng.create_features, merged_pd, holidays_df=holidays)
+    (X_pd, y_pd), t_prep_pd = timed(pre.prepare_lgbm_data, feat_pd, feature_cols)
+
+    # polars path (stage by stage, for parity)
+    backend = PolarsBackend(eng.lag_days, eng.rolling_windows)
+    merged_pl, t_merge_pl = timed(backend.merge, raw)
+    feat_pl, t_feat_pl = timed(backend.create_features, merged_pl, holidays)
+    (X_pl, y_pl), t_prep_pl = timed(backend.lgbm_matrix, feat_pl, feature_cols, cat_cols)
+
+    # polars fused lazy plan (single collect at the model boundary)
+    (X_fused, y_fused), t_fused = timed(backend.build_lgbm_data, raw, holidays, feature_cols, cat_cols)
+
+    print("\nParity:")
+    assert_parity(merged_pd, merged_pl, 'merge_data')
+    assert_parity(feat_pd, feat_pl, 'create_features')
+    assert_parity(X_pd, X_pl, 'prepare_lgbm_data')
+    assert_parity(X_pd, X_fused, 'fused plan')
+    np.testing.assert_allclose(y_pd.values, y_fused.values, rtol=1e-6)
+
+    total_pd = t_merge_pd + t_feat_pd + t_prep_pd
+    print("\nTimings (seconds):")
+    print(f"  {'stage':<20}{'pandas':>10}{'polars':>10}{'speedup':>10}")
+    for stage, a, b in [('merge_data', t_merge_pd, t_merge_pl),
+                        ('create_features', t_feat_pd, t_feat_pl),
+                        ('prepare_lgbm_data', t_prep_pd, t_prep_pl),
+                        ('fused end-to-end', total_pd, t_fused)]:
+        print(f"  {stage:<20}{a:>10.2f}{b:>10.2f}{a / max(b, 1e-9):>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='pandas vs polars backend benchmark')
+    parser.add_argument('--synthetic', action='store_true',
+                        help='Benchmark a dense 54 × 33 × days synthetic panel')
+    parser.add_argument('--parity', action='store_true',
+                        help='Only check pandas / polars parity on a small synthetic panel')
+    parser.add_argument('--days', type=int, default=1684, help='Days in the synthetic panel')
+    parser.add_argument('--config', type=str, default='config/config.yaml')
+    args = parser.parse_args()
+    if args.parity:
+        run_parity(config_path=args.config)
+    else:
+        run_benchmark(args.synthetic, args.days, args.config)
@@ -0,0 +1,97 @@
+"""
+Benchmark + parity check: StreamingFeatureState next-day features vs a
+full FeatureEngineer.create_features rebuild.
+
+Usage:
+    python experiments/benchmark_feature_state.py            # real train data
+    python experiments/benchmark_feature_state.py --synthetic --days 400
+                                     # all 54 stores × 33 families (1,782 series)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path so we can import 'src'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_loader import DataLoader
+from src.features import FeatureEngineer
+from src.feature_state import StreamingFeatureState
+from benchmark_backends import synthetic_raw, timed
+
+
+def run_benchmark(synthetic=False, n_days=400, config_path='config/config.yaml',
+                  state_path='models/feature_state.pkl'):
+    print("--- ⏱️ FEATURE STATE BENCHMARK: streaming vs full rebuild ---")
+    loader = DataLoader(config_path)
+    if synthetic:
+        raw = synthetic_raw(n_days)
+        holidays = raw['holidays']
+    else:
+        raw = loader.load_raw_data()
+        holidays = loader.get_holidays_raw()
+    df = loader.merge_data(raw)
+    if loader.panel_enabled:
+        df = loader.complete_panel(df, holidays=holidays)
+
+    dates = np.sort(df['date'].unique())
+    last_day, next_day = dates[-2], dates[-1]
+    history = df[df['date'] <= last_day]
+    known = df[df['date'] == next_day]
+
+    eng = FeatureEngineer(config_path)
+    feature_cols = eng.get_feature_columns(mode='lgbm')
+
+    # Full rebuild: what scoring tomorrow costs without state
+    full, t_full = timed(eng.create_features, df, holidays_df=holidays)
+
+    state, t_warm = timed(StreamingFeatureState.from_history, history, holidays, config_path)
+    os.makedirs(os.path.dirname(state_path) or '.', exist_ok=True)
+    _, t_save = timed(state.save, state_path)
+    state, t_load = timed(StreamingFeatureState.load, state_path)
+
+    state.next_features(known)  # builds the calendar cache once
+    reps = 20
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        streamed = state.next_features(known)
+    t_next = (time.perf_counter() - t0) / reps
+
+    # Parity on the held-out day
+    expected = full[full['date'] == next_day]
+    keys = ['store_nbr', 'family']
+    joined = expected.assign(family=expected['family'].astype(str)).merge(
+        streamed.assign(family=streamed['family'].astype(str)), on=keys, suffixes=('', '_stream')
+    )
+    assert len(joined) == len(expected), "series mismatch"
+    for col in feature_cols:
+        np.testing.assert_allclose(joined[col].astype(float), joined[f'{col}_stream'].astype(float),
+                                   rtol=1e-4, atol=1e-3, equal_nan=True, err_msg=col)
+    print(f"\n  ✅ parity OK: {len(streamed):,} series × {len(feature_cols)} features on {pd.Timestamp(next_day).date()}")
+
+    _, t_update = timed(state.update, known)
+
+    print("\nTimings:")
+    print(f"  {'full create_features':<26}{t_full:>10.3f}s")
+    print(f"  {'warm-up from history':<26}{t_warm:>10.3f}s  (once)")
+    print(f"  {'save / load state':<26}{t_save:>6.3f}s / {t_load:.3f}s")
+    print(f"  {'next_features (all series)':<26}{t_next * 1000:>9.2f}ms")
+    print(f"  {'update (ingest one day)':<26}{t_update * 1000:>9.2f}ms")
+    print(f"  speedup vs full rebuild: {t_full / max(t_next, 1e-9):,.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Streaming feature state benchmark')
+    parser.add_argument('--synthetic', action='store_true',
+                        help='Benchmark a dense 54 × 33 × days synthetic panel')
+    parser.add_argument('--days', type=int, default=400, help='Days in the synthetic panel')
+    parser.add_argument('--config', type=str, default='config/config.yaml')
+    parser.add_argument('--state', type=str, default='models/feature_state.pkl',
+                        help='Where to write the serialized state')
+    args = parser.parse_args()
+    run_benchmark(args.synthetic, args.days, args.config, args.state)
@@ -8,9 +8,9 @@ from tensorflow.keras.models import load_model
 # Add parent dir to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.data_loader import DataLoader
-from src.features import FeatureEngineer
-from src.preprocessing import Preprocessor
+from src.feature_store import FeatureStore
+from src.model import ModelRegistry
+from src.preprocessing import ScalerBank
 
 def run_ai_simulation():
     print("--- 🤖 RUNNING AI DYNAMIC PRICING SIMULATION ---")
@@ -18,26 +18,31 @@ def run_ai_simulation():
     # 1. Load Model & Scaler
     try:
         model = load_model('models/lstm_grocery_v1.h5')
-        scaler = joblib.load('models/scaler.pkl')
+        # The scaler recorded with the latest version (a per-series bank or a
+        # global scaler); the legacy global scaler only for versions without one
+        try:
+            metadata, version_path = ModelRegistry().load_version()
+        except (ValueError, FileNotFoundError):
+            metadata, version_path = {}, None
+        scaler_file = metadata.get('scaler')
+        if scaler_file == 'scaler_bank.pkl':
+            bank = ScalerBank.load(os.path.join(version_path, scaler_file))
+        elif scaler_file:
+            bank = ScalerBank.from_scaler(joblib.load(os.path.join(version_path, scaler_file)))
+        else:
+            bank = ScalerBank.from_scaler(joblib.load('models/scaler.pkl'))
         print("✅ Model and Scaler loaded.")
     except:
         print("❌ Error: Model not found. Run main.py first.")
         return
 
     # 2. Load Recent Data (Last 30 days) to predict "Tomorrow"
-    loader = DataLoader()
-    raw = loader.load_raw_data()
-    df = loader.merge_data(raw)
-    df = df[(df['store_nbr'] == 1) & (df['family'] == 'GROCERY I')].sort_values('date')
-    
-    # Process
-    eng = FeatureEngineer()
-    df_feat = eng.create_features(df)
-    
-    pre = Preprocessor()
-    # We need to scale it using the LOADED scaler, not a new one
-    pre.scaler = scaler 
+    # Ready features from the feature store (rebuilt only if the data changed)
+    df_feat = FeatureStore().features(store_nbr=1, family='GROCERY I')
     
+    # Statistics of this (store, family); unknown series fall back to the global fit
+    series_id = bank.lookup(pd.DataFrame({'store_nbr': [1], 'family': ['GROCERY I']}))
+
     # Prepare last 30 days
     last_30_days = df_feat.tail(30).copy()
     
@@ -45,8 +50,8 @@ def run_ai_simulation():
     cols = ['sales'] + [c for c in last_30_days.columns if c != 'sales' and c != 'date']
     last_30_days = last_30_days[cols]
     
-    # Transform
-    scaled_data = scaler.transform(last_30_days)
+    # Transform with the LOADED statistics, not a new fit
+    scaled_data = bank.transform(last_30_days, series_id)
     
     # Reshape for LSTM (1 sample, 30 timesteps, 7 features)
     input_seq = scaled_data.reshape(1, 30, -1)
@@ -54,10 +59,8 @@ def run_ai_simulation():
     # 3. Predict Revenue for Tomorrow
     predicted_scaled = model.predict(input_seq, verbose=0)
     
-    # Inverse transform to get real money value
-    dummy = np.zeros((1, 7))
-    dummy[0, 0] = predicted_scaled[0, 0]
-    predicted_sales = scaler.inverse_transform(dummy)[0, 0]
+    # Inverse transform the sales column only to get real money value
+    predicted_sales = bank.inverse_transform(predicted_scaled[:, 0], series_id, columns=['sales'])[0]
     
     print(f"🔮 AI Predicted Sales Revenue for Tomorrow: ${predicted_sales:.2f}")
 
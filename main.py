@@ -6,10 +6,14 @@ Usage:
     python main.py --model lstm       # Train LSTM only
     python main.py --model lgbm       # Train LightGBM only
     python main.py --store 1 --family "GROCERY I"  # Train on specific store/family
+    python main.py --append new_day.csv [--append-transactions new_txn.csv]
+                                      # Ingest new days into the merged dataset only
+    python main.py --tune [--tune-budget 1800]
+                                      # Search LightGBM params per family (no training)
 """
 
 import argparse
-from src.pipeline import Pipeline
+from src.data_loader import DataLoader
 
 
 def main():
@@ -23,14 +27,46 @@ def main():
                         help='Filter to specific product family')
     parser.add_argument('--config', type=str, default='config/config.yaml',
                         help='Path to config file')
+    parser.add_argument('--append', type=str, default=None,
+                        help='CSV of new train rows to append to the merged dataset (no training)')
+    parser.add_argument('--append-transactions', type=str, default=None,
+                        help='CSV of transactions for the appended days')
+    parser.add_argument('--tune', action='store_true',
+                        help='Tune LightGBM params per family and save them to the registry (no training)')
+    parser.add_argument('--tune-budget', type=float, default=None,
+                        help='Seconds for --tune (default model.lightgbm.tuning.time_budget_s)')
     args = parser.parse_args()
 
+    if args.append:
+        loader = DataLoader(args.config)
+        loader.ensure_merged()
+        manifest = loader.append(args.append, args.append_transactions)
+        print(f"📥 Merged dataset: {manifest['rows']:,} rows, watermark {manifest['watermark']}")
+        return
+
     print("=" * 60)
     print("🚀 Store Sales Forecasting — Training Pipeline v2.0")
     print("=" * 60)
 
+    # Imported here: spawned LightGBM workers re-import this module, and
+    # src.pipeline would load TensorFlow in each of them
+    from src.pipeline import Pipeline
+
     pipeline = Pipeline(config_path=args.config)
 
+    if args.tune:
+        best = pipeline.tune(store_nbr=args.store, family=args.family, time_budget=args.tune_budget)
+        print("\n" + "=" * 60)
+        print("🔎 TUNING SUMMARY")
+        print("=" * 60)
+        for fam, entry in best.items():
+            baseline = entry['baseline_score']
+            baseline = f"{baseline:.4f}" if baseline is not None else 'n/a'
+            print(f"  {fam}: rmse {entry['score']:.4f} (baseline {baseline}, "
+                  f"trial {entry['trial']}/{entry['n_trials']})")
+        print("=" * 60)
+        return
+
     train_lstm = args.model in ('all', 'lstm')
     train_lgbm = args.model in ('all', 'lgbm')
 
@@ -1,10 +1,33 @@
 __version__ = "2.0.0"
 
-from .data_loader import DataLoader
-from .features import FeatureEngineer
-from .preprocessing import Preprocessor
-from .model import AttentionLSTMModel, LightGBMModel, EnsembleModel, ModelRegistry
-from .evaluation import Evaluator
-from .optimization import PromotionOptimizer
-from .anomaly_detection import AnomalyDetector
-from .pipeline import Pipeline
\ No newline at end of file
+# Submodules are imported on first attribute access, so e.g.
+# `from src.compiled_trees import CompiledLightGBM` does not pull in
+# TensorFlow / LightGBM through src.model.
+_EXPORTS = {
+    'DataLoader': '.data_loader',
+    'SalesCube': '.sales_cube',
+    'FeatureEngineer': '.features',
+    'FeatureStore': '.feature_store',
+    'StreamingFeatureState': '.feature_state',
+    'Preprocessor': '.preprocessing',
+    'ScalerBank': '.preprocessing',
+    'AttentionLSTMModel': '.model',
+    'LightGBMModel': '.model',
+    'EnsembleModel': '.model',
+    'ModelRegistry': '.model',
+    'CompiledLightGBM': '.compiled_trees',
+    'Evaluator': '.evaluation',
+    'PromotionOptimizer': '.optimization',
+    'AnomalyDetector': '.anomaly_detection',
+    'Pipeline': '.pipeline',
+    'LightGBMTuner': '.tuning',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import importlib
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,308 @@
+"""
+Compiled Trees Module — v2.0
+LightGBM boosters compiled to flat NumPy arrays and scored without lightgbm.
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+
+MISSING_NONE, MISSING_ZERO, MISSING_NAN = 0, 1, 2
+ZERO_THRESHOLD = 1e-35  # LightGBM's kZeroThreshold
+CHUNK_CELLS = 1 << 15   # (rows x trees) walked at once; keeps the step arrays in cache
+OUTPUT_TRANSFORMS = {
+    'regression': None, 'regression_l1': None, 'huber': None, 'fair': None,
+    'quantile': None, 'mape': None,
+    'poisson': np.exp, 'gamma': np.exp, 'tweedie': np.exp,
+}
+
+
+class CompiledForest:
+    """
+    All trees of one booster as flat per-node arrays.
+
+    Node i of the forest is either a split (feature >= 0) or a leaf
+    (feature == -1, value in leaf_value, children pointing at itself):
+
+      feature, threshold, left, right      split feature / numeric threshold / children
+      default_left, missing_type           where missing values go (None / Zero / NaN)
+      is_categorical, cat_start, cat_words categorical splits: rows whose integer
+                                           category bit is set in
+                                           cat_bits[cat_start : cat_start + cat_words]
+                                           go left
+      roots                                root node of every tree
+
+    predict() walks every (row, tree) pair one level per step with vectorized
+    gathers over cache-sized row chunks, so a batch and a single row use the
+    same code path. It follows LightGBM's NumericalDecision /
+    CategoricalDecision rules and matches Booster.predict to float round-off.
+    """
+
+    ARRAYS = ('feature', 'threshold', 'left', 'right', 'default_left', 'missing_type',
+              'is_categorical', 'cat_start', 'cat_words', 'cat_bits', 'leaf_value', 'roots')
+
+    def __init__(self, arrays, feature_names, objective='regression', pandas_categorical=None,
+                 max_depth=0):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.feature_names = list(feature_names)
+        self.objective = objective
+        self.pandas_categorical = pandas_categorical
+        self.max_depth = int(max_depth)
+
+        # Evaluation tables: children interleaved (left, right) so a step is one
+        # gather, and the side NaN takes resolved per node ahead of time
+        self._children = np.column_stack([self.left, self.right]).ravel()
+        self._is_leaf = self.feature < 0
+        numeric_nan_left = np.where(self.missing_type == MISSING_NONE, 0.0 <= self.threshold, self.default_left)
+        self._nan_left = np.where(self.is_categorical, False, numeric_nan_left)
+        self._zero_missing = (self.missing_type == MISSING_ZERO) & ~self.is_categorical
+        self._has_zero_missing = bool(self._zero_missing.any())
+        self._has_categorical = bool(self.is_categorical.any())
+
+    # ------------------------------------------------------------------
+    # Compile
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_dump(cls, dump):
+        """Build from Booster.dump_model() output (the dict, not the JSON text)."""
+        objective = dump.get('objective', 'regression').split(' ')[0]
+        if objective not in OUTPUT_TRANSFORMS:
+            raise ValueError(f"Unsupported objective for compiled trees: {objective}")
+
+        nodes = {name: [] for name in cls.ARRAYS if name not in ('cat_bits', 'roots')}
+        cat_bits, roots = [], []
+        max_depth = 0
+
+        def add(node, depth):
+            nonlocal max_depth
+            max_depth = max(max_depth, depth)
+            idx = len(nodes['feature'])
+            for values in nodes.values():
+                values.append(0)
+            if 'split_index' not in node:
+                nodes['feature'][idx] = -1
+                nodes['left'][idx] = nodes['right'][idx] = idx
+                nodes['leaf_value'][idx] = node['leaf_value']
+                return idx
+
+            nodes['feature'][idx] = node['split_feature']
+            nodes['default_left'][idx] = bool(node.get('default_left', False))
+            nodes['missing_type'][idx] = {'None': MISSING_NONE, 'Zero': MISSING_ZERO,
+                                          'NaN': MISSING_NAN}[node.get('missing_type', 'None')]
+            if node['decision_type'] == '==':
+                categories = [int(c) for c in str(node['threshold']).split('||')]
+                words = np.zeros(max(categories) // 32 + 1, dtype=np.uint32)
+                for c in categories:
+                    words[c // 32] |= np.uint32(1 << (c % 32))
+                nodes['is_categorical'][idx] = True
+                nodes['cat_start'][idx] = sum(len(w) for w in cat_bits)
+                nodes['cat_words'][idx] = len(words)
+                cat_bits.append(words)
+            else:
+                nodes['threshold'][idx] = float(node['threshold'])
+            nodes['left'][idx] = add(node['left_child'], depth + 1)
+            nodes['right'][idx] = add(node['right_child'], depth + 1)
+            return idx
+
+        for tree in dump['tree_info']:
+            roots.append(add(tree['tree_structure'], 0))
+
+        dtypes = {'feature': np.int32, 'threshold': np.float64, 'left': np.int32, 'right': np.int32,
+                  'default_left': bool, 'missing_type': np.int8, 'is_categorical': bool,
+                  'cat_start': np.int64, 'cat_words': np.int64, 'leaf_value': np.float64}
+        arrays = {name: np.asarray(values, dtype=dtypes[name]) for name, values in nodes.items()}
+        arrays['cat_bits'] = np.concatenate(cat_bits) if cat_bits else np.zeros(1, dtype=np.uint32)
+        arrays['roots'] = np.asarray(roots, dtype=np.int32)
+        return cls(arrays, dump['feature_names'], objective, dump.get('pandas_categorical'), max_depth)
+
+    # ------------------------------------------------------------------
+    # Predict
+    # ------------------------------------------------------------------
+
+    def feature_name(self):
+        """Training feature names (same call as lgb.Booster, for routing)."""
+        return list(self.feature_names)
+
+    def predict(self, X):
+        """
+        Parameters
+        ----------
+        X : DataFrame with the training feature columns, 2-D array in
+            feature_name() order, or a single 1-D row
+
+        Returns
+        -------
+        np.ndarray of predictions, one per row
+        """
+        data = self._matrix(X)
+        rows_per_chunk = max(1, CHUNK_CELLS // max(len(self.roots), 1))
+        if len(data) <= rows_per_chunk:
+            raw = self._walk(data)
+        else:
+            raw = np.concatenate([self._walk(data[lo:lo + rows_per_chunk])
+                                  for lo in range(0, len(data), rows_per_chunk)])
+        transform = OUTPUT_TRANSFORMS[self.objective]
+        return transform(raw) if transform is not None else raw
+
+    def _walk(self, data):
+        """
+        Sum of leaf values over all trees for a block of rows. The active
+        (row, tree) pairs are compacted every level, so deep trees only cost
+        the pairs still descending them.
+        """
+        n_rows, n_features = data.shape
+        flat = data.ravel()
+        node = np.tile(self.roots, n_rows)
+        row = np.repeat(np.arange(n_rows), len(self.roots))
+        offset = row * n_features
+        raw = np.zeros(n_rows)
+
+        while len(node):
+            at_leaf = self._is_leaf[node]
+            if at_leaf.any():
+                raw += np.bincount(row[at_leaf], weights=self.leaf_value[node[at_leaf]], minlength=n_rows)
+                descend = ~at_leaf
+                node, row, offset = node[descend], row[descend], offset[descend]
+                if not len(node):
+                    break
+
+            fval = flat[offset + self.feature[node]]
+            go_left = fval <= self.threshold[node]
+            is_nan = np.isnan(fval)
+            if is_nan.any():
+                go_left = np.where(is_nan, self._nan_left[node], go_left)
+            if self._has_zero_missing:
+                is_zero = self._zero_missing[node] & (np.abs(fval) <= ZERO_THRESHOLD)
+                go_left = np.where(is_zero, self.default_left[node], go_left)
+            if self._has_categorical:
+                cat = self.is_categorical[node]
+                if cat.any():
+                    go_left = np.where(cat, self._in_category(node, fval, is_nan), go_left)
+            node = self._children[2 * node + ~go_left]
+
+        return raw
+
+    def _in_category(self, node, fval, is_nan):
+        """CategoricalDecision: NaN / negative go right, else test the category bit."""
+        code = np.where(is_nan | (fval < 0), -1, np.nan_to_num(fval)).astype(np.int64)
+        word = code // 32
+        valid = (code >= 0) & (word < self.cat_words[node])
+        bits = self.cat_bits[np.where(valid, self.cat_start[node] + word, 0)]
+        return valid & (((bits >> (code % 32).astype(np.uint32)) & 1) == 1)
+
+    def _matrix(self, X):
+        """Float64 (rows, features) matrix in training column order."""
+        if isinstance(X, pd.DataFrame):
+            if list(X.columns) != self.feature_names:  # column selection dominates single-row cost
+                X = X[self.feature_names]
+            if self.pandas_categorical:
+                cat_cols = [c for c in X.columns if isinstance(X[c].dtype, pd.CategoricalDtype)]
+                X = X.copy()
+                for col, categories in zip(cat_cols, self.pandas_categorical):
+                    codes = pd.Categorical(X[col], categories=categories).codes
+                    X[col] = np.where(codes < 0, np.nan, codes)
+            return X.to_numpy(dtype=np.float64, na_value=np.nan)
+        data = np.asarray(X, dtype=np.float64)
+        return data[None, :] if data.ndim == 1 else data
+
+    # ------------------------------------------------------------------
+    # Persistence (numpy only)
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        meta = {
+            'feature_names': self.feature_names,
+            'objective': self.objective,
+            'pandas_categorical': self.pandas_categorical,
+            'max_depth': self.max_depth,
+        }
+        np.savez(path, meta=np.array(json.dumps(meta)),
+                 **{name: getattr(self, name) for name in self.ARRAYS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as f:
+            meta = json.loads(str(f['meta']))
+            arrays = {name: f[name] for name in cls.ARRAYS}
+        return cls(arrays, meta['feature_names'], meta['objective'],
+                   meta['pandas_categorical'], meta['max_depth'])
+
+
+def compile_booster(model):
+    """Compile an lgb.Booster (or fitted LGBMRegressor) via its dump_model()."""
+    booster = getattr(model, 'booster_', model)
+    return CompiledForest.from_dump(booster.dump_model())
+
+
+def route_predict(models, X, families):
+    """
+    Score rows from many families: group row indices per family once, call
+    each family's model (or models['global']) a single time on its contiguous
+    block and scatter the results back to the input row order.
+
+    Returns
+    -------
+    (predictions with NaN where no model applies, list of families without a model)
+    """
+    codes, names = pd.factorize(np.asarray(families))
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+    ordered = X.iloc[order]
+
+    pred = np.full(len(X), np.nan)
+    missing = []
+    for fam, lo, hi in zip(names, bounds[:-1], bounds[1:]):
+        model = models[fam] if fam in models else models.get('global')
+        if model is None:
+            missing.append(fam)
+            continue
+        cols = getattr(model, 'booster_', model).feature_name()
+        pred[order[lo:hi]] = model.predict(ordered.iloc[lo:hi][cols])
+    return pred, missing
+
+
+class CompiledLightGBM:
+    """
+    Read-only stand-in for LightGBMModel that scores compiled forests.
+    Loads the compiled_*.npz files listed in a saved model directory's
+    lgbm_manifest.json; needs numpy and pandas only.
+    """
+
+    def __init__(self):
+        self.models = {}  # family_name -> CompiledForest
+
+    @classmethod
+    def available(cls, path):
+        """True when `path` holds compiled forests."""
+        manifest_path = os.path.join(path, 'lgbm_manifest.json')
+        if not os.path.exists(manifest_path):
+            return False
+        with open(manifest_path, 'r') as f:
+            return bool(json.load(f).get('compiled'))
+
+    def load(self, path):
+        with open(os.path.join(path, 'lgbm_manifest.json'), 'r') as f:
+            manifest = json.load(f)
+        self.models = {family: CompiledForest.load(os.path.join(path, fname))
+                       for family, fname in manifest.get('compiled', {}).items()}
+        print(f"Loaded {len(self.models)} compiled LightGBM models from {path}")
+        return self
+
+    def predict(self, X, family_name='global'):
+        if family_name in self.models:
+            return self.models[family_name].predict(X)
+        elif 'global' in self.models:
+            return self.models['global'].predict(X)
+        else:
+            raise ValueError(f"No model found for family '{family_name}'")
+
+    def predict_batch(self, X, families=None, family_col='family'):
+        """Same routing as LightGBMModel.predict_batch."""
+        pred, missing = route_predict(self.models, X, X[family_col] if families is None else families)
+        if missing:
+            print(f"[WARNING] No LightGBM model for families {missing} — left as NaN")
+        return pred
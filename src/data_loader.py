@@ -3,9 +3,48 @@ Data Loader Module — v2.0
 Loads and merges Corporación Favorita datasets with multi-store/family support.
 """
 
+import numpy as np
 import pandas as pd
 import os
+import json
+import time
+import shutil
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+
+from .polars_backend import PolarsBackend, polars_available
+
+
+# Compact on-disk / in-memory schema per raw table. Columns not listed keep
+# the dtype inferred by pandas; 'date' is always parsed to datetime64.
+RAW_SCHEMAS = {
+    'train': {
+        'id': 'int32', 'store_nbr': 'int16', 'family': 'category',
+        'sales': 'float32', 'onpromotion': 'int16',
+    },
+    'test': {
+        'id': 'int32', 'store_nbr': 'int16', 'family': 'category', 'onpromotion': 'int16',
+    },
+    'stores': {
+        'store_nbr': 'int16', 'city': 'category', 'state': 'category',
+        'type': 'category', 'cluster': 'int16',
+    },
+    'oil': {'dcoilwtico': 'float32'},
+    'holidays': {
+        'type': 'category', 'locale': 'category', 'locale_name': 'category',
+        'transferred': 'bool',
+    },
+    'transactions': {'store_nbr': 'int16', 'transactions': 'int32'},
+}
+
+# Bump when RAW_SCHEMAS changes so stale cache files are rebuilt
+SCHEMA_VERSION = 2
+
+# Grain of merged columns, used when completing the panel
+SERIES_KEYS = ['store_nbr', 'family']
+STORE_LEVEL_COLUMNS = ['city', 'state', 'type', 'cluster']
+DATE_LEVEL_COLUMNS = ['dcoilwtico', 'is_holiday']
+STORE_DATE_LEVEL_COLUMNS = ['transactions']
 
 
 class DataLoader:
@@ -16,40 +55,193 @@ class DataLoader:
         self.raw_path = self.config['data']['raw_path']
         self.files = self.config['data']['files']
 
+        cache_cfg = self.config['data'].get('cache', {})
+        self.cache_enabled = cache_cfg.get('enabled', False)
+        self.cache_path = cache_cfg.get('path', 'data/cache')
+        self.cache_format = cache_cfg.get('format', 'parquet')
+
+        merged_cfg = self.config['data'].get('merged', {})
+        self.merged_path = merged_cfg.get(
+            'path', os.path.join(self.config['data'].get('processed_path', 'data/processed'), 'merged')
+        )
+        self.partition_cols = merged_cfg.get('partition_cols', ['store_nbr'])
+        self.chunksize = self.config['data'].get('chunksize', 1_000_000)
+        self.parallel_load = self.config['data'].get('parallel_load', True)
+        self.csv_engine = self.config['data'].get('csv_engine', 'c')
+        self.load_timings = {}
+        self._holidays = None
+        self.backend = self.config.get('compute', {}).get('backend', 'pandas')
+
+        panel_cfg = self.config['data'].get('panel', {})
+        self.panel_enabled = panel_cfg.get('enabled', False)
+        self.panel_start = panel_cfg.get('start', 'series')
+        self.panel_fill = panel_cfg.get('fill', {})
+
     # ------------------------------------------------------------------
     # Load raw CSV files
     # ------------------------------------------------------------------
 
-    def load_raw_data(self):
-        """Loads all raw CSVs into a dictionary of DataFrames."""
+    def load_raw_data(self, columns=None):
+        """
+        Loads all raw CSVs into a dictionary of DataFrames.
+
+        Parameters
+        ----------
+        columns : optional dict of {table_name: [column names]} to project
+                  specific tables (e.g. {'train': ['date', 'store_nbr', 'sales']}).
+        """
         print("Loading raw data...")
-        data = {}
+        columns = columns or {}
+        paths = self._source_paths()
+        t0 = time.time()
+
+        def timed_load(name):
+            start = time.time()
+            df = self.load_table(name, paths[name], columns.get(name))
+            return df, time.time() - start
+
+        # Files are independent; parquet/pyarrow reads release the GIL
+        workers = len(paths) if self.parallel_load else 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = dict(zip(paths, pool.map(timed_load, paths)))
+
+        data = {name: df for name, (df, _) in results.items()}
+        self.load_timings = {name: elapsed for name, (_, elapsed) in results.items()}
+        self.load_timings['total'] = time.time() - t0
+        for name, elapsed in self.load_timings.items():
+            rows = f"{len(data[name]):,} rows" if name in data else ""
+            print(f"  {name:<13} {elapsed:6.2f}s  {rows}")
+
+        # Reused by get_holidays_raw instead of re-reading the CSV
+        if columns.get('holidays') is None:
+            self._holidays = data['holidays']
+
+        print("Raw data loaded successfully.")
+        return data
+
+    def _source_paths(self):
+        """Resolve the on-disk path of every raw table that should be loaded."""
+        paths = {}
 
         # Train (support .csv or .zip)
         train_path = os.path.join(self.raw_path, self.files['train'])
         zip_path = os.path.join(self.raw_path, 'train.zip')
         if os.path.exists(train_path):
-            data['train'] = pd.read_csv(train_path)
+            paths['train'] = train_path
         elif os.path.exists(zip_path):
-            data['train'] = pd.read_csv(zip_path, compression='zip')
+            paths['train'] = zip_path
         else:
             raise FileNotFoundError(f"Train data not found at {train_path} or {zip_path}")
 
-        if 'unit_sales' in data['train'].columns and 'sales' not in data['train'].columns:
-            data['train'].rename(columns={'unit_sales': 'sales'}, inplace=True)
-
         # Helper files
-        data['stores'] = pd.read_csv(os.path.join(self.raw_path, self.files['stores']))
-        data['oil'] = pd.read_csv(os.path.join(self.raw_path, self.files['oil']))
-        data['holidays'] = pd.read_csv(os.path.join(self.raw_path, self.files['holidays']))
+        for name in ('stores', 'oil', 'holidays'):
+            paths[name] = os.path.join(self.raw_path, self.files[name])
 
         if 'transactions' in self.files:
             trans_path = os.path.join(self.raw_path, self.files['transactions'])
             if os.path.exists(trans_path):
-                data['transactions'] = pd.read_csv(trans_path)
+                paths['transactions'] = trans_path
 
-        print("Raw data loaded successfully.")
-        return data
+        return paths
+
+    def load_table(self, name, path, columns=None):
+        """
+        Load one raw table with the compact RAW_SCHEMAS dtypes.
+
+        When the cache is enabled the CSV is converted once into a columnar
+        file under `data.cache.path`; later calls read only the requested
+        columns from it. The cache is rebuilt automatically whenever the
+        source file's size or modification time changes.
+        """
+        if self.cache_enabled:
+            try:
+                return self._load_cached(name, path, columns)
+            except ImportError:
+                print("[WARNING] pyarrow not installed — reading CSV without cache.")
+
+        df = self._read_source(name, path)
+        return df[columns] if columns is not None else df
+
+    # ------------------------------------------------------------------
+    # Columnar cache
+    # ------------------------------------------------------------------
+
+    def _read_source(self, name, path):
+        """Parse a raw CSV (or zipped CSV) and apply the table schema."""
+        compression = 'zip' if path.endswith('.zip') else 'infer'
+        if self.csv_engine == 'pyarrow' and compression == 'infer':
+            try:
+                # Multithreaded parser
+                df = pd.read_csv(path, engine='pyarrow')
+            except ImportError:
+                df = pd.read_csv(path)
+        else:
+            df = pd.read_csv(path, compression=compression)
+
+        if 'unit_sales' in df.columns and 'sales' not in df.columns:
+            df.rename(columns={'unit_sales': 'sales'}, inplace=True)
+
+        return self._apply_schema(df, name)
+
+    @staticmethod
+    def _apply_schema(df, name):
+        """Cast columns to the compact dtypes declared in RAW_SCHEMAS."""
+        if 'date' in df.columns:
+            # Pin the unit: the pyarrow parser infers second-resolution timestamps
+            df['date'] = pd.to_datetime(df['date']).astype('datetime64[ns]')
+
+        for col, dtype in RAW_SCHEMAS.get(name, {}).items():
+            if col not in df.columns:
+                continue
+            if dtype.startswith('int') and df[col].isna().any():
+                # e.g. early Favorita onpromotion is blank; merge_data fills 0 anyway
+                df[col] = df[col].fillna(0)
+            df[col] = df[col].astype(dtype)
+        return df
+
+    def _load_cached(self, name, path, columns=None):
+        """Serve a table from the columnar cache, rebuilding it if stale."""
+        cache_file = os.path.join(self.cache_path, f'{name}.{self.cache_format}')
+
+        if not self._cache_is_fresh(name, path):
+            print(f"  Building {self.cache_format} cache for '{name}'...")
+            df = self._read_source(name, path)
+            os.makedirs(self.cache_path, exist_ok=True)
+            self._write_columnar(df, cache_file)
+            with open(os.path.join(self.cache_path, f'{name}.meta.json'), 'w') as f:
+                json.dump(self._source_fingerprint(path), f, indent=2)
+            return df[columns] if columns is not None else df
+
+        return self._read_columnar(cache_file, columns)
+
+    def _cache_is_fresh(self, name, path):
+        cache_file = os.path.join(self.cache_path, f'{name}.{self.cache_format}')
+        meta_file = os.path.join(self.cache_path, f'{name}.meta.json')
+        if not (os.path.exists(cache_file) and os.path.exists(meta_file)):
+            return False
+        with open(meta_file, 'r') as f:
+            return json.load(f) == self._source_fingerprint(path)
+
+    @staticmethod
+    def _source_fingerprint(path):
+        stat = os.stat(path)
+        return {
+            'source': os.path.abspath(path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'schema_version': SCHEMA_VERSION,
+        }
+
+    def _write_columnar(self, df, path):
+        if self.cache_format == 'feather':
+            df.reset_index(drop=True).to_feather(path)
+        else:
+            df.to_parquet(path, index=False)
+
+    def _read_columnar(self, path, columns=None):
+        if self.cache_format == 'feather':
+            return pd.read_feather(path, columns=columns)
+        return pd.read_parquet(path, columns=columns)
 
     # ------------------------------------------------------------------
     # Merge datasets
@@ -59,37 +251,75 @@ class DataLoader:
         """
         Merges Oil, Stores, Holidays, Transactions into Train set.
         Returns full merged DataFrame (all stores/families).
+
+        Every date is mapped once to an int32 day ordinal; oil and holiday
+        flags live in 1-D arrays indexed by day and transactions in a 2-D
+        (store x day) array, so each helper table is attached with a single
+        vectorized take instead of a full-frame merge.
         """
+        if self.backend == 'polars':
+            if polars_available():
+                return PolarsBackend().merge(data)
+            print("[WARNING] polars not installed — using pandas merge.")
+
         print("Merging data...")
-        df = data['train'].copy()
-        df['date'] = pd.to_datetime(df['date'])
+        df = data['train'].copy(deep=False)
+        df['date'] = self._as_datetime(df['date'])
+
+        oil = data['oil'].copy(deep=False)
+        oil['date'] = self._as_datetime(oil['date'])
+        holidays = data['holidays'].copy(deep=False)
+        holidays['date'] = self._as_datetime(holidays['date'])
+        trans = None
+        if 'transactions' in data:
+            trans = data['transactions'].copy(deep=False)
+            trans['date'] = self._as_datetime(trans['date'])
+
+        # Shared day axis covering every table
+        date_tables = [df['date'], oil['date'], holidays['date']]
+        if trans is not None:
+            date_tables.append(trans['date'])
+        origin = min(d.min() for d in date_tables if len(d))
+        n_days = max(d.max() for d in date_tables if len(d)) - origin
+        n_days = n_days.days + 1
+        day = self._day_ordinals(df['date'], origin)
 
         # 1. Stores — adds city, state, type, cluster
-        df = df.merge(data['stores'], on='store_nbr', how='left')
+        stores = data['stores']
+        store_idx = self._lookup_index(stores['store_nbr'].values, df['store_nbr'].values)
+        for col in stores.columns:
+            if col != 'store_nbr':
+                df[col] = pd.api.extensions.take(stores[col].values, store_idx, allow_fill=True)
 
         # 2. Oil — economic indicator (forward-filled for weekends)
-        oil = data['oil'].copy()
-        oil['date'] = pd.to_datetime(oil['date'])
-        oil = oil.sort_values('date').set_index('date').resample('D').ffill().reset_index()
-        df = df.merge(oil, on='date', how='left')
+        oil = oil.sort_values('date')
+        oil_days = self._day_ordinals(oil['date'], origin)
+        oil_values = oil['dcoilwtico'].values
+        oil_by_day = np.full(n_days, np.nan, dtype=np.result_type(oil_values.dtype, np.float32))
+        if len(oil_days):
+            oil_by_day[oil_days] = oil_values
+            # Daily resample + ffill, bounded to the oil table's own date range
+            oil_range = oil_by_day[oil_days[0]:oil_days[-1] + 1]
+            oil_by_day[oil_days[0]:oil_days[-1] + 1] = pd.Series(oil_range).ffill().values
+        df['dcoilwtico'] = oil_by_day[day]
 
         # 3. Holidays — preserve locale for national/regional distinction
-        holidays = data['holidays'].copy()
-        holidays['date'] = pd.to_datetime(holidays['date'])
-        holidays_filtered = holidays[holidays['transferred'] == False].copy()
-        holiday_flag = holidays_filtered[['date']].drop_duplicates()
-        holiday_flag['is_holiday'] = 1
-        df = df.merge(holiday_flag, on='date', how='left')
-        df['is_holiday'] = df['is_holiday'].fillna(0).astype(int)
+        df['is_holiday'] = self._holiday_by_day(holidays, origin, n_days)[day]
 
         # 4. Transactions
-        if 'transactions' in data:
-            trans = data['transactions'].copy()
-            trans['date'] = pd.to_datetime(trans['date'])
-            df = df.merge(
-                trans[['date', 'store_nbr', 'transactions']],
-                on=['date', 'store_nbr'], how='left'
-            )
+        if trans is not None:
+            # store_nbr is a small dense integer, so it indexes the cube directly
+            trans_store = trans['store_nbr'].values.astype(np.int64)
+            row_store = df['store_nbr'].values.astype(np.int64)
+            n_stores = int(max(trans_store.max(initial=-1), row_store.max(initial=-1))) + 1
+            txn_values = trans['transactions'].values
+            txn_cube = np.full((n_stores, n_days), np.nan, dtype=np.float64)
+            txn_cube[trans_store, self._day_ordinals(trans['date'], origin)] = txn_values
+
+            txn = txn_cube[row_store, day]
+            if not np.isnan(txn).any():
+                txn = txn.astype(txn_values.dtype)
+            df['transactions'] = txn
             df['transactions'] = df['transactions'].fillna(0)
 
         # Fill remaining NaNs
@@ -99,14 +329,487 @@ class DataLoader:
         print(f"Data merged. Shape: {df.shape}")
         return df
 
+    @staticmethod
+    def _as_datetime(dates):
+        """Parse dates only if they are not already datetime64 (e.g. from the cache)."""
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            return dates
+        return pd.to_datetime(dates)
+
+    def _holiday_by_day(self, holidays, origin, n_days):
+        """0/1 flag per day of the axis starting at `origin` (transferred holidays excluded)."""
+        holidays = holidays[holidays['transferred'] == False]
+        days = self._day_ordinals(self._as_datetime(holidays['date']), origin)
+        holiday_by_day = np.zeros(n_days, dtype=int)
+        holiday_by_day[days[(days >= 0) & (days < n_days)]] = 1
+        return holiday_by_day
+
+    @staticmethod
+    def _day_ordinals(dates, origin):
+        """Map datetimes to int32 day offsets from `origin`."""
+        return ((dates.values - np.datetime64(origin)) // np.timedelta64(1, 'D')).astype(np.int32)
+
+    @staticmethod
+    def _lookup_index(keys, values):
+        """
+        Dense integer lookup for small non-negative keys such as store_nbr.
+        Returns the row position of each value in `keys` (-1 when missing).
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        values = np.asarray(values, dtype=np.int64)
+        size = int(max(keys.max(initial=-1), values.max(initial=-1))) + 1
+        table = np.full(size, -1, dtype=np.int64)
+        table[keys] = np.arange(len(keys))
+        return table[values]
+
+    # ------------------------------------------------------------------
+    # Dense panel completion
+    # ------------------------------------------------------------------
+
+    def complete_panel(self, df, fill=None, start=None, holidays=None):
+        """
+        Reindex every (store_nbr, family) series onto a full daily calendar so
+        that row shifts equal calendar-day shifts (closed days, missing
+        Christmas dates, late-opening stores).
+
+        Works on a dense (day x series) grid in one vectorized pass — no
+        per-group loop. Store attributes are re-attached per store, oil per
+        date and transactions per (store, date). is_holiday is rebuilt from
+        the holidays table for every calendar day, as in merge_data, so dates
+        without any train rows (e.g. Christmas) keep their holiday flag.
+
+        Parameters
+        ----------
+        df : merged DataFrame (output of merge_data)
+        fill : dict {column: value | 'ffill'} for filling inserted rows
+               (defaults to data.panel.fill; unlisted columns stay NaN)
+        start : 'series' — each series starts at its own first date
+                'global' — every series starts at the panel's first date
+        holidays : holidays table for is_holiday (defaults to get_holidays_raw())
+
+        Returns
+        -------
+        DataFrame ordered by (date, store_nbr, family) with an 'is_filled'
+        flag marking inserted rows.
+
+        Raises
+        ------
+        ValueError if df holds more than one row for a (date, store_nbr, family)
+        """
+        fill = self.panel_fill if fill is None else fill
+        start = start or self.panel_start
+
+        dates = self._as_datetime(df['date'])
+        origin = dates.min()
+        day = self._day_ordinals(dates, origin).astype(np.int64)
+        n_days = int(day.max()) + 1
+
+        series = df[SERIES_KEYS].drop_duplicates().sort_values(SERIES_KEYS).reset_index(drop=True)
+        series_code = pd.MultiIndex.from_frame(series).get_indexer(
+            pd.MultiIndex.from_frame(df[SERIES_KEYS])
+        )
+        n_series = len(series)
+        grid_pos = day * n_series + series_code
+
+        counts = np.bincount(grid_pos, minlength=n_days * n_series)
+        if (counts > 1).any():
+            dup_pos = np.flatnonzero(counts > 1)
+            examples = [(str((origin + pd.Timedelta(days=int(p // n_series))).date()),
+                         int(series['store_nbr'].iat[p % n_series]), series['family'].iat[p % n_series])
+                        for p in dup_pos[:3]]
+            raise ValueError(f"complete_panel: {len(dup_pos):,} (date, store_nbr, family) keys have "
+                             f"duplicate rows, e.g. {examples}")
+
+        # Grid coordinates (date-major, like train.csv)
+        grid_day = np.repeat(np.arange(n_days), n_series)
+        grid_series = np.tile(np.arange(n_series), n_days)
+        present = np.zeros(n_days * n_series, dtype=bool)
+        present[grid_pos] = True
+
+        out = {
+            'date': origin + pd.to_timedelta(grid_day, unit='D'),
+            'store_nbr': pd.api.extensions.take(series['store_nbr'].values, grid_series),
+            'family': pd.api.extensions.take(series['family'].values, grid_series),
+        }
+        grid_store = out['store_nbr'].astype(np.int64)
+
+        for col in df.columns:
+            if col in out:
+                continue
+            if col in STORE_LEVEL_COLUMNS:
+                per_store = df.drop_duplicates('store_nbr')
+                idx = self._lookup_index(per_store['store_nbr'].values, grid_store)
+                values = pd.api.extensions.take(per_store[col].values, idx, allow_fill=True)
+            elif col == 'is_holiday':
+                if holidays is None:
+                    holidays = self.get_holidays_raw()
+                values = np.repeat(self._holiday_by_day(holidays, origin, n_days), n_series)
+            elif col in DATE_LEVEL_COLUMNS:
+                per_date = np.full(n_days, -1, dtype=np.int64)
+                per_date[day] = np.arange(len(df))
+                values = self._fill_grid(
+                    pd.api.extensions.take(df[col].values, per_date, allow_fill=True),
+                    fill.get(col), n_days, 1
+                )
+                values = np.repeat(values, n_series)
+            elif col in STORE_DATE_LEVEL_COLUMNS:
+                # Another family's row for the same (store, date) still knows the value
+                n_stores = int(grid_store.max()) + 1
+                per_store_day = np.full(n_days * n_stores, -1, dtype=np.int64)
+                per_store_day[day * n_stores + df['store_nbr'].values.astype(np.int64)] = np.arange(len(df))
+                idx = per_store_day[grid_day * n_stores + grid_store]
+                values = self._fill_grid(
+                    pd.api.extensions.take(df[col].values, idx, allow_fill=True),
+                    fill.get(col), n_days, n_series
+                )
+            else:
+                idx = np.full(n_days * n_series, -1, dtype=np.int64)
+                idx[grid_pos] = np.arange(len(df))
+                values = self._fill_grid(
+                    pd.api.extensions.take(df[col].values, idx, allow_fill=True),
+                    fill.get(col), n_days, n_series
+                )
+            out[col] = self._restore_dtype(values, df[col].dtype)
+
+        result = pd.DataFrame(out)[list(df.columns)]
+        result['is_filled'] = (~present).astype(np.int8)
+
+        if start == 'series':
+            first_day = np.full(n_series, n_days, dtype=np.int64)
+            np.minimum.at(first_day, series_code, day)
+            result = result[grid_day >= first_day[grid_series]]
+
+        result = result.reset_index(drop=True)
+        print(f"Panel completed: {len(df):,} → {len(result):,} rows "
+              f"({n_series} series × {n_days} days, {int(result['is_filled'].sum()):,} filled)")
+        return result
+
+    @staticmethod
+    def _fill_grid(values, rule, n_days, n_series):
+        """Apply a fill rule to a flattened (day x series) grid column."""
+        if rule is None or rule == 'nan':
+            return values
+        series = pd.Series(values)
+        if rule == 'ffill':
+            # Forward-fill along the day axis of each series independently
+            grid = pd.DataFrame(np.asarray(series).reshape(n_days, n_series))
+            return grid.ffill().values.ravel()
+        return series.fillna(rule).values
+
+    @staticmethod
+    def _restore_dtype(values, dtype):
+        """Cast back to the source dtype when filling left no missing values."""
+        values = pd.array(values) if not isinstance(values, np.ndarray) else values
+        if pd.isna(values).any():
+            return values
+        try:
+            return pd.Series(values).astype(dtype).values
+        except (TypeError, ValueError):
+            return values
+
+    # ------------------------------------------------------------------
+    # Streaming ingestion
+    # ------------------------------------------------------------------
+
+    def load_helper_tables(self):
+        """Loads every raw table except train (stores, oil, holidays, transactions)."""
+        return {name: self.load_table(name, path)
+                for name, path in self._source_paths().items() if name != 'train'}
+
+    def iter_train_chunks(self, chunksize=None, columns=None):
+        """
+        Yield the train table in row chunks without holding it all in memory.
+        Reads record batches from a fresh parquet cache when available,
+        otherwise parses the CSV incrementally.
+        """
+        chunksize = chunksize or self.chunksize
+        path = self._source_paths()['train']
+
+        if self.cache_enabled and self.cache_format == 'parquet' and self._cache_is_fresh('train', path):
+            import pyarrow.parquet as pq
+            cache_file = os.path.join(self.cache_path, 'train.parquet')
+            for batch in pq.ParquetFile(cache_file).iter_batches(batch_size=chunksize, columns=columns):
+                yield batch.to_pandas()
+            return
+
+        compression = 'zip' if path.endswith('.zip') else 'infer'
+        for chunk in pd.read_csv(path, compression=compression, chunksize=chunksize):
+            if 'unit_sales' in chunk.columns and 'sales' not in chunk.columns:
+                chunk.rename(columns={'unit_sales': 'sales'}, inplace=True)
+            chunk = self._apply_schema(chunk, 'train')
+            yield chunk[columns] if columns is not None else chunk
+
+    def iter_merged(self, chunksize=None, helpers=None):
+        """
+        Streaming counterpart of load_raw_data + merge_data.
+
+        Helper tables stay resident and are joined onto each train chunk, so
+        peak memory is bounded by `chunksize` rather than the full history.
+        train.csv is date-ordered, so each chunk covers a contiguous date range.
+
+        Note: the final dcoilwtico ffill/bfill runs within each chunk, which
+        only differs from the in-memory path for dates outside the oil range.
+        'transactions' is always float64 so every chunk has the same schema.
+
+        Yields
+        ------
+        merged DataFrame chunks with the same columns as merge_data.
+        """
+        helpers = helpers or self.load_helper_tables()
+        for i, chunk in enumerate(self.iter_train_chunks(chunksize)):
+            print(f"  Chunk {i + 1}: {len(chunk):,} rows")
+            yield self._stable_schema(self.merge_data({'train': chunk, **helpers}))
+
+    @staticmethod
+    def _stable_schema(merged):
+        """Pin dtypes that merge_data may vary per chunk (int vs float transactions)."""
+        if 'transactions' in merged.columns:
+            merged['transactions'] = merged['transactions'].astype('float64')
+        return merged
+
+    # ------------------------------------------------------------------
+    # Partitioned merged dataset
+    # ------------------------------------------------------------------
+
+    def materialize_merged(self, df=None, partition_cols=None, chunksize=None):
+        """
+        Write the output of merge_data as a hive-partitioned parquet dataset
+        (one directory per store_nbr, optionally per family as well), so that
+        load_partition can open only the series a caller asks for.
+
+        Parameters
+        ----------
+        df : merged DataFrame (loaded and merged from raw data if None)
+        partition_cols : columns to partition by (defaults to config)
+        chunksize : when df is None, stream the merge via iter_merged in
+                    chunks of this many rows instead of merging in memory
+
+        Returns
+        -------
+        dict manifest (rows, stores, families, source fingerprints)
+        """
+        partition_cols = list(partition_cols or self.partition_cols)
+        fingerprint = self._merged_fingerprint(partition_cols)
+        if df is not None:
+            chunks = [df]
+        elif chunksize:
+            chunks = self.iter_merged(chunksize)
+        else:
+            chunks = [self.merge_data(self.load_raw_data())]
+
+        print(f"Materializing merged dataset to {self.merged_path} (by {partition_cols})...")
+        if os.path.exists(self.merged_path):
+            shutil.rmtree(self.merged_path)
+        os.makedirs(self.merged_path, exist_ok=True)
+
+        manifest = {
+            'fingerprint': fingerprint,
+            'rows': 0,
+            'columns': [],
+            'stores': [],
+            'families': [],
+            'watermark': None,
+        }
+        for chunk in chunks:
+            self._write_merged_chunk(self._stable_schema(chunk), manifest)
+
+        self._save_manifest(manifest)
+        return manifest
+
+    def ensure_merged(self, partition_cols=None, chunksize=None):
+        """Return the merged dataset manifest, re-materializing it if the raw data changed."""
+        partition_cols = list(partition_cols or self.partition_cols)
+        manifest = self.merged_manifest()
+        if manifest is not None and manifest.get('fingerprint') == self._merged_fingerprint(partition_cols):
+            return manifest
+        return self.materialize_merged(partition_cols=partition_cols, chunksize=chunksize)
+
+    def append(self, new_train, new_transactions=None):
+        """
+        Incrementally ingest new days into the materialized merged dataset.
+
+        Rows dated after the manifest's watermark are new. Rows on or before
+        it (e.g. a store reporting late) are kept when their (date, store_nbr,
+        family) key is not in the merged dataset yet; already-ingested keys
+        are skipped with a warning. New rows are merged against the resident
+        helper tables and written as new part files, so a daily refresh costs
+        O(new rows) rather than O(history).
+
+        Parameters
+        ----------
+        new_train : DataFrame or CSV path with the train.csv layout
+        new_transactions : optional DataFrame or CSV path with the new days'
+                           transactions (otherwise looked up in transactions.csv)
+
+        Returns
+        -------
+        dict — updated manifest (watermark = latest ingested date)
+        """
+        manifest = self.merged_manifest()
+        if manifest is None:
+            raise FileNotFoundError(
+                f"Merged dataset not found at {self.merged_path}. Call materialize_merged() first."
+            )
+
+        new_train = self._coerce_table('train', new_train)
+        if manifest.get('watermark'):
+            new_train = self._drop_ingested(new_train, pd.Timestamp(manifest['watermark']))
+        if new_train.empty:
+            print(f"No rows that are not already ingested (watermark {manifest.get('watermark')}) "
+                  f"— nothing to append.")
+            return manifest
+
+        helpers = self.load_helper_tables()
+        if new_transactions is not None:
+            helpers['transactions'] = self._coerce_table('transactions', new_transactions)
+
+        # Carry the last known oil price over days not yet in oil.csv
+        oil = helpers['oil']
+        new_dates = new_train['date'].drop_duplicates()
+        new_dates = new_dates[~new_dates.isin(oil['date'])]
+        if len(new_dates):
+            helpers['oil'] = pd.concat(
+                [oil, pd.DataFrame({'date': new_dates.values, 'dcoilwtico': np.nan})],
+                ignore_index=True
+            )
+
+        merged = self._stable_schema(self.merge_data({'train': new_train, **helpers}))
+        merged = merged[[c for c in manifest['columns'] if c in merged.columns]]
+
+        print(f"Appending {len(merged):,} rows (watermark {manifest.get('watermark')})...")
+        self._write_merged_chunk(merged, manifest)
+        self._save_manifest(manifest)
+        print(f"Watermark advanced to {manifest['watermark']}")
+        return manifest
+
+    def _drop_ingested(self, new_train, watermark):
+        """Drop rows on or before the watermark whose key is already in the merged dataset."""
+        late = (new_train['date'] <= watermark).values
+        if not late.any():
+            return new_train
+
+        keys = ['date'] + SERIES_KEYS
+        existing = pd.read_parquet(self.merged_path, columns=keys,
+                                   filters=[('date', '>=', new_train['date'][late].min())])
+
+        def key_index(df):
+            return pd.MultiIndex.from_arrays([
+                self._as_datetime(df['date']).values,
+                df['store_nbr'].values.astype(np.int64),
+                df['family'].astype(str).values,
+            ])
+
+        ingested = np.zeros(len(new_train), dtype=bool)
+        ingested[late] = key_index(new_train[late]).isin(key_index(existing))
+        if ingested.any():
+            print(f"[WARNING] Skipped {int(ingested.sum()):,} rows on or before watermark "
+                  f"{watermark.date()} that are already in the merged dataset")
+        n_late = int(late.sum() - ingested.sum())
+        if n_late:
+            print(f"  Accepting {n_late:,} late rows on or before watermark {watermark.date()}")
+        return new_train[~ingested]
+
+    def _coerce_table(self, name, table):
+        if isinstance(table, str):
+            return self._read_source(name, table)
+        return self._apply_schema(table.copy(), name)
+
+    def _write_merged_chunk(self, chunk, manifest):
+        """Append one merged chunk as new part files and fold it into the manifest."""
+        partition_cols = manifest['fingerprint']['partition_cols']
+        # Each write adds new part files, so chunks append to the dataset
+        chunk.to_parquet(self.merged_path, partition_cols=partition_cols, index=False)
+
+        stores, families = self.get_store_families(chunk)
+        manifest['rows'] = int(manifest['rows'] + len(chunk))
+        manifest['columns'] = manifest['columns'] or list(chunk.columns)
+        manifest['stores'] = sorted(set(manifest['stores']) | {int(s) for s in stores})
+        manifest['families'] = sorted(set(manifest['families']) | set(families))
+        if len(chunk):
+            latest = chunk['date'].max()
+            if manifest['watermark'] is None or latest > pd.Timestamp(manifest['watermark']):
+                manifest['watermark'] = latest.strftime('%Y-%m-%d')
+
+    def _save_manifest(self, manifest):
+        with open(os.path.join(self.merged_path, '_manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    def merged_manifest(self):
+        """Returns the manifest of the materialized merged dataset (None if absent)."""
+        path = os.path.join(self.merged_path, '_manifest.json')
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def load_partition(self, store_nbr=None, family=None, columns=None):
+        """
+        Load merged rows for the requested store(s)/family(ies) only.
+        Partition pruning means other stores' files are never opened.
+
+        Parameters
+        ----------
+        store_nbr : store number or list of store numbers (None = all)
+        family : family name or list of family names (None = all)
+        columns : optional list of columns to read
+
+        Returns
+        -------
+        DataFrame sorted by date, same layout as filter_subset output.
+        """
+        if not os.path.exists(self.merged_path):
+            raise FileNotFoundError(
+                f"Merged dataset not found at {self.merged_path}. Call materialize_merged() first."
+            )
+
+        filters = []
+        for col, value in (('store_nbr', store_nbr), ('family', family)):
+            if value is None:
+                continue
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            filters.append((col, 'in', values))
+
+        df = pd.read_parquet(self.merged_path, columns=columns, filters=filters or None)
+
+        # Partition keys come back as categoricals; restore the raw schema
+        if 'store_nbr' in df.columns:
+            df['store_nbr'] = df['store_nbr'].astype(RAW_SCHEMAS['train']['store_nbr'])
+        if 'family' in df.columns:
+            df['family'] = df['family'].astype(str).astype('category')
+
+        # Partition keys are appended last on read; restore the merge_data order
+        manifest = self.merged_manifest() or {}
+        order = [c for c in manifest.get('columns', []) if c in df.columns]
+        if len(order) == len(df.columns):
+            df = df[order]
+
+        if 'date' in df.columns:
+            df = df.sort_values('date', kind='stable')
+        return df.reset_index(drop=True)
+
+    def _merged_fingerprint(self, partition_cols):
+        return {
+            'sources': {name: self._source_fingerprint(path)
+                        for name, path in self._source_paths().items()},
+            'partition_cols': list(partition_cols),
+        }
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
     def get_holidays_raw(self):
-        """Returns raw holidays DataFrame for detailed feature engineering."""
-        path = os.path.join(self.raw_path, self.files['holidays'])
-        return pd.read_csv(path)
+        """
+        Returns raw holidays DataFrame for detailed feature engineering.
+
+        A copy of the cached table, so callers may modify it freely. type,
+        locale and locale_name are categorical and transferred is bool
+        (RAW_SCHEMAS); cast with .astype(str) before string operations.
+        """
+        if self._holidays is None:
+            path = os.path.join(self.raw_path, self.files['holidays'])
+            self._holidays = self.load_table('holidays', path)
+        return self._holidays.copy()
 
     def get_store_families(self, df):
         """Returns unique store numbers and product families for dashboard selectors."""
@@ -0,0 +1,337 @@
+"""
+Feature State Module — v2.0
+Stateful, incremental feature engine for next-day inference.
+"""
+
+import numpy as np
+import pandas as pd
+import joblib
+
+from .data_loader import SERIES_KEYS, STORE_LEVEL_COLUMNS
+from .features import FeatureEngineer
+
+
+# Date-level oil windows used by FeatureEngineer._oil_features
+OIL_HISTORY = 30
+OIL_TREND_LAG = 7
+TXN_WINDOW = 7
+# Upcoming dates whose calendar/holiday features are built per batch
+DATE_CACHE_DAYS = 366
+
+
+class StreamingFeatureState:
+    """
+    Rolling per-series state that emits FeatureEngineer.get_feature_columns('lgbm')
+    for the next day without touching history.
+
+    State (all vectorized over series):
+      sales ring buffer  (n_series, max(lag_days, rolling_windows)) — last days of sales
+      EWM sums           (n_series,) numerator / denominator per span
+      oil buffer         (30,) — last daily oil prices (forward-filled)
+      transactions       (n_stores, 6) — last days of store transactions
+
+    Emitting or ingesting one day touches a fixed number of slots per series,
+    so daily scoring cost does not grow with history. Semantics match
+    FeatureEngineer on a dense daily panel (DataLoader.complete_panel).
+    """
+
+    def __init__(self, series, statics=None, holidays_df=None, start_date=None,
+                 config_path='config/config.yaml'):
+        self.engineer = FeatureEngineer(config_path)
+        self.lag_days = list(self.engineer.lag_days)
+        self.rolling_windows = list(self.engineer.rolling_windows)
+        self.rolling_stats = list(self.engineer.rolling_stats)
+        self.ewm_spans = list(self.engineer.ewm_spans)
+        self.holidays_df = holidays_df
+
+        self.series = pd.MultiIndex.from_frame(series[SERIES_KEYS].reset_index(drop=True))
+        self.statics = statics.reset_index(drop=True) if statics is not None else None
+        self.stores = np.sort(self.series.get_level_values('store_nbr').unique().values)
+        self._index = pd.MultiIndex.from_arrays([
+            self.series.get_level_values('store_nbr').values.astype(np.int64),
+            self.series.get_level_values('family').astype(str),
+        ])
+        self._series_store = np.searchsorted(self.stores, self.series.get_level_values('store_nbr').values)
+
+        n = len(self.series)
+        self.depth = max(self.lag_days + self.rolling_windows + [1])
+        self.sales = np.full((n, self.depth), np.nan)
+        self.head = 0  # slot the next ingested day is written to
+
+        self.ewm_num = {span: np.zeros(n) for span in self.ewm_spans}
+        self.ewm_den = {span: np.zeros(n) for span in self.ewm_spans}
+
+        self.oil = np.full(OIL_HISTORY, np.nan)
+        self.last_oil = np.nan
+        self.txn = np.full((len(self.stores), TXN_WINDOW - 1), np.nan)
+        self.last_txn = np.zeros(len(self.stores))
+
+        self.next_date = pd.Timestamp(start_date) if start_date is not None else None
+        self._date_cache = None
+
+    # ------------------------------------------------------------------
+    # Build / persist
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_history(cls, df, holidays_df=None, config_path='config/config.yaml'):
+        """
+        Warm the state up by replaying a merged (ideally panel-completed) history.
+
+        Parameters
+        ----------
+        df : DataLoader.merge_data / complete_panel output
+        holidays_df : raw holidays_events DataFrame (for holiday features)
+
+        Returns
+        -------
+        StreamingFeatureState whose next_date is the day after df's last date.
+        """
+        df = df.copy()
+        df['date'] = pd.to_datetime(df['date'])
+        last = df.sort_values('date', kind='stable').groupby(SERIES_KEYS, sort=True, observed=True).tail(1)
+        last = last.sort_values(SERIES_KEYS).reset_index(drop=True)
+        statics = last[[c for c in STORE_LEVEL_COLUMNS if c in last.columns]]
+
+        state = cls(last[SERIES_KEYS], statics, holidays_df, df['date'].min(), config_path)
+
+        # Dense day grids, replayed one column per day
+        day = ((df['date'].values - np.datetime64(state.next_date)) // np.timedelta64(1, 'D')).astype(np.int64)
+        n_days = int(day.max()) + 1
+        sales = np.full((len(state.series), n_days), np.nan)
+        sales[state._series_rows(df), day] = df['sales'].values
+
+        oil = np.full(n_days, np.nan)
+        if 'dcoilwtico' in df.columns:
+            known = df['dcoilwtico'].notna().values
+            oil[day[known]] = df['dcoilwtico'].values[known]
+
+        txn = np.full((len(state.stores), n_days), np.nan)
+        if 'transactions' in df.columns:
+            txn[np.searchsorted(state.stores, df['store_nbr'].values), day] = \
+                df['transactions'].fillna(0).values
+
+        print(f"Warming feature state: {len(state.series):,} series × {n_days:,} days...")
+        for d in range(n_days):
+            state._push(sales[:, d], oil[d], txn[:, d])
+        return state
+
+    def save(self, path):
+        """Serialize the full state (buffers, EWM sums, series index) to one file."""
+        joblib.dump(self, path)
+        print(f"Feature state saved to {path}")
+
+    @staticmethod
+    def load(path):
+        return joblib.load(path)
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def ingest(self, df):
+        """Ingest several days of merged rows, oldest first."""
+        df = df.copy()
+        df['date'] = pd.to_datetime(df['date'])
+        for _, day_df in df.groupby('date', sort=True):
+            self.update(day_df)
+        return self
+
+    def update(self, day_df):
+        """
+        Ingest one day of merged rows (date, store_nbr, family, sales,
+        dcoilwtico, transactions). Skipped calendar days are pushed as
+        missing; series not seen at warm-up are ignored.
+        """
+        date = pd.Timestamp(pd.to_datetime(day_df['date']).iloc[0]).normalize()
+        if self.next_date is None:
+            self.next_date = date
+        if date < self.next_date:
+            print(f"[WARNING] {date.date()} already ingested (next day is {self.next_date.date()}) — skipped.")
+            return self
+        while self.next_date < date:
+            self._push(np.full(len(self.series), np.nan), np.nan, np.full(len(self.stores), np.nan))
+
+        rows = self._series_rows(day_df)
+        known = rows >= 0
+        sales = np.full(len(self.series), np.nan)
+        if 'sales' in day_df.columns:
+            sales[rows[known]] = day_df['sales'].values[known]
+
+        oil = np.nan
+        if 'dcoilwtico' in day_df.columns:
+            prices = day_df['dcoilwtico'].values.astype(np.float64)
+            prices = prices[~np.isnan(prices)]
+            oil = prices[-1] if len(prices) else np.nan
+
+        txn = self._store_values(day_df, 'transactions', fill=0)
+        self._push(sales, oil, txn)
+        return self
+
+    def _push(self, sales, oil, txn):
+        self.sales[:, self.head] = sales
+        self.head = (self.head + 1) % self.depth
+
+        valid = ~np.isnan(sales)
+        for span in self.ewm_spans:
+            decay = 1.0 - 2.0 / (span + 1.0)
+            self.ewm_num[span] = decay * self.ewm_num[span] + np.where(valid, sales, 0.0)
+            self.ewm_den[span] = decay * self.ewm_den[span] + valid
+
+        if np.isnan(oil):
+            oil = self.last_oil
+        self.last_oil = oil
+        self.oil = np.roll(self.oil, -1)
+        self.oil[-1] = oil
+
+        self.txn = np.roll(self.txn, -1, axis=1)
+        self.txn[:, -1] = txn
+        self.last_txn = np.where(np.isnan(txn), self.last_txn, txn)
+
+        self.next_date = self.next_date + pd.Timedelta(days=1)
+
+    # ------------------------------------------------------------------
+    # Emit
+    # ------------------------------------------------------------------
+
+    def next_features(self, known=None):
+        """
+        Feature rows for next_date, one per series.
+
+        Parameters
+        ----------
+        known : optional DataFrame of next-day inputs (store_nbr, family,
+                onpromotion[, dcoilwtico, transactions]), e.g. test.csv rows.
+                Missing promotions are 0; oil and transactions carry forward.
+
+        Returns
+        -------
+        DataFrame with date, series keys, store statics and the lgbm feature
+        columns, ready for Preprocessor.prepare_lgbm_data.
+        """
+        n = len(self.series)
+        # Columns are gathered in a dict and framed once at the end
+        out = {
+            'date': np.repeat(self.next_date, n),
+            'store_nbr': self.series.get_level_values('store_nbr'),
+            'family': self.series.get_level_values('family'),
+        }
+        if self.statics is not None:
+            for col in self.statics.columns:
+                out[col] = self.statics[col].values
+
+        onpromotion = np.zeros(n, dtype=np.int64)
+        oil, txn = self.last_oil, self.last_txn.copy()
+        if known is not None:
+            rows = self._series_rows(known)
+            hit = rows >= 0
+            if 'onpromotion' in known.columns:
+                onpromotion[rows[hit]] = known['onpromotion'].fillna(0).values[hit]
+            if 'dcoilwtico' in known.columns and known['dcoilwtico'].notna().any():
+                oil = float(known['dcoilwtico'].dropna().iloc[-1])
+            if 'transactions' in known.columns:
+                given = self._store_values(known, 'transactions')
+                txn = np.where(np.isnan(given), txn, given)
+        out['onpromotion'] = onpromotion
+
+        for col, value in self._date_features(self.next_date).items():
+            out[col] = value
+
+        self._oil_features(out, oil)
+        self._transaction_features(out, txn)
+        self._sales_features(out)
+        return pd.DataFrame(out)
+
+    def _sales_features(self, out):
+        for lag in self.lag_days:
+            out[f'sales_lag_{lag}'] = self.sales[:, (self.head - lag) % self.depth].astype(np.float32)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for window in self.rolling_windows:
+                window_vals = self.sales[:, (self.head - np.arange(1, window + 1)) % self.depth]
+                valid = ~np.isnan(window_vals)
+                count = valid.sum(axis=1)
+                for stat in self.rolling_stats:
+                    if stat == 'mean':
+                        values = np.where(count > 0, np.nansum(window_vals, axis=1) / count, np.nan)
+                    elif stat == 'std':
+                        mean = np.nansum(window_vals, axis=1) / np.maximum(count, 1)
+                        sq = np.nansum((window_vals - mean[:, None]) ** 2, axis=1)
+                        values = np.where(count > 1, np.sqrt(sq / np.maximum(count - 1, 1)), 0.0)
+                    elif stat == 'min':
+                        values = np.where(count > 0, np.nanmin(np.where(valid, window_vals, np.inf), axis=1), np.nan)
+                    else:
+                        values = np.where(count > 0, np.nanmax(np.where(valid, window_vals, -np.inf), axis=1), np.nan)
+                    out[f'sales_roll_{stat}_{window}'] = values.astype(np.float32)
+
+            for span in self.ewm_spans:
+                den = self.ewm_den[span]
+                out[f'sales_ewm_{span}'] = np.where(den > 0, self.ewm_num[span] / den, np.nan).astype(np.float32)
+
+    def _oil_features(self, out, oil):
+        daily = np.append(self.oil[1:], oil if not np.isnan(oil) else self.last_oil)
+        known = daily[~np.isnan(daily)]
+        fill = known[0] if len(known) else 0.0
+        daily = np.where(np.isnan(daily), fill, daily)
+
+        week = daily[-7:]
+        out['dcoilwtico'] = daily[-1]
+        out['oil_price_7d_ma'] = week.mean()
+        out['oil_price_30d_ma'] = daily.mean()
+        out['oil_price_volatility'] = week.std(ddof=1) if len(week) > 1 else 0.0
+        out['oil_price_trend'] = daily[-1] - daily[-1 - OIL_TREND_LAG]
+
+    def _transaction_features(self, out, txn):
+        # Next-day transactions are always set (given or carried forward)
+        ma = np.nanmean(np.column_stack([self.txn, txn]), axis=1)
+        txn_rows, ma_rows = txn[self._series_store], ma[self._series_store]
+        out['transactions'] = txn_rows
+        out['txn_7d_ma'] = ma_rows
+        out['txn_deviation'] = np.where(ma_rows > 0, txn_rows / np.where(ma_rows > 0, ma_rows, 1.0), 1.0)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _series_rows(self, df):
+        """State row of each input row (-1 for series unknown to the state)."""
+        keys = pd.MultiIndex.from_arrays([
+            df['store_nbr'].values.astype(np.int64),
+            df['family'].astype(str).values,
+        ])
+        return self._index.get_indexer(keys)
+
+    def _store_values(self, df, col, fill=None):
+        """One value per store (NaN for stores without rows)."""
+        values = np.full(len(self.stores), np.nan)
+        if col not in df.columns:
+            return values
+        pos = np.searchsorted(self.stores, df['store_nbr'].values)
+        pos = np.clip(pos, 0, len(self.stores) - 1)
+        hit = self.stores[pos] == df['store_nbr'].values
+        col_values = df[col].values.astype(np.float64)
+        if fill is not None:
+            col_values = np.where(np.isnan(col_values), fill, col_values)
+        values[pos[hit]] = col_values[hit]
+        return values
+
+    def _date_features(self, date):
+        """
+        Calendar and holiday features for one date. They depend on the date
+        alone, so a year of upcoming dates is built through FeatureEngineer
+        in one call and cached.
+        """
+        cache = self._date_cache
+        if cache is None or date not in cache.index:
+            calendar = pd.date_range(date, periods=DATE_CACHE_DAYS, freq='D')
+            day = np.arange(len(calendar), dtype=np.int32)
+            rows = self.engineer._time_features(pd.DataFrame(index=calendar), day, calendar)
+            if self.holidays_df is not None:
+                hol = self.holidays_df
+                holiday_dates = pd.to_datetime(hol.loc[hol['transferred'] == False, 'date'])
+                rows['is_holiday'] = calendar.isin(holiday_dates).astype(int)
+                rows = self.engineer._holiday_features(rows, self.holidays_df, day, calendar)
+            else:
+                rows = self.engineer._simple_holiday_features(rows)
+            self._date_cache = cache = rows
+        return cache.loc[date].to_dict()
@@ -0,0 +1,235 @@
+"""
+Feature Store Module — v2.0
+Persists engineered feature groups as partitioned parquet so consumers load
+ready features instead of re-running FeatureEngineer.create_features.
+"""
+
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+import yaml
+
+from .data_loader import DataLoader, RAW_SCHEMAS, SERIES_KEYS
+from .features import FeatureEngineer, FEATURE_SPEC_VERSION
+
+
+KEY_COLUMNS = ['date'] + SERIES_KEYS
+
+
+class FeatureStore:
+    """
+    One directory per feature-graph node (time, oil, transactions, holidays,
+    lags, rolling) plus 'base' for the input panel columns:
+
+      <path>/<group>/store_nbr=<n>/*.parquet   key columns + the group's columns
+      <path>/_manifest.json                    per-group fingerprint, columns, rows
+
+    A group's fingerprint combines the raw sources it derives from, the
+    merged dataset's row count / watermark, the panel settings, the node's
+    spec params and FEATURE_SPEC_VERSION. ensure() recomputes only the groups
+    whose fingerprint changed, so e.g. a new oil.csv rebuilds the oil group
+    alone. Every group is written from the same canonically sorted panel,
+    which lets load() stitch groups together by position.
+    """
+
+    BASE = 'base'
+
+    def __init__(self, config_path='config/config.yaml', loader=None, engineer=None):
+        with open(config_path, 'r') as f:
+            self.config = yaml.safe_load(f)
+
+        store_cfg = self.config.get('features', {}).get('store', {})
+        self.enabled = store_cfg.get('enabled', False)
+        self.path = store_cfg.get(
+            'path', os.path.join(self.config['data'].get('processed_path', 'data/processed'), 'features')
+        )
+
+        self.loader = loader or DataLoader(config_path)
+        self.engineer = engineer or FeatureEngineer(config_path)
+        self.partition_cols = list(self.loader.partition_cols)
+
+    # ------------------------------------------------------------------
+    # PUBLIC API
+    # ------------------------------------------------------------------
+
+    def features(self, store_nbr=None, family=None, start=None, end=None, columns=None):
+        """Bring the groups behind `columns` up to date, then load them."""
+        self.ensure(columns)
+        return self.load(store_nbr, family, start, end, columns)
+
+    def ensure(self, columns=None):
+        """
+        Recompute and persist the stale feature groups needed for `columns`
+        (all groups when None).
+
+        Returns
+        -------
+        dict manifest ({'groups': {name: {'fingerprint', 'columns', 'rows'}}})
+        """
+        graph = self.engineer.feature_graph()
+        groups = [name for name, _ in self.engineer.resolve_features(columns) if graph[name]['columns']]
+
+        manifest = self.manifest() or {'groups': {}}
+        merged = self.loader.ensure_merged()
+        fingerprints = {name: self._group_fingerprint(name, graph, merged) for name in [self.BASE] + groups}
+        stale = [name for name, fp in fingerprints.items()
+                 if manifest['groups'].get(name, {}).get('fingerprint') != fp]
+        if not stale:
+            return manifest
+
+        print(f"Feature store: rebuilding {stale}...")
+        df = self._load_panel()
+        computed = [name for name in stale if name != self.BASE]
+        feat = self.engineer.create_features(
+            df, holidays_df=self.loader.get_holidays_raw(),
+            columns=[col for name in computed for col in graph[name]['columns']]
+        )
+
+        produced = {col for node in graph.values() for col in node['columns']}
+        for name in stale:
+            if name == self.BASE:
+                cols = [c for c in df.columns if c not in KEY_COLUMNS and c not in produced]
+            else:
+                cols = [c for c in graph[name]['columns'] if c in feat.columns]
+            self._write_group(name, feat[KEY_COLUMNS + cols])
+            manifest['groups'][name] = {
+                'fingerprint': fingerprints[name],
+                'columns': cols,
+                'rows': int(len(feat)),
+            }
+            self._save_manifest(manifest)
+
+        print(f"Feature store updated at {self.path}")
+        return manifest
+
+    def load(self, store_nbr=None, family=None, start=None, end=None, columns=None):
+        """
+        Read stored features for the requested series and date range.
+
+        Parameters
+        ----------
+        store_nbr : store number or list of store numbers (None = all)
+        family : family name or list of family names (None = all)
+        start, end : optional inclusive date bounds
+        columns : optional column projection; only the groups owning these
+                  columns are opened (key columns are always returned)
+
+        Returns
+        -------
+        DataFrame of key, input and feature columns, sorted by date, store, family.
+        """
+        manifest = self.manifest()
+        if manifest is None:
+            raise FileNotFoundError(f"Feature store not found at {self.path}. Call ensure() first.")
+
+        groups = manifest['groups']
+        order = [self.BASE] + [name for name in self.engineer.feature_graph() if name in groups]
+        if columns is None:
+            wanted = {name: groups[name]['columns'] for name in order if name in groups}
+        else:
+            owner = {col: name for name in order if name in groups for col in groups[name]['columns']}
+            missing = [c for c in columns if c not in owner and c not in KEY_COLUMNS]
+            if missing:
+                raise KeyError(f"Columns not in feature store: {missing}")
+            wanted = {}
+            for col in columns:
+                if col in owner:
+                    wanted.setdefault(owner[col], []).append(col)
+            wanted = {name: [c for c in groups[name]['columns'] if c in wanted[name]]
+                      for name in order if name in wanted}
+
+        filters = []
+        for col, value in (('store_nbr', store_nbr), ('family', family)):
+            if value is None:
+                continue
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            filters.append((col, 'in', values))
+        if start is not None:
+            filters.append(('date', '>=', pd.Timestamp(start)))
+        if end is not None:
+            filters.append(('date', '<=', pd.Timestamp(end)))
+
+        frames = [self._read_group(name, cols, filters) for name, cols in wanted.items()]
+        if not frames:
+            frames = [self._read_group(self.BASE, [], filters)]
+
+        out = frames[0]
+        for frame in frames[1:]:
+            if self._aligned(out, frame):
+                for col in frame.columns.difference(KEY_COLUMNS, sort=False):
+                    out[col] = frame[col].values
+            else:
+                out = out.merge(frame, on=KEY_COLUMNS, how='left')
+
+        return out.sort_values(KEY_COLUMNS, kind='stable').reset_index(drop=True)
+
+    def manifest(self):
+        """Returns the feature store manifest (None if nothing stored yet)."""
+        path = os.path.join(self.path, '_manifest.json')
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    # ------------------------------------------------------------------
+    # PRIVATE
+    # ------------------------------------------------------------------
+
+    def _group_fingerprint(self, name, graph, merged):
+        """Everything a group's stored values depend on."""
+        sources = merged['fingerprint']['sources']
+        if name == self.BASE:
+            node = {'sources': sorted(sources), 'params': {}}
+        else:
+            node = graph[name]
+        return {
+            'spec_version': FEATURE_SPEC_VERSION,
+            'sources': {src: sources[src] for src in node['sources'] if src in sources},
+            'params': node['params'],
+            'rows': merged['rows'],
+            'watermark': merged.get('watermark'),
+            'panel': {
+                'enabled': self.loader.panel_enabled,
+                'start': self.loader.panel_start,
+                'fill': self.loader.panel_fill,
+            },
+        }
+
+    def _save_manifest(self, manifest):
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, '_manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    def _load_panel(self):
+        """Full merged panel in canonical (store, family, date) order."""
+        df = self.loader.load_partition()
+        if self.loader.panel_enabled:
+            df = self.loader.complete_panel(df)
+        return df.sort_values(SERIES_KEYS + ['date'], kind='stable').reset_index(drop=True)
+
+    def _write_group(self, name, df):
+        path = os.path.join(self.path, name)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.makedirs(path, exist_ok=True)
+        df.to_parquet(path, partition_cols=self.partition_cols, index=False)
+
+    def _read_group(self, name, columns, filters):
+        path = os.path.join(self.path, name)
+        df = pd.read_parquet(path, columns=KEY_COLUMNS + list(columns), filters=filters or None)
+
+        # Partition keys come back as categoricals, appended last
+        if 'store_nbr' in df.columns:
+            df['store_nbr'] = df['store_nbr'].astype(RAW_SCHEMAS['train']['store_nbr'])
+        if 'family' in df.columns:
+            df['family'] = df['family'].astype(str).astype('category')
+        return df[KEY_COLUMNS + list(columns)]
+
+    @staticmethod
+    def _aligned(left, right):
+        """True when both frames hold the same keys in the same row order."""
+        return len(left) == len(right) and all(
+            np.array_equal(left[col].to_numpy(), right[col].to_numpy()) for col in KEY_COLUMNS
+        )
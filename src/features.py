@@ -3,22 +3,50 @@ Feature Engineering Module — v2.0
 Creates 40+ features: time, holiday, oil, transaction, lag, and rolling statistics.
 """
 
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
+import yaml
+from numpy.lib.format import open_memmap
 
+from .polars_backend import PolarsBackend, polars_available
+from .rolling import series_layout, grouped_lag, grouped_rolling, grouped_ewm
+
+
+# Bump when a feature builder's semantics change so stored feature groups
+# (src/feature_store.py) are recomputed
+FEATURE_SPEC_VERSION = 1
+
+# Store blocks per worker in parallel mode (smooths uneven store sizes)
+SHARDS_PER_WORKER = 2
 
 class FeatureEngineer:
     """Builds rich feature sets for sales forecasting models."""
 
-    def __init__(self):
-        self.lag_days = [1, 7, 14, 21, 28]
-        self.rolling_windows = [7, 14, 30]
+    def __init__(self, config_path='config/config.yaml'):
+        self.config = {}
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                self.config = yaml.safe_load(f)
+
+        feat_cfg = self.config.get('features', {})
+        self.lag_days = list(feat_cfg.get('lag_days', [1, 7, 14, 21, 28]))
+        self.rolling_windows = list(feat_cfg.get('rolling_windows', [7, 14, 30]))
+        self.rolling_stats = list(feat_cfg.get('rolling_stats', ['mean', 'std']))  # any of mean, std, min, max
+        self.ewm_spans = list(feat_cfg.get('ewm_spans', []))
+        self.backend = self.config.get('compute', {}).get('backend', 'pandas')
+        n_workers = self.config.get('compute', {}).get('n_workers', 1)
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.config_path = config_path
 
     # ------------------------------------------------------------------
     # PUBLIC API
     # ------------------------------------------------------------------
 
-    def create_features(self, df, holidays_df=None, include_lags=True):
+    def create_features(self, df, holidays_df=None, include_lags=True, columns=None):
         """
         Master feature builder.
 
@@ -29,11 +57,26 @@ class FeatureEngineer:
              transactions, store_nbr, family, city, cluster, state, type.
         holidays_df : raw holidays_events DataFrame (optional, for detailed holiday features).
         include_lags : bool, whether to add lag/rolling features (requires store_nbr & family columns).
+        columns : optional list of feature columns the caller needs (e.g.
+                  get_feature_columns(mode='lstm')). Only the feature-graph nodes
+                  producing them are computed; None computes every node.
 
         Returns
         -------
         DataFrame with all engineered features.
         """
+        can_lag = include_lags and 'store_nbr' in df.columns and 'family' in df.columns
+        plan = self.resolve_features(columns, include_lags=can_lag)
+
+        if self.backend == 'polars':
+            if polars_available():
+                wanted = dict(plan)
+                lags = [d for d in self.lag_days if f'sales_lag_{d}' in wanted.get('lags', ())]
+                windows, spans = self._rolling_subset(wanted.get('rolling', set()))
+                backend = PolarsBackend(lags, windows, self.rolling_stats, spans)
+                return backend.create_features(df, holidays_df, bool(lags or windows or spans))
+            print("[WARNING] polars not installed — using pandas features.")
+
         print("Engineering features (v2.0)...")
         df = df.copy()
         df['date'] = pd.to_datetime(df['date'])
@@ -41,23 +84,132 @@ class FeatureEngineer:
         # Ensure required base columns exist
         self._ensure_columns(df)
 
-        # Feature groups
-        df = self._time_features(df)
-        df = self._oil_features(df)
-        df = self._transaction_features(df)
-
-        if holidays_df is not None:
-            df = self._holiday_features(df, holidays_df)
+        graph = self.feature_graph()
+        ctx = {'holidays_df': holidays_df}
+        if self.n_workers > 1 and 'store_nbr' in df.columns and df['store_nbr'].nunique() > 1:
+            df = self._create_features_sharded(df, graph, plan, ctx)
         else:
-            df = self._simple_holiday_features(df)
-
-        if include_lags and 'store_nbr' in df.columns and 'family' in df.columns:
-            df = self._lag_features(df)
-            df = self._rolling_features(df)
+            for name, wanted in plan:
+                df = graph[name]['build'](df, ctx, wanted)
 
         print(f"Features created: {len(df.columns)} columns, {len(df)} rows")
         return df
 
+    def feature_graph(self):
+        """
+        Feature definitions as a dependency graph, in execution order.
+
+        Each node maps to {'grain': 'date' | 'store' | 'series' (the level it
+        is independent across), 'columns': columns it produces, 'requires': nodes
+        it depends on, 'sources': raw tables its values derive from,
+        'params': spec settings that change its output,
+        'build': fn(df, ctx, wanted) -> df}. Nodes without
+        columns ('calendar', 'series') only put shared state into ctx: the
+        day-ordinal calendar used by date-level groups and the store×family
+        layout shared by the lag and rolling kernels. Lag days, rolling
+        windows/stats and EWM spans come from the `features` config section.
+        """
+        roll_cols = [f'sales_roll_{stat}_{w}' for w in self.rolling_windows for stat in self.rolling_stats]
+        roll_cols += [f'sales_ewm_{span}' for span in self.ewm_spans]
+
+        return {
+            'calendar': {
+                'grain': 'date',
+                'columns': [], 'requires': [], 'sources': ['train'], 'params': {},
+                'build': self._build_calendar,
+            },
+            'time': {
+                'grain': 'date',
+                'columns': ['day_of_week', 'day_of_month', 'week_of_year', 'month', 'quarter',
+                            'is_month_start', 'is_month_end', 'is_quarter_end', 'is_payday'],
+                'requires': ['calendar'],
+                'sources': ['train'], 'params': {},
+                'build': lambda df, ctx, wanted: self._time_features(df, ctx['day'], ctx['calendar']),
+            },
+            'oil': {
+                'grain': 'date',
+                'columns': ['dcoilwtico', 'oil_price_7d_ma', 'oil_price_30d_ma',
+                            'oil_price_volatility', 'oil_price_trend'],
+                'requires': ['calendar'],
+                'sources': ['train', 'oil'], 'params': {},
+                'build': lambda df, ctx, wanted: self._oil_features(df, ctx['day'], ctx['calendar']),
+            },
+            'transactions': {
+                'grain': 'store',
+                'columns': ['transactions', 'txn_7d_ma', 'txn_deviation'],
+                'requires': ['calendar'],
+                'sources': ['train', 'transactions'], 'params': {},
+                'build': lambda df, ctx, wanted: self._transaction_features(df, ctx['day'], ctx['calendar']),
+            },
+            'holidays': {
+                'grain': 'date',
+                'columns': ['is_national_holiday', 'is_regional_holiday',
+                            'days_to_next_holiday', 'days_since_last_holiday'],
+                'requires': ['calendar'],
+                'sources': ['train', 'holidays'], 'params': {},
+                'build': self._build_holidays,
+            },
+            'series': {
+                'grain': 'series',
+                'columns': [], 'requires': [], 'sources': ['train'], 'params': {},
+                'build': self._build_series,
+            },
+            'lags': {
+                'grain': 'series',
+                'columns': [f'sales_lag_{d}' for d in self.lag_days],
+                'requires': ['series'],
+                'sources': ['train'],
+                'params': {'lag_days': self.lag_days},
+                'build': lambda df, ctx, wanted: self._lag_features(
+                    df, ctx['layout'], lags=[d for d in self.lag_days if f'sales_lag_{d}' in wanted]),
+            },
+            'rolling': {
+                'grain': 'series',
+                'columns': roll_cols,
+                'requires': ['series'],
+                'sources': ['train'],
+                'params': {'rolling_windows': self.rolling_windows,
+                           'rolling_stats': self.rolling_stats, 'ewm_spans': self.ewm_spans},
+                'build': lambda df, ctx, wanted: self._rolling_features(
+                    df, ctx['layout'], *self._rolling_subset(wanted)),
+            },
+        }
+
+    def resolve_features(self, columns=None, include_lags=True):
+        """
+        Plan which graph nodes to run for the requested columns.
+
+        Columns no node produces (sales, onpromotion, store_nbr, ...) are
+        treated as inputs and ignored.
+
+        Returns
+        -------
+        list of (node_name, set of wanted columns) in execution order,
+        including every node the wanted ones depend on.
+        """
+        graph = self.feature_graph()
+        if columns is None:
+            wanted = {name: set(node['columns']) for name, node in graph.items() if node['columns']}
+        else:
+            owner = {col: name for name, node in graph.items() for col in node['columns']}
+            wanted = {}
+            for col in columns:
+                if col in owner:
+                    wanted.setdefault(owner[col], set()).add(col)
+
+        if not include_lags:
+            wanted.pop('lags', None)
+            wanted.pop('rolling', None)
+
+        needed, stack = set(wanted), list(wanted)
+        while stack:
+            for dep in graph[stack.pop()]['requires']:
+                if dep not in needed:
+                    needed.add(dep)
+                    stack.append(dep)
+
+        return [(name, wanted.get(name, set())) for name in graph if name in needed]
+
     def get_feature_columns(self, mode='lgbm'):
         """
         Returns the list of feature column names (excludes target and identifiers).
@@ -79,7 +231,8 @@ class FeatureEngineer:
         lag_cols = [f'sales_lag_{d}' for d in self.lag_days]
         roll_cols = []
         for w in self.rolling_windows:
-            roll_cols += [f'sales_roll_mean_{w}', f'sales_roll_std_{w}']
+            roll_cols += [f'sales_roll_{stat}_{w}' for stat in self.rolling_stats]
+        roll_cols += [f'sales_ewm_{span}' for span in self.ewm_spans]
 
         if mode == 'lstm':
             # LSTM uses a subset (no categoricals, no lags — handled via sequences)
@@ -89,53 +242,211 @@ class FeatureEngineer:
         else:
             return base + lag_cols + roll_cols
 
+    # ------------------------------------------------------------------
+    # PRIVATE — Process-Parallel Execution
+    # ------------------------------------------------------------------
+
+    def _create_features_sharded(self, df, graph, plan, ctx):
+        """
+        Run the plan with store- and series-level nodes spread over a process pool.
+
+        Date-level nodes need the full calendar and are cheap, so they run
+        here once. Rows are then ordered by store (stable, so each series
+        keeps its row order), the inputs of the remaining nodes are written
+        to memory-mapped .npy files, and each worker computes one contiguous
+        block of stores straight into memory-mapped output arrays — no
+        DataFrame is pickled in either direction. Results are scattered back
+        to the original row order.
+        """
+        input_cols = list(df.columns)
+        local = [(name, wanted) for name, wanted in plan if graph[name]['grain'] == 'date']
+        sharded = [(name, wanted) for name, wanted in plan if graph[name]['grain'] != 'date']
+        for name, wanted in local:
+            df = graph[name]['build'](df, ctx, wanted)
+        if not any(graph[name]['columns'] for name, _ in sharded):
+            return df
+        if 'day' not in ctx:
+            df = self._build_calendar(df, ctx, set())
+
+        if any(name == 'transactions' for name, _ in sharded):
+            df['transactions'] = df['transactions'].fillna(0)
+
+        store_codes, _ = pd.factorize(df['store_nbr'])
+        if 'family' in df.columns:
+            series_codes = df.groupby(['store_nbr', 'family'], sort=False, observed=True).ngroup().values
+        else:
+            series_codes = store_codes
+        order = np.argsort(store_codes, kind='stable')
+        bounds = self._shard_bounds(store_codes[order], self.n_workers * SHARDS_PER_WORKER)
+
+        outputs = []
+        for name, wanted in sharded:
+            if name == 'rolling':
+                windows, spans = self._rolling_subset(wanted)
+                outputs += [f'sales_roll_{stat}_{w}' for w in windows for stat in self.rolling_stats]
+                outputs += [f'sales_ewm_{span}' for span in spans]
+            elif name == 'lags':
+                outputs += [c for c in graph[name]['columns'] if c in wanted]
+            else:
+                outputs += [c for c in graph[name]['columns'] if c not in input_cols]
+
+        tmp = tempfile.mkdtemp(prefix='features_')
+        try:
+            inputs = {
+                'store_nbr': store_codes[order].astype(np.int64),
+                'family': series_codes[order].astype(np.int64),
+                'day': ctx['day'][order],
+                'sales': df['sales'].values[order].astype(np.float64),
+                'transactions': df['transactions'].values[order].astype(np.float64),
+            }
+            paths = {}
+            for name, values in inputs.items():
+                paths[name] = os.path.join(tmp, f'in_{name}.npy')
+                np.save(paths[name], values)
+            out_paths = {}
+            for col in outputs:
+                out_paths[col] = os.path.join(tmp, f'out_{len(out_paths)}.npy')
+                open_memmap(out_paths[col], mode='w+', dtype=np.float64, shape=(len(df),)).flush()
+
+            spec = {
+                'lag_days': self.lag_days, 'rolling_windows': self.rolling_windows,
+                'rolling_stats': self.rolling_stats, 'ewm_spans': self.ewm_spans,
+            }
+            tasks = [{
+                'lo': lo, 'hi': hi, 'inputs': paths, 'outputs': out_paths,
+                'plan': [(name, sorted(wanted)) for name, wanted in sharded],
+                'n_days': len(ctx['calendar']), 'origin': ctx['calendar'][0],
+                'spec': spec, 'config_path': self.config_path,
+            } for lo, hi in bounds]
+
+            print(f"  Sharding {len(df):,} rows over {len(tasks)} store blocks, {self.n_workers} workers...")
+            with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                dtypes = {}
+                for shard_dtypes in pool.map(_feature_shard, tasks):
+                    dtypes.update(shard_dtypes)
+
+            for col in outputs:
+                result = np.load(out_paths[col], mmap_mode='r')
+                values = np.empty(len(df), dtype=dtypes.get(col, np.float64))
+                values[order] = result
+                df[col] = values
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        # Same column order as the serial run
+        produced = [c for name, _ in plan for c in graph[name]['columns']
+                    if c in df.columns and c not in input_cols]
+        produced += [c for c in outputs if c not in produced]
+        return df[input_cols + produced]
+
+    @staticmethod
+    def _shard_bounds(sorted_codes, n_shards):
+        """Contiguous [lo, hi) row ranges of roughly equal size, cut only at store boundaries."""
+        n = len(sorted_codes)
+        store_starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        targets = np.arange(1, n_shards) * n / n_shards
+        cuts = np.unique(store_starts[np.clip(np.searchsorted(store_starts, targets), 0, len(store_starts) - 1)])
+        cuts = [c for c in cuts if 0 < c < n]
+        edges = [0] + cuts + [n]
+        return list(zip(edges[:-1], edges[1:]))
+
+    # ------------------------------------------------------------------
+    # PRIVATE — Feature Graph Nodes
+    # ------------------------------------------------------------------
+
+    def _build_calendar(self, df, ctx, wanted):
+        # Date-level features are computed once per calendar day and
+        # broadcast back to the panel by day ordinal
+        ctx['day'], ctx['calendar'] = self._day_ordinals(df['date'])
+        return df
+
+    def _build_series(self, df, ctx, wanted):
+        ctx['layout'] = self._series_layout(df)
+        return df
+
+    def _build_holidays(self, df, ctx, wanted):
+        if ctx.get('holidays_df') is not None:
+            return self._holiday_features(df, ctx['holidays_df'], ctx['day'], ctx['calendar'])
+        return self._simple_holiday_features(df)
+
+    def _rolling_subset(self, wanted):
+        """Rolling windows and EWM spans with at least one wanted column."""
+        windows = [w for w in self.rolling_windows
+                   if any(f'sales_roll_{stat}_{w}' in wanted for stat in self.rolling_stats)]
+        spans = [span for span in self.ewm_spans if f'sales_ewm_{span}' in wanted]
+        return windows, spans
+
     # ------------------------------------------------------------------
     # PRIVATE — Time Features
     # ------------------------------------------------------------------
 
-    def _time_features(self, df):
-        df['day_of_week'] = df['date'].dt.dayofweek
-        df['day_of_month'] = df['date'].dt.day
-        df['week_of_year'] = df['date'].dt.isocalendar().week.astype(int)
-        df['month'] = df['date'].dt.month
-        df['quarter'] = df['date'].dt.quarter
-        df['is_month_start'] = df['date'].dt.is_month_start.astype(int)
-        df['is_month_end'] = df['date'].dt.is_month_end.astype(int)
-        df['is_quarter_end'] = df['date'].dt.is_quarter_end.astype(int)
+    @staticmethod
+    def _day_ordinals(dates):
+        """Map each row's date to an int32 offset into a dense daily calendar."""
+        origin = dates.min()
+        day = ((dates.values - np.datetime64(origin)) // np.timedelta64(1, 'D')).astype(np.int32)
+        calendar = pd.date_range(origin, periods=int(day.max()) + 1, freq='D')
+        return day, calendar
+
+    def _time_features(self, df, day, calendar):
+        dim = pd.DataFrame(index=calendar)
+        dim['day_of_week'] = calendar.dayofweek
+        dim['day_of_month'] = calendar.day
+        dim['week_of_year'] = calendar.isocalendar().week.astype(int).values
+        dim['month'] = calendar.month
+        dim['quarter'] = calendar.quarter
+        dim['is_month_start'] = calendar.is_month_start.astype(int)
+        dim['is_month_end'] = calendar.is_month_end.astype(int)
+        dim['is_quarter_end'] = calendar.is_quarter_end.astype(int)
 
         # Payday — Ecuador pays on 15th and last day of month
-        df['is_payday'] = (
-            (df['day_of_month'] == 15) | (df['is_month_end'] == 1)
+        dim['is_payday'] = (
+            (dim['day_of_month'] == 15) | (dim['is_month_end'] == 1)
         ).astype(int)
 
+        for col in dim.columns:
+            df[col] = dim[col].values[day]
         return df
 
     # ------------------------------------------------------------------
     # PRIVATE — Holiday Features
     # ------------------------------------------------------------------
 
-    def _holiday_features(self, df, holidays_df):
+    def _holiday_features(self, df, holidays_df, day, calendar):
         """Detailed holiday features from raw holidays_events.csv."""
         hol = holidays_df.copy()
         hol['date'] = pd.to_datetime(hol['date'])
         hol = hol[hol['transferred'] == False].copy()
 
+        dim = pd.DataFrame(index=calendar)
+
         # National holidays
         national = hol[hol['locale'] == 'National']['date'].unique()
-        df['is_national_holiday'] = df['date'].isin(national).astype(int)
+        dim['is_national_holiday'] = calendar.isin(national).astype(int)
 
         # Regional holidays
         regional = hol[hol['locale'] == 'Regional']['date'].unique()
-        df['is_regional_holiday'] = df['date'].isin(regional).astype(int)
+        dim['is_regional_holiday'] = calendar.isin(regional).astype(int)
 
-        # Days to next / since last holiday
-        all_holiday_dates = sorted(pd.to_datetime(hol['date'].unique()))
-        df['days_to_next_holiday'] = df['date'].apply(
-            lambda d: self._days_to_nearest(d, all_holiday_dates, direction='next')
-        )
-        df['days_since_last_holiday'] = df['date'].apply(
-            lambda d: self._days_to_nearest(d, all_holiday_dates, direction='prev')
-        )
+        # Days to next / since last holiday — binary search on the sorted dates
+        holiday_dates = np.sort(hol['date'].unique()).astype('datetime64[ns]')
+        dates = calendar.values.astype('datetime64[ns]')
+        one_day = np.timedelta64(1, 'D')
+
+        nxt = np.searchsorted(holiday_dates, dates, side='left')
+        has_next = nxt < len(holiday_dates)
+        to_next = np.full(len(dates), 30, dtype=np.int64)
+        to_next[has_next] = (holiday_dates[nxt[has_next]] - dates[has_next]) // one_day
+        dim['days_to_next_holiday'] = to_next
+
+        prev = np.searchsorted(holiday_dates, dates, side='right') - 1
+        has_prev = prev >= 0
+        since_last = np.full(len(dates), 30, dtype=np.int64)
+        since_last[has_prev] = (dates[has_prev] - holiday_dates[prev[has_prev]]) // one_day
+        dim['days_since_last_holiday'] = since_last
+
+        for col in dim.columns:
+            df[col] = dim[col].values[day]
 
         # Ensure is_holiday exists
         if 'is_holiday' not in df.columns:
@@ -155,31 +466,31 @@ class FeatureEngineer:
             df['is_holiday'] = 0
         return df
 
-    @staticmethod
-    def _days_to_nearest(date, holiday_dates, direction='next'):
-        """Calculate days to next or since last holiday."""
-        if direction == 'next':
-            future = [h for h in holiday_dates if h >= date]
-            return (future[0] - date).days if future else 30
-        else:
-            past = [h for h in holiday_dates if h <= date]
-            return (date - past[-1]).days if past else 30
-
     # ------------------------------------------------------------------
     # PRIVATE — Oil Price Features
     # ------------------------------------------------------------------
 
-    def _oil_features(self, df):
+    def _oil_features(self, df, day, calendar):
+        """Oil is a date-level signal: roll it over calendar days, then broadcast."""
         if 'dcoilwtico' not in df.columns:
             df['dcoilwtico'] = 0.0
 
-        # Forward-fill missing oil prices
-        df['dcoilwtico'] = df['dcoilwtico'].ffill().bfill().fillna(0)
+        # One price per calendar day, forward-filled over missing days
+        oil = df['dcoilwtico'].values.astype(np.float64)
+        known = ~np.isnan(oil)
+        daily = np.full(len(calendar), np.nan)
+        daily[day[known]] = oil[known]
+        daily = pd.Series(daily).ffill().bfill().fillna(0)
+
+        dim = pd.DataFrame({'dcoilwtico': daily.values})
+        dim['oil_price_7d_ma'] = daily.rolling(7, min_periods=1).mean().values
+        dim['oil_price_30d_ma'] = daily.rolling(30, min_periods=1).mean().values
+        dim['oil_price_volatility'] = daily.rolling(7, min_periods=1).std().fillna(0).values
+        dim['oil_price_trend'] = daily.diff(7).fillna(0).values
 
-        df['oil_price_7d_ma'] = df['dcoilwtico'].rolling(7, min_periods=1).mean()
-        df['oil_price_30d_ma'] = df['dcoilwtico'].rolling(30, min_periods=1).mean()
-        df['oil_price_volatility'] = df['dcoilwtico'].rolling(7, min_periods=1).std().fillna(0)
-        df['oil_price_trend'] = df['dcoilwtico'].diff(7).fillna(0)
+        df['dcoilwtico'] = dim['dcoilwtico'].values[day].astype(df['dcoilwtico'].dtype)
+        for col in dim.columns[1:]:
+            df[col] = dim[col].values[day]
 
         return df
 
@@ -187,12 +498,30 @@ class FeatureEngineer:
     # PRIVATE — Transaction Features
     # ------------------------------------------------------------------
 
-    def _transaction_features(self, df):
+    def _transaction_features(self, df, day, calendar):
+        """Transactions are per store and day: roll each store over calendar days."""
         if 'transactions' not in df.columns:
             df['transactions'] = 0
 
         df['transactions'] = df['transactions'].fillna(0)
-        df['txn_7d_ma'] = df['transactions'].rolling(7, min_periods=1).mean()
+
+        # Dense (store × day) grid; days a store has no rows stay NaN and are skipped
+        if 'store_nbr' in df.columns:
+            store_codes, _ = pd.factorize(df['store_nbr'])
+        else:
+            store_codes = np.zeros(len(df), dtype=np.int64)
+        n_stores, n_days = int(store_codes.max()) + 1, len(calendar)
+        cell = store_codes.astype(np.int64) * n_days + day
+
+        grid = np.full(n_stores * n_days, np.nan)
+        grid[cell] = df['transactions'].values
+        ma = (
+            pd.DataFrame(grid.reshape(n_stores, n_days).T)
+            .rolling(7, min_periods=1).mean()
+            .to_numpy().T.ravel()
+        )
+
+        df['txn_7d_ma'] = ma[cell]
         df['txn_deviation'] = np.where(
             df['txn_7d_ma'] > 0,
             df['transactions'] / df['txn_7d_ma'],
@@ -204,44 +533,58 @@ class FeatureEngineer:
     # PRIVATE — Lag & Rolling Features
     # ------------------------------------------------------------------
 
-    def _lag_features(self, df):
-        """Per store×family lag features to avoid data leakage."""
-        if 'sales' not in df.columns:
-            return df
-
+    def _series_layout(self, df):
+        """
+        Sort order that makes each store×family series contiguous (row order
+        kept within a series), shared by the lag and rolling kernels.
+        Falls back to a single global series when group columns are missing.
+        """
         group_cols = ['store_nbr', 'family']
-        # Verify group columns exist
-        if not all(c in df.columns for c in group_cols):
-            # Fall back to global lags
-            for lag in self.lag_days:
-                df[f'sales_lag_{lag}'] = df['sales'].shift(lag)
+        if all(c in df.columns for c in group_cols):
+            codes = df.groupby(group_cols, sort=False, observed=True).ngroup().values
+        else:
+            codes = np.zeros(len(df), dtype=np.int64)
+        return series_layout(codes)
+
+    def _lag_features(self, df, layout=None, lags=None):
+        """Per store×family lag features to avoid data leakage."""
+        lags = self.lag_days if lags is None else lags
+        if 'sales' not in df.columns or not lags:
             return df
 
-        for lag in self.lag_days:
-            df[f'sales_lag_{lag}'] = df.groupby(group_cols)['sales'].shift(lag)
+        order, starts = layout or self._series_layout(df)
+        sales = df['sales'].values[order].astype(np.float64)
+        for lag in lags:
+            out = np.empty(len(df), dtype=np.float32)
+            out[order] = grouped_lag(sales, starts, lag)
+            df[f'sales_lag_{lag}'] = out
 
         return df
 
-    def _rolling_features(self, df):
+    def _rolling_features(self, df, layout=None, windows=None, spans=None):
         """Per store×family rolling stats (shifted by 1 to prevent leakage)."""
-        if 'sales' not in df.columns:
+        windows = self.rolling_windows if windows is None else windows
+        spans = self.ewm_spans if spans is None else spans
+        if 'sales' not in df.columns or not (windows or spans):
             return df
 
-        group_cols = ['store_nbr', 'family']
-        if not all(c in df.columns for c in group_cols):
-            for window in self.rolling_windows:
-                shifted = df['sales'].shift(1)
-                df[f'sales_roll_mean_{window}'] = shifted.rolling(window, min_periods=1).mean()
-                df[f'sales_roll_std_{window}'] = shifted.rolling(window, min_periods=1).std().fillna(0)
-            return df
+        order, starts = layout or self._series_layout(df)
+        sales = df['sales'].values[order].astype(np.float64)
+
+        for window in windows:
+            stats = grouped_rolling(sales, starts, window, stats=self.rolling_stats, shift=1)
+            for stat in self.rolling_stats:
+                values = stats[stat]
+                if stat == 'std':
+                    values = np.nan_to_num(values, nan=0.0)
+                out = np.empty(len(df), dtype=np.float32)
+                out[order] = values
+                df[f'sales_roll_{stat}_{window}'] = out
 
-        for window in self.rolling_windows:
-            df[f'sales_roll_mean_{window}'] = df.groupby(group_cols)['sales'].transform(
-                lambda x: x.shift(1).rolling(window, min_periods=1).mean()
-            )
-            df[f'sales_roll_std_{window}'] = df.groupby(group_cols)['sales'].transform(
-                lambda x: x.shift(1).rolling(window, min_periods=1).std().fillna(0)
-            )
+        for span in spans:
+            out = np.empty(len(df), dtype=np.float32)
+            out[order] = grouped_ewm(sales, starts, span, shift=1)
+            df[f'sales_ewm_{span}'] = out
 
         return df
 
@@ -263,3 +606,39 @@ class FeatureEngineer:
             if col not in df.columns:
                 print(f"⚠️ '{col}' missing — filling with {default}")
                 df[col] = default
+
+
+def _feature_shard(task):
+    """
+    Process-pool worker: run the store/series-level plan on one contiguous
+    block of store-ordered rows read from memory-mapped inputs, writing each
+    output column into its memory-mapped result array.
+    """
+    lo, hi = task['lo'], task['hi']
+    arrays = {name: np.load(path, mmap_mode='r') for name, path in task['inputs'].items()}
+
+    eng = FeatureEngineer(task['config_path'])
+    for attr, value in task['spec'].items():
+        setattr(eng, attr, list(value))
+    eng.n_workers = 1
+
+    # 'family' carries series codes: only (store_nbr, family) grouping is needed
+    shard = pd.DataFrame({
+        col: np.asarray(arrays[col][lo:hi]) for col in ('store_nbr', 'family', 'sales', 'transactions')
+    })
+    ctx = {
+        'day': np.asarray(arrays['day'][lo:hi]),
+        'calendar': pd.date_range(task['origin'], periods=task['n_days'], freq='D'),
+    }
+    graph = eng.feature_graph()
+    for name, wanted in task['plan']:
+        shard = graph[name]['build'](shard, ctx, set(wanted))
+
+    dtypes = {}
+    for col, path in task['outputs'].items():
+        if col in shard.columns:
+            out = np.load(path, mmap_mode='r+')
+            out[lo:hi] = shard[col].values
+            out.flush()
+            dtypes[col] = shard[col].dtype.str
+    return dtypes
@@ -0,0 +1,241 @@
+"""
+LightGBM Training Module — v2.0
+Binned Dataset cache, booster fitting and tuning trials shared by
+LightGBMModel, LightGBMTuner and their process-pool workers. Deliberately
+free of TensorFlow: spawned workers import only this module, not src.model.
+"""
+
+import os
+import json
+import time
+import hashlib
+import numpy as np
+import pandas as pd
+import lightgbm as lgb
+
+
+# Training rows per LightGBM thread when sizing parallel per-family fits
+LGBM_ROWS_PER_THREAD = 20_000
+
+
+class LGBMDatasetCache:
+    """
+    Constructed lgb.Datasets keyed by (family, split, feature spec, data).
+
+    LightGBM bins every feature when a Dataset is constructed; that work is
+    done once per key. Datasets are memoised in-process (repeated trials
+    reuse the same object) and, when `path` is set, saved in LightGBM's
+    binary format so later runs load the bins instead of recomputing them:
+
+      <path>/<family>-<fid>/<split>-<digest>.train.bin   training bins
+      <path>/<family>-<fid>/<split>-<digest>.valid.bin   validation, built with reference=train
+      <path>/<family>-<fid>/<split>-<digest>.json        family, pandas categorical mapping, rows
+
+where <family> is the name made path-safe and <fid> a short hash of the
+original name, so families that sanitize alike keep separate directories.
+
+    The digest covers the column names and dtypes, the binning params and a
+    hash of the feature / target values, so changed data gets a new entry.
+    Only the newest entry per (family, split) is kept: writing one deletes
+    the older digests, so the cache holds one binned copy of each split.
+    """
+
+    def __init__(self, path=None, params=None):
+        self.path = path
+        self.params = dict(params or {})
+        self._memo = {}
+
+    def get(self, family, split, X_train, y_train, X_val=None, y_val=None, digest=None):
+        """Returns (train_set, valid_set); valid_set is None without validation data."""
+        digest = digest or self.digest(X_train, y_train, X_val, y_val)
+        cached = self.cached(family, split, digest)
+        if cached is not None:
+            return cached
+
+        stem = self._stem(family, split, digest)
+        train_set = lgb.Dataset(X_train, y_train, params=self.params, free_raw_data=True)
+        valid_set = None
+        if X_val is not None:
+            valid_set = lgb.Dataset(X_val, y_val, reference=train_set, params=self.params,
+                                    free_raw_data=True)
+        train_set.construct()
+        if valid_set is not None:
+            valid_set.construct()
+        if stem:
+            os.makedirs(os.path.dirname(stem), exist_ok=True)
+            train_set.save_binary(stem + '.train.bin')
+            if valid_set is not None:
+                valid_set.save_binary(stem + '.valid.bin')
+            with open(stem + '.json', 'w') as f:
+                json.dump({
+                    'family': str(family), 'split': split, 'digest': digest,
+                    'rows': int(len(X_train)), 'has_valid': valid_set is not None,
+                    'pandas_categorical': train_set.pandas_categorical,
+                }, f, indent=2)
+            self._prune(family, split, digest)
+
+        self._memo[(family, split, digest)] = (train_set, valid_set)
+        return train_set, valid_set
+
+    def _prune(self, family, split, digest):
+        """Delete the files and memo entries of older digests of (family, split)."""
+        for key in [k for k in self._memo if k[:2] == (family, split) and k[2] != digest]:
+            del self._memo[key]
+
+        keep = os.path.basename(self._stem(family, split, digest))
+        family_dir = os.path.dirname(self._stem(family, split, digest))
+        names = os.listdir(family_dir)
+        for stem in {name.split('.', 1)[0] for name in names} - {keep}:
+            meta_path = os.path.join(family_dir, stem + '.json')
+            if os.path.exists(meta_path):
+                with open(meta_path, 'r') as f:
+                    meta = json.load(f)
+                owned = meta.get('family') == str(family) and meta.get('split') == split
+            else:
+                # Bins left without their json by an interrupted write
+                owned = stem.rsplit('-', 1)[0] == split
+            if owned:
+                for name in names:
+                    if name.split('.', 1)[0] == stem:
+                        os.remove(os.path.join(family_dir, name))
+
+    def cached(self, family, split, digest):
+        """
+        (train_set, valid_set) for a digest already built here or saved on
+        disk, else None — lets workers reuse bins without receiving the data.
+        """
+        key = (family, split, digest)
+        if key in self._memo:
+            return self._memo[key]
+        stem = self._stem(family, split, digest)
+        if not stem or not os.path.exists(stem + '.json'):
+            return None
+
+        with open(stem + '.json', 'r') as f:
+            meta = json.load(f)
+        train_set = lgb.Dataset(stem + '.train.bin', params=self.params)
+        train_set.pandas_categorical = meta['pandas_categorical']
+        valid_set = None
+        if meta['has_valid']:
+            valid_set = lgb.Dataset(stem + '.valid.bin', reference=train_set, params=self.params)
+        train_set.construct()
+        self._memo[key] = (train_set, valid_set)
+        return train_set, valid_set
+
+    def _stem(self, family, split, digest):
+        if not self.path:
+            return None
+        safe_family = str(family).replace(' ', '_').replace('/', '_')
+        family_id = hashlib.sha1(str(family).encode()).hexdigest()[:8]
+        return os.path.join(self.path, f'{safe_family}-{family_id}', f'{split}-{digest[:16]}')
+
+    def digest(self, X_train, y_train, X_val=None, y_val=None):
+        """Hash of the binning params, column spec and values of one split."""
+        h = hashlib.sha1()
+        h.update(json.dumps(self.params, sort_keys=True).encode())
+        for X, y in ((X_train, y_train), (X_val, y_val)):
+            if X is None:
+                h.update(b'none')
+                continue
+            h.update(json.dumps([[str(c), str(t)] for c, t in X.dtypes.items()]).encode())
+            h.update(pd.util.hash_pandas_object(X, index=False).values.tobytes())
+            h.update(np.ascontiguousarray(np.asarray(y, dtype=np.float64)).tobytes())
+        return h.hexdigest()
+
+
+def fit_lgbm(params, early_stopping, train_set, valid_set=None, callbacks=None):
+    """Train one booster on constructed Datasets, early stopping on valid_set."""
+    params = dict(params)
+    num_boost_round = params.pop('n_estimators', 100)
+    callbacks = [lgb.log_evaluation(period=0)] + list(callbacks or [])
+    if valid_set is not None:
+        callbacks.insert(0, lgb.early_stopping(early_stopping, verbose=False))
+
+    return lgb.train(
+        params, train_set,
+        num_boost_round=num_boost_round,
+        valid_sets=[valid_set] if valid_set is not None else None,
+        callbacks=callbacks
+    )
+
+
+def fit_family(task):
+    """Process-pool worker: fit one family's model on its cached Datasets."""
+    datasets = LGBMDatasetCache(*task['cache'])
+    train_set, valid_set = datasets.get(task['family'], task['split'], task['X_train'], task['y_train'],
+                                        task['X_val'], task['y_val'])
+    model = fit_lgbm(task['params'], task['early_stopping'], train_set, valid_set)
+    return task['family'], model
+
+
+# ------------------------------------------------------------------
+# Tuning trials
+# ------------------------------------------------------------------
+
+
+class TrialPruned(Exception):
+    """Raised from the pruning callback to stop a trial early."""
+
+
+_trial_datasets = None
+
+
+def median_pruner(task, curve):
+    """
+    LightGBM callback: every prune_interval rounds append the best validation
+    score so far to `curve`, and raise TrialPruned when it is worse than the
+    median of the finished trials at that point (or the deadline has passed).
+    """
+    interval = task['prune_interval']
+    finished = task['curves']
+
+    def _callback(env):
+        if (env.iteration + 1) % interval:
+            return
+        score = env.evaluation_result_list[0][2]
+        curve.append(min(score, curve[-1]) if curve else score)
+        if time.time() >= task['deadline']:
+            raise TrialPruned('timeout')
+        if len(finished) < task['prune_warmup']:
+            return
+        # Finished curves that stopped early keep their final (best) score
+        step = len(curve) - 1
+        median = np.median([c[min(step, len(c) - 1)] for c in finished if c])
+        if curve[-1] > median:
+            raise TrialPruned('pruned')
+
+    return _callback
+
+
+def run_trial(task, datasets=None):
+    """
+    Tuning worker (see src/tuning.py): fit one trial on the Datasets cached
+    under task['digest'] and return its record. Datasets loaded in a worker
+    process are kept for its later trials.
+    """
+    global _trial_datasets
+    if datasets is None:
+        if _trial_datasets is None:
+            _trial_datasets = LGBMDatasetCache(*task['cache'])
+        datasets = _trial_datasets
+    train_set, valid_set = datasets.cached(task['family'], 'holdout', task['digest'])
+
+    t0 = time.time()
+    curve = []
+    try:
+        model = fit_lgbm(task['params'], task['early_stopping'], train_set, valid_set,
+                         callbacks=[median_pruner(task, curve)])
+        state = 'complete'
+        score = model.best_score['valid_0']['rmse']
+        best_iteration = model.best_iteration
+    except TrialPruned as e:
+        state = str(e)
+        score = curve[-1] if curve else float('nan')
+        best_iteration = len(curve) * task['prune_interval']
+
+    return {
+        'family': task['family'], 'trial': task['trial'], 'state': state,
+        'overrides': task['overrides'], 'score': float(score),
+        'best_iteration': int(best_iteration), 'curve': curve,
+        'seconds': time.time() - t0,
+    }
@@ -10,11 +10,19 @@ v2.1 adds cross-version Keras compatibility:
 
 import os
 import json
+import multiprocessing
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 import numpy as np
+import pandas as pd
 import joblib
 import yaml
 from datetime import datetime
 
+from .preprocessing import ScalerBank
+from .compiled_trees import compile_booster, route_predict
+
 # ======================================================================
 # TensorFlow / Keras (LSTM)
 # ======================================================================
@@ -33,6 +41,8 @@ from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
 # ======================================================================
 import lightgbm as lgb
 
+from .lgbm_training import LGBMDatasetCache, LGBM_ROWS_PER_THREAD, fit_lgbm, fit_family
+
 # ======================================================================
 # Ensemble
 # ======================================================================
@@ -221,6 +231,54 @@ class AttentionLayer(Layer):
 _COMPAT_CUSTOM_OBJECTS["AttentionLayer"] = AttentionLayer
 
 
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# STREAMING WINDOW INPUT (tf.data)
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def window_dataset(data, starts, look_back, batch_size, shuffle=True, with_target=True, seed=42):
+    """
+    tf.data pipeline of (look_back, features) windows cut from `data` on the fly.
+
+    Only the int64 window start rows are shuffled and batched; each batch's
+    windows are gathered from the row array in a parallel map and prefetched,
+    so memory stays at one copy of `data` regardless of how many windows exist.
+    The target is column 0 (sales) of the row after each window.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ds = tf.data.Dataset.from_tensor_slices(starts)
+    if shuffle:
+        ds = ds.shuffle(len(starts), seed=seed, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size)
+
+    offsets = tf.range(look_back, dtype=tf.int64)
+
+    def gather(batch_starts):
+        X = tf.gather(data, batch_starts[:, None] + offsets[None, :])
+        if not with_target:
+            return X
+        return X, tf.gather(data[:, 0], batch_starts + look_back)
+
+    return ds.map(gather, num_parallel_calls=tf.data.AUTOTUNE).prefetch(tf.data.AUTOTUNE)
+
+
+class ThroughputCallback(tf.keras.callbacks.Callback):
+    """Records training samples/sec for every epoch."""
+
+    def __init__(self, n_samples):
+        super().__init__()
+        self.n_samples = n_samples
+        self.samples_per_sec = []
+        self._t0 = None
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._t0 = datetime.now()
+
+    def on_epoch_end(self, epoch, logs=None):
+        elapsed = max((datetime.now() - self._t0).total_seconds(), 1e-9)
+        self.samples_per_sec.append(self.n_samples / elapsed)
+        print(f"  ⏱️ epoch {epoch + 1}: {self.samples_per_sec[-1]:,.0f} samples/sec")
+
+
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # ATTENTION LSTM MODEL
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -301,9 +359,57 @@ class AttentionLSTMModel:
         )
         return history
 
+    def train_stream(self, data, train_starts, val_starts=None, epochs=None, batch_size=None):
+        """
+        Train from a tf.data pipeline that builds windows on the fly, so the
+        (samples × look_back × features) tensor is never materialized.
+
+        Parameters
+        ----------
+        data : 2-D float array (rows, features), sales in column 0, rows of
+               each series contiguous and date-ordered (see Preprocessor.sequence_windows)
+        train_starts : window start rows to train on (shuffled across series every epoch)
+        val_starts : window start rows of the held-out date range (optional)
+
+        Returns
+        -------
+        Keras History; history.history['samples_per_sec'] holds per-epoch throughput.
+        """
+        e = epochs or self.config['model']['epochs']
+        b = batch_size or self.config['model']['batch_size']
+        look_back = self.input_shape[0]
+
+        data = tf.constant(np.asarray(data, dtype=np.float32))
+        train_ds = window_dataset(data, train_starts, look_back, b, shuffle=True)
+        val_ds = None
+        if val_starts is not None and len(val_starts):
+            val_ds = window_dataset(data, val_starts, look_back, b, shuffle=False)
+
+        monitor = 'val_loss' if val_ds is not None else 'loss'
+        throughput = ThroughputCallback(len(train_starts))
+        callbacks = [
+            EarlyStopping(monitor=monitor, patience=8, restore_best_weights=True, verbose=1),
+            ReduceLROnPlateau(monitor=monitor, factor=0.5, patience=4, min_lr=1e-6, verbose=1),
+            throughput,
+        ]
+
+        print(f"Streaming Attention LSTM training for up to {e} epochs — "
+              f"{len(train_starts):,} train / {0 if val_starts is None else len(val_starts):,} val windows...")
+        history = self.model.fit(train_ds, validation_data=val_ds, epochs=e,
+                                 callbacks=callbacks, verbose=1)
+        history.history['samples_per_sec'] = throughput.samples_per_sec
+        return history
+
     def predict(self, X):
         return self.model.predict(X, verbose=0).flatten()
 
+    def predict_windows(self, data, starts, batch_size=None):
+        """Predict for window start rows of `data` without materializing the windows."""
+        b = batch_size or self.config['model']['batch_size']
+        data = tf.constant(np.asarray(data, dtype=np.float32))
+        ds = window_dataset(data, starts, self.input_shape[0], b, shuffle=False, with_target=False)
+        return self.model.predict(ds, verbose=0).flatten()
+
     def save(self, path):
         """Save in .keras format (preferred) — falls back to .h5 if path ends with .h5."""
         os.makedirs(os.path.dirname(path) if os.path.dirname(path) else ".", exist_ok=True)
@@ -352,48 +458,162 @@ class LightGBMModel:
             'random_state': 42,
         }
         self.early_stopping = lgb_cfg.get('early_stopping_rounds', 50)
-        self.models = {}  # family_name -> model
+        self.config_path = config_path
+
+        # Per-family overrides found by LightGBMTuner (src/tuning.py), kept in the registry
+        self.family_params = {}
+        if lgb_cfg.get('use_tuned_params', True):
+            self.family_params = ModelRegistry(config_path).load_tuned_params()
+
+        # family_name -> booster; saved boosters load lazily into a bounded LRU
+        self.booster_cache_size = lgb_cfg.get('booster_cache_size', 8)
+        self.save_compiled = lgb_cfg.get('compile', True)
+        self.models = BoosterCache(self.booster_cache_size)
+
+        # Binned training data: binary lgb.Datasets cached under the registry
+        self.dataset_params = {
+            'max_bin': lgb_cfg.get('max_bin', 255),
+            'feature_pre_filter': False,  # bins stay valid when trials change min_child_samples
+            'seed': self.params['random_state'],  # bin sampling, as when lgb.train constructs
+            'verbose': -1,
+        }
+        cache_cfg = lgb_cfg.get('dataset_cache', {})
+        self.dataset_cache_path = None
+        if cache_cfg.get('enabled', False):
+            base_path = self.config['model'].get('registry', {}).get('base_path', 'models')
+            self.dataset_cache_path = cache_cfg.get('path') or os.path.join(base_path, 'datasets')
+        self.datasets = LGBMDatasetCache(self.dataset_cache_path, self.dataset_params)
+
+        # Per-family fits run in n_workers processes sharing cpu_budget threads
+        n_workers = lgb_cfg.get('n_workers', 1)
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.cpu_budget = lgb_cfg.get('cpu_budget', 0) or os.cpu_count() or 1
+
+    def train(self, X_train, y_train, X_val=None, y_val=None, family_name='global', split='holdout'):
+        """
+        Train a single LightGBM model (an lgb.Booster).
 
-    def train(self, X_train, y_train, X_val=None, y_val=None, family_name='global'):
-        """Train a single LightGBM model."""
+        The binned train / validation Datasets come from self.datasets, keyed by
+        (family_name, split, feature spec, data), so re-runs on identical data
+        skip binning. `split` names the train/validation cut (e.g. 'fold2').
+        """
         print(f"Training LightGBM [{family_name}] — {X_train.shape[0]} samples, {X_train.shape[1]} features...")
 
-        callbacks = [lgb.early_stopping(self.early_stopping, verbose=False), lgb.log_evaluation(period=0)]
-        eval_set = [(X_val, y_val)] if X_val is not None else None
-
-        model = lgb.LGBMRegressor(**self.params)
-        model.fit(
-            X_train, y_train,
-            eval_set=eval_set,
-            callbacks=callbacks
-        )
+        train_set, valid_set = self.datasets.get(family_name, split, X_train, y_train, X_val, y_val)
+        model = fit_lgbm(self.params_for(family_name), self.early_stopping, train_set, valid_set)
 
         self.models[family_name] = model
-        print(f"  → Best iteration: {model.best_iteration_}")
+        print(f"  → Best iteration: {model.best_iteration}")
         return model
 
     def train_per_family(self, df, feature_cols, target_col='sales', val_ratio=0.15):
-        """Train a separate LightGBM for each product family."""
-        families = df['family'].unique() if 'family' in df.columns else ['global']
-        print(f"Training LightGBM for {len(families)} families...")
+        """
+        Train a separate LightGBM for each product family.
 
-        for fam in families:
-            subset = df[df['family'] == fam] if 'family' in df.columns else df
+        Rows are grouped into contiguous family slices once. With
+        model.lightgbm.n_workers > 1 the fits are scheduled over a process
+        pool instead of one after another (see _train_families_parallel);
+        either way self.models ends up with the same entries, in family order.
+        """
+        tasks = []
+        for fam, X_train, y_train, X_val, y_val in self.holdout_splits(df, feature_cols, target_col, val_ratio):
+            if self.n_workers > 1:
+                tasks.append({'family': fam, 'split': 'holdout', 'X_train': X_train, 'y_train': y_train,
+                              'X_val': X_val, 'y_val': y_val})
+            else:
+                self.train(X_train, y_train, X_val, y_val, family_name=fam)
+
+        if tasks:
+            self._train_families_parallel(tasks)
+
+        print(f"Trained {len(self.models)} family models.")
+
+    def holdout_splits(self, df, feature_cols, target_col='sales', val_ratio=0.15):
+        """
+        Yields (family, X_train, y_train, X_val, y_val) per family with enough
+        rows, the last val_ratio of each family's rows held out. The same cut
+        (split 'holdout') is used by training and tuning, so both hit the same
+        cached Datasets.
+        """
+        slices = self._family_slices(df)
+        print(f"Training LightGBM for {len(slices)} families...")
+
+        available = [c for c in feature_cols if c in df.columns]
+        for fam, subset in slices:
             if len(subset) < 100:
                 print(f"  ⚠️ Skipping {fam} — too few samples ({len(subset)})")
                 continue
 
-            available = [c for c in feature_cols if c in subset.columns]
             X = subset[available].fillna(0)
             y = subset[target_col].fillna(0)
 
             split_idx = int(len(X) * (1 - val_ratio))
-            X_train, X_val = X.iloc[:split_idx], X.iloc[split_idx:]
-            y_train, y_val = y.iloc[:split_idx], y.iloc[split_idx:]
+            yield fam, X.iloc[:split_idx], y.iloc[:split_idx], X.iloc[split_idx:], y.iloc[split_idx:]
 
-            self.train(X_train, y_train, X_val, y_val, family_name=fam)
+    def params_for(self, family_name):
+        """Training params for one family: config defaults plus its tuned overrides."""
+        return dict(self.params, **self.family_params.get(family_name, {}).get('params', {}))
 
-        print(f"Trained {len(self.models)} family models.")
+    def _train_families_parallel(self, tasks):
+        """
+        Fit family models concurrently within the CPU budget.
+
+        Each fit gets n_jobs threads sized by its training rows
+        (LGBM_ROWS_PER_THREAD rows per thread, capped at cpu_budget). Families
+        are started largest first; a fit is launched whenever its threads fit
+        in the unused budget (smaller families backfill the gaps), so cores
+        stay busy without oversubscription. Workers are spawned rather than
+        forked: forking after LightGBM has run OpenMP in this process hangs.
+        They run src.lgbm_training.fit_family, so each one imports LightGBM
+        but not TensorFlow.
+        """
+        for task in tasks:
+            task['n_jobs'] = int(np.clip(len(task['X_train']) // LGBM_ROWS_PER_THREAD, 1, self.cpu_budget))
+            task['params'] = dict(self.params_for(task['family']), n_jobs=task['n_jobs'])
+            task['early_stopping'] = self.early_stopping
+            task['cache'] = (self.dataset_cache_path, self.dataset_params)
+
+        n_workers = min(self.n_workers, len(tasks))
+        print(f"  Scheduling {len(tasks)} family fits over {n_workers} processes, "
+              f"{self.cpu_budget} threads...")
+
+        pending = sorted(tasks, key=lambda t: len(t['X_train']), reverse=True)
+        running = {}  # future -> threads in use
+        fitted = {}
+        with ProcessPoolExecutor(max_workers=n_workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            while pending or running:
+                free = self.cpu_budget - sum(running.values())
+                while pending and len(running) < n_workers:
+                    fits = [t for t in pending if t['n_jobs'] <= free]
+                    if not fits and running:
+                        break
+                    task = fits[0] if fits else pending[0]
+                    pending.remove(task)
+                    running[pool.submit(fit_family, task)] = task['n_jobs']
+                    free -= task['n_jobs']
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del running[future]
+                    fam, model = future.result()
+                    fitted[fam] = model
+                    print(f"  → {fam}: best iteration {model.best_iteration} "
+                          f"({model.params['n_jobs']} threads)")
+
+        for task in tasks:
+            self.models[task['family']] = fitted[task['family']]
+
+    @staticmethod
+    def _family_slices(df):
+        """(family, rows) pairs in order of first appearance; each family's rows keep their order."""
+        if 'family' not in df.columns:
+            return [('global', df)]
+        codes, families = pd.factorize(df['family'])
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(families) + 1))
+        ordered = df.iloc[order]
+        return [(fam, ordered.iloc[lo:hi]) for fam, lo, hi in zip(families, bounds[:-1], bounds[1:])]
 
     def predict(self, X, family_name='global'):
         if family_name in self.models:
@@ -403,30 +623,161 @@ class LightGBMModel:
         else:
             raise ValueError(f"No model found for family '{family_name}'")
 
+    def predict_batch(self, X, families=None, family_col='family'):
+        """
+        Score rows from many families in one call.
+
+        Row indices are grouped by family once; each family's booster (or the
+        'global' one, as in predict) is called a single time on its contiguous
+        block, and the results are scattered back to the input row order.
+
+        Parameters
+        ----------
+        X : DataFrame of features (extra columns are ignored — each booster
+            gets the columns it was trained on)
+        families : per-row family names (defaults to X[family_col])
+        family_col : column holding the family when `families` is None
+
+        Returns
+        -------
+        np.ndarray aligned with the rows of X (NaN where no model applies)
+        """
+        families = X[family_col] if families is None else families
+        pred, missing = route_predict(self.models, X, families)
+        if missing:
+            print(f"[WARNING] No LightGBM model for families {missing} — left as NaN")
+        return pred
+
     def feature_importance(self, family_name='global'):
         model = self.models.get(family_name, self.models.get('global'))
         if model is None:
             return {}
-        return dict(zip(model.feature_name_, model.feature_importances_))
+        booster = getattr(model, 'booster_', model)  # LGBMRegressor from older versions
+        return dict(zip(booster.feature_name(), booster.feature_importance()))
+
+    def compile(self):
+        """
+        Compile every booster to a CompiledForest (flat NumPy trees scored
+        without lightgbm — see src/compiled_trees.py).
+
+        Returns
+        -------
+        dict of {family_name: CompiledForest}
+        """
+        return {name: compile_booster(self.models[name]) for name in self.models}
 
     def save(self, path):
+        """
+        Save each booster in LightGBM's native text format (best iteration
+        only) plus lgbm_manifest.json mapping the exact family names to files.
+        With model.lightgbm.compile the compiled forests are saved too
+        (compiled_*.npz, loadable by CompiledLightGBM without lightgbm).
+        """
         os.makedirs(path, exist_ok=True)
-        for name, model in self.models.items():
-            safe_name = name.replace(' ', '_').replace('/', '_')
-            joblib.dump(model, os.path.join(path, f'lgbm_{safe_name}.pkl'))
+        files, compiled = {}, {}
+        for name in self.models:
+            model = self.models[name]
+            booster = getattr(model, 'booster_', model)  # LGBMRegressor from older versions
+            safe_name = str(name).replace(' ', '_').replace('/', '_')
+            fname = f'lgbm_{safe_name}.txt'
+            n = 1
+            while fname in files.values():
+                n += 1
+                fname = f'lgbm_{safe_name}_{n}.txt'
+            booster.save_model(os.path.join(path, fname))
+            files[str(name)] = fname
+            if self.save_compiled:
+                compiled[str(name)] = 'compiled_' + fname.replace('lgbm_', '', 1).replace('.txt', '.npz')
+                compile_booster(booster).save(os.path.join(path, compiled[str(name)]))
+
+        with open(os.path.join(path, 'lgbm_manifest.json'), 'w') as f:
+            json.dump({'format': 'lightgbm-text', 'models': files, 'compiled': compiled}, f, indent=2)
         print(f"LightGBM models saved to {path}")
 
     def load(self, path):
-        self.models = {}
+        """
+        Register the boosters saved under `path`; each one is read from disk on
+        its first predict() and kept in an LRU of booster_cache_size models.
+        Directories saved before the manifest (joblib pickles) load eagerly.
+        """
         if not os.path.exists(path):
             raise FileNotFoundError(f"LightGBM model path not found: {path}")
-        for fname in os.listdir(path):
-            if fname.startswith('lgbm_') and fname.endswith('.pkl'):
-                family = fname.replace('lgbm_', '').replace('.pkl', '').replace('_', ' ')
-                self.models[family] = joblib.load(os.path.join(path, fname))
+        manifest_path = os.path.join(path, 'lgbm_manifest.json')
+        self.models = BoosterCache(self.booster_cache_size)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            for family, fname in manifest['models'].items():
+                self.models.register(family, os.path.join(path, fname))
+        else:
+            for fname in os.listdir(path):
+                if fname.startswith('lgbm_') and fname.endswith('.pkl'):
+                    family = fname.replace('lgbm_', '').replace('.pkl', '').replace('_', ' ')
+                    self.models[family] = joblib.load(os.path.join(path, fname))
         print(f"Loaded {len(self.models)} LightGBM models from {path}")
 
 
+class BoosterCache(MutableMapping):
+    """
+    family_name -> booster mapping whose saved entries load on first access.
+
+    register() records a model file without reading it; __getitem__ loads it
+    with lgb.Booster(model_file=...) and keeps at most `capacity` loaded
+    boosters, evicting the least recently used (0 = unbounded). Models put in
+    directly (freshly trained, or legacy pickles) have no file to reload
+    from, so they stay in memory. Membership, len() and iteration only touch
+    the names, never the files.
+    """
+
+    def __init__(self, capacity=8):
+        self.capacity = capacity
+        self._files = OrderedDict()    # family -> model file, None if pinned (keeps family order)
+        self._pinned = {}              # family -> in-memory model without a file
+        self._loaded = OrderedDict()   # family -> booster, least recently used first
+
+    def register(self, family, model_file):
+        self._pinned.pop(family, None)
+        self._loaded.pop(family, None)
+        self._files[family] = model_file
+
+    def __getitem__(self, family):
+        if family in self._pinned:
+            return self._pinned[family]
+        if family not in self._files:
+            raise KeyError(family)
+        if family in self._loaded:
+            self._loaded.move_to_end(family)
+            return self._loaded[family]
+        booster = lgb.Booster(model_file=self._files[family])
+        self._loaded[family] = booster
+        if self.capacity and len(self._loaded) > self.capacity:
+            self._loaded.popitem(last=False)
+        return booster
+
+    def __setitem__(self, family, model):
+        self._loaded.pop(family, None)
+        self._pinned[family] = model
+        self._files[family] = None
+
+    def __delitem__(self, family):
+        del self._files[family]
+        self._pinned.pop(family, None)
+        self._loaded.pop(family, None)
+
+    def __iter__(self):
+        return iter(self._files)
+
+    def __len__(self):
+        return len(self._files)
+
+    def __contains__(self, family):
+        return family in self._files
+
+    def loaded(self):
+        """Families whose boosters are currently in memory."""
+        return list(self._pinned) + list(self._loaded)
+
+
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # ENSEMBLE MODEL
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -513,7 +864,7 @@ class ModelRegistry:
                     existing.append(int(d[1:]))
         return max(existing, default=0) + 1
 
-    def save_version(self, models, metrics, feature_cols=None):
+    def save_version(self, models, metrics, feature_cols=None, scaler=None):
         """
         Save a versioned snapshot of all models + metadata.
 
@@ -522,6 +873,8 @@ class ModelRegistry:
         models : dict of {name: model_object}
         metrics : dict of {metric_name: value}
         feature_cols : list of feature column names
+        scaler : optional ScalerBank (or fitted sklearn scaler) for the LSTM inputs,
+                 saved alongside the models as scaler_bank.pkl / scaler.pkl
         """
         version = self.get_next_version()
         version_path = os.path.join(self.base_path, f'v{version}')
@@ -538,6 +891,15 @@ class ModelRegistry:
                 elif isinstance(model, EnsembleModel):
                     model.save(os.path.join(version_path, f'{name}.pkl'))
 
+        scaler_file = None
+        if scaler is not None:
+            if isinstance(scaler, ScalerBank):
+                scaler_file = 'scaler_bank.pkl'
+                scaler.save(os.path.join(version_path, scaler_file))
+            else:
+                scaler_file = 'scaler.pkl'
+                joblib.dump(scaler, os.path.join(version_path, scaler_file))
+
         # Save metadata
         metadata = {
             'version': version,
@@ -546,6 +908,7 @@ class ModelRegistry:
             'model_names': list(models.keys()),
             'feature_columns': feature_cols or [],
             'keras_format': '.keras',   # flag for loader to prefer .keras
+            'scaler': scaler_file,
         }
         with open(os.path.join(version_path, 'metadata.json'), 'w') as f:
             json.dump(metadata, f, indent=2)
@@ -576,6 +939,38 @@ class ModelRegistry:
         print(f"Loading model version v{version} (from {metadata['timestamp']})")
         return metadata, version_path
 
+    def save_tuned_params(self, best, trials=()):
+        """
+        Store tuned LightGBM params per family (shared by all later versions).
+
+        Parameters
+        ----------
+        best : dict of {family: {'params': ..., 'score': ..., ...}}; merged
+               into the stored entries, replacing only the families given
+        trials : iterable of trial records, appended to lgbm_trials.jsonl
+        """
+        tuning_path = os.path.join(self.base_path, 'tuning')
+        os.makedirs(tuning_path, exist_ok=True)
+
+        stored = self.load_tuned_params()
+        stored.update(best)
+        with open(os.path.join(tuning_path, 'lgbm_params.json'), 'w') as f:
+            json.dump(stored, f, indent=2)
+        with open(os.path.join(tuning_path, 'lgbm_trials.jsonl'), 'a') as f:
+            for trial in trials:
+                f.write(json.dumps(trial) + '\n')
+
+        print(f"✅ Tuned params for {len(best)} families saved to {tuning_path}")
+        return stored
+
+    def load_tuned_params(self):
+        """Tuned LightGBM params per family ({} if never tuned)."""
+        params_path = os.path.join(self.base_path, 'tuning', 'lgbm_params.json')
+        if not os.path.exists(params_path):
+            return {}
+        with open(params_path, 'r') as f:
+            return json.load(f)
+
     def _mlflow_log(self, version, metrics, artifact_path):
         """Log to MLflow (silently skips if not installed/configured)."""
         try:
@@ -7,6 +7,8 @@ import numpy as np
 import pandas as pd
 import yaml
 
+from .preprocessing import ScalerBank
+
 
 class PromotionOptimizer:
     """
@@ -33,10 +35,13 @@ class PromotionOptimizer:
     # Basic Promo Simulation (LSTM-based, backward compatible)
     # ------------------------------------------------------------------
 
-    def optimize(self, recent_data):
+    def optimize(self, recent_data, series_id=-1):
         """
         Compare No-Promo vs Promo using LSTM predictions.
         Backward-compatible with v1.0 interface.
+
+        series_id selects the series' statistics when the scaler is a per-series
+        ScalerBank (see ScalerBank.lookup); -1 uses the global fit.
         """
         print("\n--- 🤖 RUNNING PROMOTION SIMULATION ---")
 
@@ -44,18 +49,13 @@ class PromotionOptimizer:
         input_seq = current_seq.reshape(1, self.look_back, -1)
         PROMO_IDX = 1
 
-        # Scenario 1: No Promotion
-        seq_no = input_seq.copy()
-        seq_no[0, -1, PROMO_IDX] = 0
-        pred_no = self.model.predict(seq_no, verbose=0) if hasattr(self.model, 'predict') else self.model(seq_no)
-
-        # Scenario 2: With Promotion
-        seq_yes = input_seq.copy()
-        seq_yes[0, -1, PROMO_IDX] = 1
-        pred_yes = self.model.predict(seq_yes, verbose=0) if hasattr(self.model, 'predict') else self.model(seq_yes)
+        # Scenario 1: No Promotion / Scenario 2: With Promotion — one batch
+        seqs = np.repeat(input_seq, 2, axis=0)
+        seqs[0, -1, PROMO_IDX] = 0
+        seqs[1, -1, PROMO_IDX] = 1
+        preds = self.model.predict(seqs, verbose=0) if hasattr(self.model, 'predict') else self.model(seqs)
 
-        sales_no = self._inverse_sales(pred_no, current_seq)
-        sales_yes = self._inverse_sales(pred_yes, current_seq)
+        sales_no, sales_yes = (float(v) for v in self._inverse_sales(preds, series_id))
 
         promo_price = self.base_price * (1 - self.promo_discount)
         profit_no = (self.base_price - self.cost) * sales_no
@@ -247,10 +247,10 @@ class PromotionOptimizer:
     # Helpers
     # ------------------------------------------------------------------
 
-    def _inverse_sales(self, pred_value, reference_data):
-        """Un-scale predicted sales value."""
+    def _inverse_sales(self, pred_values, series_ids=-1):
+        """Un-scale a batch of predicted sales values (sales = column 0)."""
+        values = np.asarray(pred_values, dtype=np.float64).reshape(-1)
         if self.scaler is None:
-            return float(pred_value.flatten()[0])
-        dummy = np.zeros((1, reference_data.shape[1]))
-        dummy[0, 0] = pred_value.flatten()[0]
-        return self.scaler.inverse_transform(dummy)[0, 0]
\ No newline at end of file
+            return values
+        bank = self.scaler if isinstance(self.scaler, ScalerBank) else ScalerBank.from_scaler(self.scaler)
+        return bank.inverse_transform(values, series_ids, columns=[0])
\ No newline at end of file
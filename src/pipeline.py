@@ -3,17 +3,17 @@ Pipeline Module — v2.0
 End-to-end automated pipeline: data → features → train → evaluate → serve.
 """
 
-import os
 import time
 import yaml
-import joblib
 import numpy as np
 import pandas as pd
 
 from .data_loader import DataLoader
 from .features import FeatureEngineer
-from .preprocessing import Preprocessor
+from .feature_store import FeatureStore
+from .preprocessing import Preprocessor, ScalerBank
 from .model import AttentionLSTMModel, LightGBMModel, EnsembleModel, ModelRegistry
+from .tuning import LightGBMTuner
 from .evaluation import Evaluator
 from .anomaly_detection import AnomalyDetector
 
@@ -30,7 +30,8 @@ class Pipeline:
             self.config = yaml.safe_load(f)
 
         self.loader = DataLoader(config_path)
-        self.engineer = FeatureEngineer()
+        self.engineer = FeatureEngineer(config_path)
+        self.feature_store = FeatureStore(config_path, loader=self.loader, engineer=self.engineer)
         self.preprocessor = Preprocessor(config_path)
         self.evaluator = Evaluator()
         self.registry = ModelRegistry(config_path)
@@ -73,24 +74,14 @@ class Pipeline:
 
         # 1. Data Ingestion
         progress("Loading & merging data...")
-        raw = self.loader.load_raw_data()
-        df = self.loader.merge_data(raw)
-        holidays_raw = self.loader.get_holidays_raw()
-
-        if store_nbr or family:
-            df = self.loader.filter_subset(df, store_nbr, family)
-            print(f"  Filtered to {len(df)} rows")
-
+        # LSTM-only runs need no lag/rolling columns, so those graph nodes are skipped
+        needed = self.engineer.get_feature_columns(mode='lgbm' if train_lgbm else 'lstm')
+        df = self._load_data(store_nbr, family, needed)
         results['data_shape'] = df.shape
 
         # 2. Feature Engineering
         progress("Engineering features...")
-        df_feat = self.engineer.create_features(df, holidays_df=holidays_raw, include_lags=True)
-
-        # Drop rows with NaN from lags
-        initial_len = len(df_feat)
-        df_feat = df_feat.dropna(subset=[c for c in df_feat.columns if 'lag' in c or 'roll' in c])
-        print(f"  Dropped {initial_len - len(df_feat)} rows with NaN lags")
+        df_feat = self._engineer_features(df, needed)
         results['feature_shape'] = df_feat.shape
 
         # 3. Train LightGBM
@@ -114,12 +105,14 @@ class Pipeline:
 
             models['lgbm'] = lgbm
 
-            # Evaluate
-            test_X, test_y = self.preprocessor.prepare_lgbm_data(df_feat.tail(1000), feature_cols)
-            first_model_name = list(lgbm.models.keys())[0] if lgbm.models else 'global'
+            # Evaluate — every row is scored by its own family's model
+            test_df = df_feat.tail(1000)
+            test_X, test_y = self.preprocessor.prepare_lgbm_data(test_df, feature_cols)
             try:
-                pred = lgbm.predict(test_X, family_name=first_model_name)
-                metrics['lgbm'] = self.evaluator.calculate_metrics(test_y.values, pred, label='LightGBM')
+                pred = lgbm.predict_batch(test_X, families=self._families(test_df, family))
+                scored = ~np.isnan(pred)
+                metrics['lgbm'] = self.evaluator.calculate_metrics(test_y.values[scored], pred[scored],
+                                                                   label='LightGBM')
             except Exception as e:
                 print(f"  LightGBM eval failed: {e}")
                 metrics['lgbm'] = {}
@@ -129,45 +122,81 @@ class Pipeline:
             progress("Training Attention LSTM...")
             lstm_features = self.engineer.get_feature_columns(mode='lstm')
             lstm_cols = ['sales'] + [c for c in lstm_features if c in df_feat.columns]
-            df_lstm = df_feat[lstm_cols].copy()
 
-            df_scaled, scaler = self.preprocessor.scale_data(df_lstm)
-            X_seq, y_seq = self.preprocessor.create_sequences(df_scaled.values)
-
-            if len(X_seq) > 0:
-                input_shape = (X_seq.shape[1], X_seq.shape[2])
+            # Sequences must not slide across series: order rows series by series
+            # (row i of df_seq is row seq_order[i] of df_feat)
+            series_ids, series_keys = None, None
+            seq_order = np.arange(len(df_feat))
+            df_seq = df_feat
+            if 'store_nbr' in df_feat.columns and 'family' in df_feat.columns:
+                seq_order = (df_feat.reset_index(drop=True)
+                             .sort_values(['store_nbr', 'family', 'date'], kind='stable').index.values)
+                df_seq = df_feat.iloc[seq_order]
+                grouped = df_seq.groupby(['store_nbr', 'family'], sort=False, observed=True)
+                series_ids = grouped.ngroup().values
+                series_keys = grouped.size().index.to_frame(index=False)
+            df_lstm = df_seq[lstm_cols].copy()
+
+            # Per-series scaling (model.scaling) so small series are not flattened to ~0
+            df_scaled, scaler = self.preprocessor.scale_data(df_lstm, series_ids=series_ids,
+                                                             series_keys=series_keys)
+            seq_data = df_scaled.values.astype(np.float32)
+            windows, starts = self.preprocessor.sequence_windows(seq_data, series_ids)
+
+            if len(starts) > 0:
+                # Windows are cut on the fly; validation is the last days of every series
+                train_starts, val_starts = self.preprocessor.split_windows_by_date(
+                    starts, df_seq['date'].values
+                )
+                input_shape = (windows.shape[1], windows.shape[2])
                 lstm = AttentionLSTMModel(input_shape, self.config_path)
-                history = lstm.train(X_seq, y_seq)
+                history = lstm.train_stream(seq_data, train_starts, val_starts)
                 models['lstm'] = lstm
                 results['lstm_scaler'] = scaler
+                results['lstm_samples_per_sec'] = history.history['samples_per_sec']
 
-                # Evaluate
-                y_pred = lstm.predict(X_seq)
-                metrics['lstm'] = self.evaluator.calculate_metrics(y_seq, y_pred, label='LSTM')
+                # Evaluate on the held-out date range
+                eval_starts = val_starts if len(val_starts) else train_starts
+                y_pred = lstm.predict_windows(seq_data, eval_starts).astype(np.float64)
+                y_true = seq_data[eval_starts + self.preprocessor.look_back, 0].astype(np.float64)
+                metrics['lstm'] = self.evaluator.calculate_metrics(y_true, y_pred, label='LSTM')
                 self.evaluator.plot_loss(history)
 
-                joblib.dump(scaler, os.path.join(self.registry.base_path, 'scaler.pkl'))
-
         # 5. Build Ensemble (if both models trained)
         if 'lstm' in models and 'lgbm' in models:
             progress("Building ensemble...")
             try:
                 ensemble = EnsembleModel(self.config_path)
-                # Simple: use tail predictions
+                # Both models predict the last 500 rows of df_feat; for the LSTM
+                # that is the window whose target is the same row of df_seq
+                look_back = self.preprocessor.look_back
+                seq_pos = np.empty(len(seq_order), dtype=np.int64)
+                seq_pos[seq_order] = np.arange(len(seq_order))
+                start_of = np.full(len(df_seq), -1, dtype=np.int64)
+                start_of[starts + look_back] = starts
+                test_pos = np.arange(max(len(df_feat) - 500, 0), len(df_feat))
+                test_starts = start_of[seq_pos[test_pos]]
+                has_window = test_starts >= 0  # rows in a series' first look_back days have none
+                test_df = df_feat.iloc[test_pos[has_window]]
+                test_starts = test_starts[has_window]
+
                 preds = {}
                 test_X, test_y = self.preprocessor.prepare_lgbm_data(
-                    df_feat.tail(500), self.engineer.get_feature_columns(mode='lgbm')
+                    test_df, self.engineer.get_feature_columns(mode='lgbm')
                 )
-                first_model_name = list(models['lgbm'].models.keys())[0]
-                preds['lgbm'] = models['lgbm'].predict(test_X, family_name=first_model_name)
+                preds['lgbm'] = models['lgbm'].predict_batch(test_X, families=self._families(test_df, family))
 
-                # For LSTM, use the last chunk
-                lstm_preds = models['lstm'].predict(X_seq[-len(test_y):])
-                preds['lstm'] = lstm_preds[:len(test_y)]
+                # LSTM outputs are scaled sales: un-scale with each row's series statistics
+                bank = scaler if isinstance(scaler, ScalerBank) else ScalerBank.from_scaler(scaler)
+                target_ids = -1 if series_ids is None else series_ids[test_starts + look_back]
+                lstm_preds = models['lstm'].predict_windows(seq_data, test_starts)
+                preds['lstm'] = bank.inverse_transform(lstm_preds, target_ids, columns=['sales'])
 
-                min_len = min(len(v) for v in preds.values())
-                preds = {k: v[:min_len] for k, v in preds.items()}
-                y_ens = test_y.values[:min_len]
+                scored = ~np.isnan(preds['lgbm'])
+                if not scored.any():
+                    raise ValueError("no test rows with both an LSTM window and a LightGBM model")
+                preds = {k: v[scored] for k, v in preds.items()}
+                y_ens = test_y.values[scored]
 
                 ensemble.train(preds, y_ens)
                 models['ensemble'] = ensemble
@@ -187,7 +216,8 @@ class Pipeline:
                 flat_metrics[f'{model_name}_{k}'] = v
 
         version = self.registry.save_version(models, flat_metrics,
-                                             feature_cols=self.engineer.get_feature_columns())
+                                             feature_cols=self.engineer.get_feature_columns(),
+                                             scaler=results.get('lstm_scaler'))
 
         elapsed = time.time() - t0
         print(f"\n🏁 Pipeline complete in {elapsed:.1f}s — version v{version}")
@@ -196,3 +226,72 @@ class Pipeline:
         results['models'] = models
         results['version'] = version
         return results
+
+    # ------------------------------------------------------------------
+    # Hyperparameter Tuning
+    # ------------------------------------------------------------------
+
+    def tune(self, store_nbr=None, family=None, time_budget=None):
+        """
+        Search LightGBM params per family (see LightGBMTuner) and store the
+        best ones in the registry; later LightGBM trainings pick them up.
+
+        Parameters
+        ----------
+        store_nbr : optional store filter (None = all stores)
+        family : optional family filter (None = all families)
+        time_budget : seconds for the search (default tuning.time_budget_s)
+
+        Returns
+        -------
+        dict of {family: best trial summary}
+        """
+        feature_cols = self.engineer.get_feature_columns(mode='lgbm')
+        df_feat = self._engineer_features(self._load_data(store_nbr, family, feature_cols), feature_cols)
+        tuner = LightGBMTuner(self.config_path, registry=self.registry)
+        return tuner.tune(df_feat, feature_cols, time_budget=time_budget)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _load_data(self, store_nbr, family, needed):
+        """Merged rows for the requested series (with `needed` features from the store)."""
+        if self.feature_store.enabled:
+            # Rebuild only stale feature groups, then read the requested series
+            manifest = self.feature_store.ensure(needed)
+            df = self.feature_store.load(store_nbr, family,
+                                         columns=manifest['groups']['base']['columns'] + needed)
+            print(f"  Loaded {len(df)} rows from feature store")
+        else:
+            # The materialized merged dataset (it holds the appended days), opening
+            # only the partitions for the requested series
+            self.loader.ensure_merged()
+            df = self.loader.load_partition(store_nbr, family)
+            if store_nbr or family:
+                print(f"  Filtered to {len(df)} rows")
+        if self.loader.panel_enabled and not self.feature_store.enabled:
+            df = self.loader.complete_panel(df)
+        return df
+
+    def _engineer_features(self, df, needed):
+        """Feature frame for `needed` columns, without the rows whose lags are NaN."""
+        if self.feature_store.enabled:
+            df_feat = df
+        else:
+            holidays_raw = self.loader.get_holidays_raw()
+            df_feat = self.engineer.create_features(df, holidays_df=holidays_raw, include_lags=True,
+                                                    columns=needed)
+
+        # Drop rows with NaN from lags
+        initial_len = len(df_feat)
+        df_feat = df_feat.dropna(subset=[c for c in df_feat.columns if 'lag' in c or 'roll' in c])
+        print(f"  Dropped {initial_len - len(df_feat)} rows with NaN lags")
+        return df_feat
+
+    @staticmethod
+    def _families(df, family=None):
+        """Per-row family names used to route LightGBM predictions."""
+        if 'family' in df.columns:
+            return df['family'].values
+        return np.full(len(df), family or 'global', dtype=object)
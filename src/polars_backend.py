@@ -0,0 +1,311 @@
+"""
+Polars Backend Module — v2.0
+Lazy, multithreaded execution of the data and feature layer:
+merge_data → create_features → prepare_lgbm_data as one Polars query plan.
+Results are converted to pandas only at the model boundary.
+"""
+
+import numpy as np
+
+try:
+    import polars as pl
+except ImportError:  # optional backend
+    pl = None
+
+
+def polars_available():
+    return pl is not None
+
+
+class PolarsBackend:
+    """
+    Polars implementation of DataLoader.merge_data, FeatureEngineer.create_features
+    and Preprocessor.prepare_lgbm_data. Outputs match the pandas path column
+    for column (`python experiments/benchmark_backends.py --parity` checks it).
+    """
+
+    def __init__(self, lag_days=(1, 7, 14, 21, 28), rolling_windows=(7, 14, 30),
+                 rolling_stats=('mean', 'std'), ewm_spans=()):
+        if pl is None:
+            raise ImportError("polars is not installed — pip install polars")
+        self.lag_days = list(lag_days)
+        self.rolling_windows = list(rolling_windows)
+        self.rolling_stats = list(rolling_stats)
+        self.ewm_spans = list(ewm_spans)
+
+    # ------------------------------------------------------------------
+    # Conversion helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def to_lazy(df):
+        if isinstance(df, pl.LazyFrame):
+            return df
+        if isinstance(df, pl.DataFrame):
+            return df.lazy()
+        return pl.from_pandas(df).lazy()
+
+    @staticmethod
+    def _ensure_datetime(lf):
+        dtype = lf.collect_schema()['date']
+        if dtype == pl.String:
+            return lf.with_columns(pl.col('date').str.to_datetime('%Y-%m-%d').cast(pl.Datetime('ns')))
+        return lf.with_columns(pl.col('date').cast(pl.Datetime('ns')))
+
+    # ------------------------------------------------------------------
+    # Merge
+    # ------------------------------------------------------------------
+
+    def merge_lazy(self, data):
+        """Lazy equivalent of DataLoader.merge_data."""
+        train = self._ensure_datetime(self.to_lazy(data['train'])).with_row_index('_row')
+        stores = self.to_lazy(data['stores'])
+        key_dtype = train.collect_schema()['store_nbr']
+        stores = stores.with_columns(pl.col('store_nbr').cast(key_dtype))
+
+        # 1. Stores
+        lf = train.join(stores, on='store_nbr', how='left')
+
+        # 2. Oil — daily upsample + forward fill within the oil range
+        oil = self._ensure_datetime(self.to_lazy(data['oil'])).sort('date')
+        oil_bounds = oil.select(pl.col('date').min().alias('lo'), pl.col('date').max().alias('hi'))
+        oil_daily = (
+            oil_bounds
+            .select(pl.datetime_ranges('lo', 'hi', interval='1d', time_unit='ns').alias('date'))
+            .explode('date')
+            .join(oil, on='date', how='left')
+            .with_columns(pl.col('dcoilwtico').forward_fill())
+        )
+        lf = lf.join(oil_daily, on='date', how='left')
+
+        # 3. Holidays
+        holidays = self._ensure_datetime(self.to_lazy(data['holidays']))
+        holiday_flag = (
+            holidays.filter(pl.col('transferred') == False)  # noqa: E712
+            .select('date').unique()
+            .with_columns(pl.lit(1, dtype=pl.Int64).alias('is_holiday'))
+        )
+        lf = lf.join(holiday_flag, on='date', how='left').with_columns(
+            pl.col('is_holiday').fill_null(0)
+        )
+
+        # 4. Transactions
+        if 'transactions' in data:
+            trans = self._ensure_datetime(self.to_lazy(data['transactions'])).with_columns(
+                pl.col('store_nbr').cast(key_dtype)
+            )
+            lf = lf.join(trans.select('date', 'store_nbr', 'transactions'),
+                         on=['date', 'store_nbr'], how='left')
+            lf = lf.with_columns(pl.col('transactions').fill_null(0))
+
+        # Restore train row order, then the row-order oil fill of merge_data
+        lf = lf.sort('_row').drop('_row').with_columns(
+            pl.col('dcoilwtico').forward_fill().backward_fill().fill_null(0),
+            pl.col('onpromotion').fill_null(0).cast(pl.Int64),
+        )
+        return lf
+
+    def merge(self, data):
+        """Eager merge returning pandas (drop-in for DataLoader.merge_data)."""
+        df = self.merge_lazy(data).collect().to_pandas()
+        print(f"Data merged (polars). Shape: {df.shape}")
+        return df
+
+    # ------------------------------------------------------------------
+    # Features
+    # ------------------------------------------------------------------
+
+    def features_lazy(self, lf, holidays_df=None, include_lags=True):
+        """Lazy equivalent of FeatureEngineer.create_features."""
+        # Joins below do not preserve row order; restore it at the end
+        lf = self._ensure_datetime(self.to_lazy(lf)).with_row_index('_row')
+        schema = lf.collect_schema()
+
+        defaults = {'sales': 0, 'onpromotion': 0, 'dcoilwtico': 0.0,
+                    'is_holiday': 0, 'transactions': 0}
+        lf = lf.with_columns([pl.lit(v).alias(c) for c, v in defaults.items() if c not in schema])
+
+        # Time
+        d = pl.col('date')
+        is_month_end = d.dt.day() == d.dt.month_end().dt.day()
+        lf = lf.with_columns(
+            (d.dt.weekday() - 1).alias('day_of_week'),
+            d.dt.day().alias('day_of_month'),
+            d.dt.week().alias('week_of_year'),
+            d.dt.month().alias('month'),
+            d.dt.quarter().alias('quarter'),
+            (d.dt.day() == 1).cast(pl.Int64).alias('is_month_start'),
+            is_month_end.cast(pl.Int64).alias('is_month_end'),
+            (is_month_end & (d.dt.month() % 3 == 0)).cast(pl.Int64).alias('is_quarter_end'),
+        ).with_columns(
+            ((pl.col('day_of_month') == 15) | (pl.col('is_month_end') == 1)).cast(pl.Int64).alias('is_payday')
+        )
+
+        # Oil — date-level: one price per calendar day, rolled over days
+        calendar = (
+            lf.select(pl.col('date').min().alias('lo'), pl.col('date').max().alias('hi'))
+            .select(pl.datetime_ranges('lo', 'hi', interval='1d', time_unit='ns').alias('date'))
+            .explode('date')
+        )
+        oil = pl.col('dcoilwtico')
+        oil_dtype = lf.collect_schema()['dcoilwtico']
+        daily_oil = (
+            calendar.join(
+                lf.filter(oil.is_not_null()).group_by('date').agg(oil.cast(pl.Float64).last().alias('_oil')),
+                on='date', how='left'
+            )
+            .sort('date')
+            .with_columns(pl.col('_oil').forward_fill().backward_fill().fill_null(0))
+            .with_columns(
+                pl.col('_oil').rolling_mean(7, min_samples=1).alias('oil_price_7d_ma'),
+                pl.col('_oil').rolling_mean(30, min_samples=1).alias('oil_price_30d_ma'),
+                pl.col('_oil').rolling_std(7, min_samples=1).fill_null(0).fill_nan(0).alias('oil_price_volatility'),
+                pl.col('_oil').diff(7).fill_null(0).alias('oil_price_trend'),
+            )
+        )
+        lf = (
+            lf.join(daily_oil, on='date', how='left')
+            .with_columns(pl.col('_oil').cast(oil_dtype).alias('dcoilwtico'))
+            .drop('_oil')
+        )
+
+        # Transactions — per (store, day), rolled over each store's calendar
+        txn = pl.col('transactions')
+        lf = lf.with_columns(txn.fill_null(0))
+        keys = ['store_nbr'] if 'store_nbr' in schema else []
+        grid = lf.select(keys).unique().join(calendar, how='cross') if keys else calendar
+        daily_txn = (
+            grid.join(
+                lf.group_by(keys + ['date']).agg(txn.cast(pl.Float64).last().alias('_txn')),
+                on=keys + ['date'], how='left'
+            )
+            .sort(keys + ['date'])
+            .with_columns(
+                (pl.col('_txn').rolling_mean(7, min_samples=1).over(keys) if keys
+                 else pl.col('_txn').rolling_mean(7, min_samples=1)).alias('txn_7d_ma')
+            )
+            .drop('_txn')
+        )
+        lf = lf.join(daily_txn, on=keys + ['date'], how='left').with_columns(
+            pl.when(pl.col('txn_7d_ma') > 0)
+            .then(txn / pl.col('txn_7d_ma'))
+            .otherwise(1.0).alias('txn_deviation')
+        )
+
+        # Holidays
+        if holidays_df is not None:
+            lf = self._holiday_features(lf, holidays_df)
+        else:
+            lf = lf.with_columns([
+                pl.lit(v).alias(c) for c, v in [
+                    ('is_national_holiday', 0), ('is_regional_holiday', 0),
+                    ('days_to_next_holiday', 30), ('days_since_last_holiday', 30),
+                ] if c not in schema
+            ])
+
+        # Lags & rolling (per store×family, in row order like groupby().shift).
+        # The joins above do not guarantee row order, so restore it first
+        if include_lags and 'store_nbr' in schema and 'family' in schema:
+            group = ['store_nbr', 'family']
+            sales = pl.col('sales')
+            lf = lf.sort('_row').with_columns([
+                sales.shift(lag).over(group).cast(pl.Float32).alias(f'sales_lag_{lag}')
+                for lag in self.lag_days
+            ])
+            roll = []
+            shifted = sales.shift(1)
+            for w in self.rolling_windows:
+                for stat in self.rolling_stats:
+                    expr = getattr(shifted, f'rolling_{stat}')(w, min_samples=1).over(group)
+                    if stat == 'std':
+                        expr = expr.fill_null(0).fill_nan(0)
+                    roll.append(expr.cast(pl.Float32).alias(f'sales_roll_{stat}_{w}'))
+            for span in self.ewm_spans:
+                # pandas carries the last mean across NaNs; polars emits null there
+                roll.append(shifted.ewm_mean(span=span, adjust=True, ignore_nulls=False)
+                            .forward_fill().over(group).cast(pl.Float32).alias(f'sales_ewm_{span}'))
+            lf = lf.with_columns(roll)
+
+        return lf.sort('_row').drop('_row')
+
+    def _holiday_features(self, lf, holidays_df):
+        hol = self._ensure_datetime(self.to_lazy(holidays_df)).filter(
+            pl.col('transferred') == False  # noqa: E712
+        )
+        national = hol.filter(pl.col('locale') == 'National').select('date').unique()
+        regional = hol.filter(pl.col('locale') == 'Regional').select('date').unique()
+        all_dates = hol.select('date').unique().sort('date')
+
+        lf = (
+            lf.join(national.with_columns(pl.lit(1, dtype=pl.Int64).alias('is_national_holiday')),
+                  on='date', how='left')
+            .join(regional.with_columns(pl.lit(1, dtype=pl.Int64).alias('is_regional_holiday')),
+                  on='date', how='left')
+            .with_columns(pl.col('is_national_holiday', 'is_regional_holiday').fill_null(0))
+        )
+
+        # Nearest holiday on each side via as-of joins on the sorted date list
+        nxt = all_dates.with_columns(pl.col('date').alias('_next'))
+        prv = all_dates.with_columns(pl.col('date').alias('_prev'))
+        lf = (
+            lf.sort('date')
+            .join_asof(nxt, on='date', strategy='forward')
+            .join_asof(prv, on='date', strategy='backward')
+            .with_columns(
+                ((pl.col('_next') - pl.col('date')).dt.total_days()).fill_null(30).alias('days_to_next_holiday'),
+                ((pl.col('date') - pl.col('_prev')).dt.total_days()).fill_null(30).alias('days_since_last_holiday'),
+            )
+            .drop('_next', '_prev')
+            .sort('_row')
+        )
+
+        if 'is_holiday' not in lf.collect_schema():
+            lf = lf.with_columns(
+                (pl.col('is_national_holiday') | pl.col('is_regional_holiday')).cast(pl.Int64).alias('is_holiday')
+            )
+        return lf
+
+    def create_features(self, df, holidays_df=None, include_lags=True):
+        """Eager features returning pandas (drop-in for FeatureEngineer.create_features)."""
+        print("Engineering features (polars)...")
+        out = self.features_lazy(df, holidays_df, include_lags).collect().to_pandas()
+        print(f"Features created: {len(out.columns)} columns, {len(out)} rows")
+        return out
+
+    # ------------------------------------------------------------------
+    # Model boundary
+    # ------------------------------------------------------------------
+
+    def lgbm_matrix(self, lf, feature_cols, cat_cols=(), target_col='sales'):
+        """
+        Collect the feature plan straight into the (X, y) pandas pair used by
+        LightGBM — the only pandas conversion in the chain.
+        """
+        lf = self.to_lazy(lf)
+        schema = lf.collect_schema()
+        available = [c for c in feature_cols if c in schema]
+        missing = [c for c in feature_cols if c not in schema]
+        if missing:
+            print(f"[WARNING] Missing columns skipped: {missing}")
+
+        exprs = [pl.col(c).fill_null(0) for c in available]
+        if target_col in schema:
+            exprs.append(pl.col(target_col).fill_null(0).alias('__target__'))
+        out = lf.select(exprs).collect().to_pandas()
+
+        y = out.pop('__target__') if '__target__' in out.columns else None
+        if y is not None:
+            y.name = target_col
+        X = out
+        for col in cat_cols:
+            if col in X.columns:
+                X[col] = X[col].astype('category')
+        # pandas fills NaN (not just nulls) with 0 as well
+        num = X.select_dtypes(include=[np.number]).columns
+        X[num] = X[num].fillna(0)
+        return X, y
+
+    def build_lgbm_data(self, data, holidays_df, feature_cols, cat_cols=(), include_lags=True):
+        """Fused lazy plan: raw tables → merge → features → (X, y)."""
+        lf = self.features_lazy(self.merge_lazy(data), holidays_df, include_lags)
+        return self.lgbm_matrix(lf, feature_cols, cat_cols)
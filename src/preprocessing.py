@@ -5,9 +5,179 @@ Supports LSTM sequences, LightGBM tabular, and TFT dataset preparation.
 
 import numpy as np
 import pandas as pd
+import joblib
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.preprocessing import MinMaxScaler
 import yaml
 
+from .polars_backend import PolarsBackend, polars_available
+
+
+class ScalerBank:
+    """
+    Per-series scaling statistics held as compact (n_series + 1, n_features)
+    arrays; the last row is the global fit, used for unknown series.
+
+    method='minmax' maps each series' [min, max] onto feature_range,
+    method='standard' maps it to zero mean / unit variance. transform and
+    inverse_transform take a per-row series id and work on a whole batch
+    spanning many series in one vectorized call.
+    """
+
+    def __init__(self, method='minmax', feature_range=(0, 1)):
+        if method not in ('minmax', 'standard'):
+            raise ValueError(f"Unknown scaling method: {method}")
+        self.method = method
+        self.feature_range = tuple(feature_range)
+        self.columns = []
+        self.keys = pd.DataFrame()
+        self.offset_ = None   # value mapped to feature_range[0] (min or mean)
+        self.scale_ = None    # multiplier applied after subtracting offset_
+
+    # ------------------------------------------------------------------
+    # Fit / transform
+    # ------------------------------------------------------------------
+
+    def fit(self, data, series_ids=None, keys=None, columns=None):
+        """
+        Parameters
+        ----------
+        data : 2-D array or DataFrame (rows, features)
+        series_ids : per-row series id in 0 .. n_series - 1 (None = one series)
+        keys : optional DataFrame with one row per series id (e.g. store_nbr,
+               family) so series can be looked up by key later
+        columns : feature names (taken from `data` when it is a DataFrame)
+        """
+        if isinstance(data, pd.DataFrame):
+            columns = list(data.columns) if columns is None else columns
+        values = np.asarray(data, dtype=np.float64)
+        ids = np.zeros(len(values), dtype=np.int64) if series_ids is None else np.asarray(series_ids)
+        n_series = int(ids.max()) + 1 if len(ids) else 0
+
+        grouped = pd.DataFrame(values).groupby(ids)
+        if self.method == 'minmax':
+            low = grouped.min().reindex(range(n_series)).values
+            span = grouped.max().reindex(range(n_series)).values - low
+            low = np.vstack([low, np.nanmin(values, axis=0)])
+            span = np.vstack([span, np.nanmax(values, axis=0) - low[-1]])
+            lo, hi = self.feature_range
+            self.offset_ = low
+            self.scale_ = (hi - lo) / np.where(span > 0, span, 1.0)
+        else:
+            mean = grouped.mean().reindex(range(n_series)).values
+            std = grouped.std(ddof=0).reindex(range(n_series)).values
+            mean = np.vstack([mean, np.nanmean(values, axis=0)])
+            std = np.vstack([std, np.nanstd(values, axis=0)])
+            self.offset_ = mean
+            self.scale_ = 1.0 / np.where(std > 0, std, 1.0)
+
+        # Series with no rows keep the global statistics
+        empty = np.isnan(self.offset_)
+        self.offset_[empty] = np.broadcast_to(self.offset_[-1], self.offset_.shape)[empty]
+        self.scale_[empty] = np.broadcast_to(self.scale_[-1], self.scale_.shape)[empty]
+
+        self.columns = list(columns) if columns is not None else list(range(values.shape[1]))
+        self.keys = keys.reset_index(drop=True) if keys is not None else pd.DataFrame(index=range(n_series))
+        return self
+
+    def transform(self, data, series_ids=None, columns=None):
+        """Scale rows with their own series' statistics (series_ids -1 = global)."""
+        offset, scale = self._rows(data, series_ids, columns)
+        return (np.asarray(data, dtype=np.float64) - offset) * scale + self._low
+
+    def inverse_transform(self, data, series_ids=None, columns=None):
+        """
+        Undo transform for a batch of rows from many series.
+
+        `columns` selects a subset of the fitted features (names or positions),
+        so e.g. model outputs for the sales column alone can be un-scaled with
+        inverse_transform(preds, ids, columns=['sales']) — no dummy rows needed.
+        A 1-D `data` holds one value per row for the first selected column.
+        """
+        offset, scale = self._rows(data, series_ids, columns)
+        values = np.asarray(data, dtype=np.float64)
+        if values.ndim == 1:
+            offset, scale = offset[..., 0], scale[..., 0]
+        return (values - self._low) / scale + offset
+
+    def fit_transform(self, data, series_ids=None, keys=None, columns=None):
+        return self.fit(data, series_ids, keys, columns).transform(data, series_ids)
+
+    # ------------------------------------------------------------------
+    # Series lookup / persistence
+    # ------------------------------------------------------------------
+
+    @property
+    def n_series(self):
+        return 0 if self.offset_ is None else len(self.offset_) - 1
+
+    def lookup(self, keys):
+        """
+        Map a DataFrame of key columns (as passed to fit) to series ids;
+        series not seen during fit get -1 (global statistics).
+        """
+        cols = list(self.keys.columns)
+        if not cols:
+            return np.zeros(len(keys), dtype=np.int64)
+        index = pd.MultiIndex.from_frame(self.keys[cols].astype(str))
+        lookup = pd.MultiIndex.from_frame(pd.DataFrame(keys)[cols].astype(str))
+        return index.get_indexer(lookup).astype(np.int64)
+
+    def save(self, path):
+        joblib.dump({
+            'method': self.method,
+            'feature_range': self.feature_range,
+            'columns': self.columns,
+            'keys': self.keys,
+            'offset': self.offset_,
+            'scale': self.scale_,
+        }, path)
+        print(f"Scaler bank ({self.n_series} series) saved to {path}")
+
+    @classmethod
+    def load(cls, path):
+        state = joblib.load(path)
+        bank = cls(state['method'], state['feature_range'])
+        bank.columns = state['columns']
+        bank.keys = state['keys']
+        bank.offset_ = state['offset']
+        bank.scale_ = state['scale']
+        return bank
+
+    @classmethod
+    def from_scaler(cls, scaler, columns=None):
+        """Wrap a fitted sklearn MinMaxScaler as a single-series bank."""
+        bank = cls('minmax', scaler.feature_range)
+        bank.offset_ = np.asarray(scaler.data_min_, dtype=np.float64)[None, :]
+        bank.scale_ = np.asarray(scaler.scale_, dtype=np.float64)[None, :]
+        bank.columns = list(columns) if columns is not None else list(
+            getattr(scaler, 'feature_names_in_', range(bank.offset_.shape[1]))
+        )
+        bank.keys = pd.DataFrame()
+        return bank
+
+    # ------------------------------------------------------------------
+    # PRIVATE
+    # ------------------------------------------------------------------
+
+    @property
+    def _low(self):
+        return self.feature_range[0] if self.method == 'minmax' else 0.0
+
+    def _rows(self, data, series_ids, columns):
+        """Per-row (offset, scale) arrays broadcastable against `data`."""
+        if self.offset_ is None:
+            raise ValueError("ScalerBank is not fitted.")
+        n = len(data)
+        ids = np.full(n, -1, dtype=np.int64) if series_ids is None or self.n_series == 0 \
+            else np.broadcast_to(np.asarray(series_ids, dtype=np.int64), (n,))
+        if columns is None:
+            cols = slice(None)
+        else:
+            cols = [self.columns.index(c) if c in self.columns else int(c) for c in columns]
+        # -1 (unknown series) indexes the last row: the global statistics
+        return self.offset_[ids][:, cols], self.scale_[ids][:, cols]
+
 
 class Preprocessor:
     def __init__(self, config_path='config/config.yaml'):
@@ -16,24 +186,32 @@ class Preprocessor:
 
         self.scaler = MinMaxScaler(feature_range=(0, 1))
         self.look_back = self.config['model']['look_back_days']
+        self.backend = self.config.get('compute', {}).get('backend', 'pandas')
+
+        scaling = self.config['model'].get('scaling', {})
+        self.per_series_scaling = scaling.get('per_series', False)
+        self.scaling_method = scaling.get('method', 'minmax')
 
     # ------------------------------------------------------------------
     # LSTM path — scale + sequence
     # ------------------------------------------------------------------
 
-    def scale_data(self, df, fit=True):
+    def scale_data(self, df, fit=True, series_ids=None, series_keys=None):
         """
-        Scales numeric features using MinMaxScaler.
+        Scales numeric features using MinMaxScaler, or a per-series ScalerBank
+        when model.scaling.per_series is set and `series_ids` is given.
         Ensures 'sales' is the first column.
 
         Parameters
         ----------
         df : DataFrame with numeric columns (target = 'sales')
         fit : bool, True to fit_transform, False to transform only
+        series_ids : optional per-row series id (0 .. n_series - 1)
+        series_keys : optional DataFrame of key columns, one row per series id
 
         Returns
         -------
-        (df_scaled, scaler)
+        (df_scaled, scaler) — scaler is a ScalerBank in per-series mode
         """
         print("Scaling data...")
         df_numeric = df.select_dtypes(include=[np.number]).copy()
@@ -49,7 +227,11 @@ class Preprocessor:
         cols = ['sales'] + [c for c in df_numeric.columns if c != 'sales']
         df_numeric = df_numeric[cols]
 
-        if fit:
+        if self.per_series_scaling and series_ids is not None:
+            if fit or not isinstance(self.scaler, ScalerBank):
+                self.scaler = ScalerBank(self.scaling_method).fit(df_numeric, series_ids, series_keys)
+            scaled = self.scaler.transform(df_numeric, series_ids, columns=cols)
+        elif fit:
             scaled = self.scaler.fit_transform(df_numeric)
         else:
             scaled = self.scaler.transform(df_numeric)
@@ -57,17 +239,82 @@ class Preprocessor:
         df_scaled = pd.DataFrame(scaled, columns=df_numeric.columns)
         return df_scaled, self.scaler
 
-    def create_sequences(self, data):
+    def create_sequences(self, data, series_ids=None):
         """
         Converts data into 3D sequences for LSTM: (Samples, TimeSteps, Features).
         Input: past 'look_back' days → Output: sales on next day.
+
+        Parameters
+        ----------
+        data : 2-D array (rows, features), sales in column 0, rows ordered by
+               date within each series
+        series_ids : optional per-row series id (rows of one series contiguous);
+                     windows that would cross a series boundary are dropped
+
+        Returns
+        -------
+        (X, y) — X is a zero-copy strided view of `data` for a single series;
+        with several series the valid windows are gathered in one vectorized take.
         """
         print("Creating LSTM sequences...")
-        X, y = [], []
-        for i in range(len(data) - self.look_back):
-            X.append(data[i: i + self.look_back])
-            y.append(data[i + self.look_back, 0])  # 0 = sales column
-        return np.array(X), np.array(y)
+        windows, starts = self.sequence_windows(data, series_ids)
+        y = np.asarray(data)[starts + self.look_back, 0]  # 0 = sales column
+        if len(starts) == len(windows) - 1:
+            return windows[:-1], y
+        return windows[starts], y
+
+    def sequence_windows(self, data, series_ids=None):
+        """
+        Zero-copy look-back windows over `data` plus the windows that are valid.
+
+        Window i covers rows i .. i + look_back - 1 and predicts row i + look_back.
+        It is valid when that target row exists and belongs to the same series
+        as row i (series are contiguous, so the whole window is then inside it).
+
+        Returns
+        -------
+        (windows, starts)
+          windows : read-only view of shape (rows - look_back + 1, look_back, features)
+          starts  : int64 array of valid window start rows
+        """
+        data = np.asarray(data)
+        if data.ndim == 1:
+            data = data[:, None]
+        n = len(data)
+        if n <= self.look_back:
+            return np.empty((0, self.look_back, data.shape[1]), dtype=data.dtype), np.empty(0, dtype=np.int64)
+
+        # sliding_window_view puts the window axis last: (n - lb + 1, F, lb) → (n - lb + 1, lb, F)
+        windows = sliding_window_view(data, self.look_back, axis=0).transpose(0, 2, 1)
+
+        starts = np.arange(n - self.look_back, dtype=np.int64)
+        if series_ids is not None:
+            series_ids = np.asarray(series_ids)
+            starts = starts[series_ids[starts] == series_ids[starts + self.look_back]]
+        return windows, starts
+
+    def split_windows_by_date(self, starts, dates, validation_days=None):
+        """
+        Hold out the last `validation_days` target dates for validation.
+
+        Parameters
+        ----------
+        starts : window start rows (from sequence_windows)
+        dates : per-row dates of the data the windows were cut from
+        validation_days : size of the held-out range (defaults to model.validation_days)
+
+        Returns
+        -------
+        (train_starts, val_starts) — windows whose target date falls before /
+        inside the held-out range, across all series.
+        """
+        days = validation_days or self.config['model'].get('validation_days', 28)
+        target_dates = np.asarray(dates, dtype='datetime64[ns]')[starts + self.look_back]
+        if not len(target_dates):
+            return starts, starts[:0]
+        val_start = target_dates.max() - np.timedelta64(days - 1, 'D')
+        is_val = target_dates >= val_start
+        return starts[~is_val], starts[is_val]
 
     # ------------------------------------------------------------------
     # LightGBM path — flat tabular data
@@ -88,6 +335,10 @@ class Preprocessor:
         (X, y) — feature matrix and target array
         """
         print("Preparing LightGBM data...")
+        cat_cols = self.config.get('model', {}).get('lightgbm', {}).get('categorical_features', [])
+
+        if self.backend == 'polars' and polars_available():
+            return PolarsBackend().lgbm_matrix(df, feature_cols, cat_cols, target_col)
 
         # Filter to available columns
         available = [c for c in feature_cols if c in df.columns]
@@ -99,7 +350,6 @@ class Preprocessor:
         y = df[target_col].copy() if target_col in df.columns else None
 
         # Convert categorical columns
-        cat_cols = self.config.get('model', {}).get('lightgbm', {}).get('categorical_features', [])
         for col in cat_cols:
             if col in X.columns:
                 X[col] = X[col].astype('category')
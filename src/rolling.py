@@ -0,0 +1,126 @@
+"""
+Rolling Engine Module — v2.0
+Grouped lag and rolling-window kernels over contiguous per-series arrays.
+
+All functions take values already sorted so that each series is one
+contiguous block, plus `starts` — for every row, the index of the first
+row of its series. Every window for every series is then computed in a
+single vectorized pass (cumulative sums for mean/std, shifted fmin/fmax
+for min/max), instead of one Python-level transform per group.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def series_layout(codes):
+    """
+    Stable sort order that makes each series contiguous.
+
+    Parameters
+    ----------
+    codes : integer series id per row (e.g. groupby(...).ngroup())
+
+    Returns
+    -------
+    (order, starts) — `order` sorts rows by series keeping their original
+    order within a series; `starts[i]` is the first sorted index of row i's series.
+    """
+    codes = np.asarray(codes)
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    n = len(sorted_codes)
+    is_start = np.ones(n, dtype=bool)
+    is_start[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    starts = np.maximum.accumulate(np.where(is_start, np.arange(n), 0))
+    return order, starts
+
+
+def grouped_lag(values, starts, lag):
+    """out[i] = values[i - lag] within the same series, NaN otherwise."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if lag == 0:
+        return values.copy()
+    if lag < len(values):
+        out[lag:] = values[:-lag]
+    pos = np.arange(len(values)) - starts
+    out[pos < lag] = np.nan
+    return out
+
+
+def grouped_rolling(values, starts, window, stats=('mean', 'std'), shift=1):
+    """
+    Trailing rolling statistics per series, equivalent to
+    groupby(...).transform(lambda x: x.shift(shift).rolling(window, min_periods=1).<stat>()).
+
+    NaNs are skipped (as pandas does); a window with no valid values is NaN,
+    and std needs at least two values (ddof=1).
+
+    Returns
+    -------
+    dict {stat: float64 array}
+    """
+    x = grouped_lag(values, starts, shift) if shift else np.asarray(values, dtype=np.float64)
+    n = len(x)
+    idx = np.arange(n)
+    pos = idx - starts
+    valid = ~np.isnan(x)
+    out = {}
+
+    if 'mean' in stats or 'std' in stats:
+        # Centre each series on its own mean so the running sums stay small
+        # and the variance formula does not lose precision
+        series_id = np.cumsum(np.r_[True, starts[1:] != starts[:-1]]) - 1 if n else starts
+        counts_g = np.bincount(series_id, weights=valid, minlength=series_id.max(initial=-1) + 1)
+        sums_g = np.bincount(series_id, weights=np.where(valid, x, 0.0), minlength=len(counts_g))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            centre = np.where(counts_g > 0, sums_g / counts_g, 0.0)[series_id]
+        xc = np.where(valid, x - centre, 0.0)
+
+        lo = np.maximum(idx + 1 - window, starts)
+        csum = np.concatenate(([0.0], np.cumsum(xc)))
+        ccount = np.concatenate(([0], np.cumsum(valid)))
+        total = csum[idx + 1] - csum[lo]
+        count = ccount[idx + 1] - ccount[lo]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if 'mean' in stats:
+                out['mean'] = np.where(count > 0, total / count + centre, np.nan)
+            if 'std' in stats:
+                csq = np.concatenate(([0.0], np.cumsum(xc * xc)))
+                total_sq = csq[idx + 1] - csq[lo]
+                var = (total_sq - total * total / count) / (count - 1)
+                out['std'] = np.where(count > 1, np.sqrt(np.maximum(var, 0.0)), np.nan)
+
+    if 'min' in stats or 'max' in stats:
+        lo_val = np.full(n, np.inf)
+        hi_val = np.full(n, -np.inf)
+        for k in range(min(window, n)):
+            shifted = np.full(n, np.nan)
+            shifted[k:] = x[:n - k] if k else x
+            shifted[pos < k] = np.nan
+            # fmin/fmax ignore NaN, matching pandas' skip-NaN windows
+            lo_val = np.fmin(lo_val, shifted)
+            hi_val = np.fmax(hi_val, shifted)
+        empty = np.isinf(lo_val)
+        if 'min' in stats:
+            out['min'] = np.where(empty, np.nan, lo_val)
+        if 'max' in stats:
+            out['max'] = np.where(empty, np.nan, hi_val)
+
+    return out
+
+
+def grouped_ewm(values, starts, span, shift=1):
+    """
+    Exponentially weighted mean per series (adjust=True), equivalent to
+    groupby(...).transform(lambda x: x.shift(shift).ewm(span=span).mean()).
+    Runs pandas' compiled grouped EWM once over all series.
+    """
+    x = grouped_lag(values, starts, shift) if shift else np.asarray(values, dtype=np.float64)
+    return (
+        pd.Series(x).groupby(starts, sort=False)
+        .ewm(span=span).mean()
+        .to_numpy()
+    )
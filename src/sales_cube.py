@@ -0,0 +1,234 @@
+"""
+Sales Cube Module — v2.0
+Dense store × family × day panel stored as memory-mapped .npy arrays.
+
+Standalone for now: FeatureEngineer and Pipeline still compute features on
+DataFrames and never build or read the cube (data.cube_path is only its
+default location). Build one explicitly with SalesCube.build().
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+import yaml
+from numpy.lib.format import open_memmap
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class SalesCube:
+    """
+    Memory-mapped panel built from DataLoader.merge_data output.
+
+    Layout (float32, NaN = no observation for that cell):
+      sales.npy, onpromotion.npy : (n_stores, n_families, n_days)
+      transactions.npy           : (n_stores, n_days) — transactions are per store
+      index.json                 : store/family/date index maps
+
+    Opening with mmap_mode='r' lets several processes share one zero-copy
+    view of the data; slices, lags and windows are views shifted along the
+    day axis.
+    """
+
+    PANEL_FIELDS = ('sales', 'onpromotion')
+    STORE_FIELDS = ('transactions',)
+
+    def __init__(self, path, arrays, stores, families, start_date):
+        self.path = path
+        self.arrays = arrays
+        self.stores = list(stores)
+        self.families = list(families)
+        self.start_date = pd.Timestamp(start_date)
+        self.n_days = next(iter(arrays.values())).shape[-1]
+
+        self.store_index = {s: i for i, s in enumerate(self.stores)}
+        self.family_index = {f: i for i, f in enumerate(self.families)}
+
+    # ------------------------------------------------------------------
+    # Build / open
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, df, path=None, config_path='config/config.yaml', transactions=None):
+        """
+        Write the cube files for a merged DataFrame and return it opened read-only.
+
+        Parameters
+        ----------
+        df : output of DataLoader.merge_data (date, store_nbr, family, sales, ...)
+        path : output directory (defaults to data.cube_path in config)
+        transactions : optional raw transactions table (date, store_nbr,
+                       transactions). merge_data fills unobserved store-days
+                       with 0, so without it 0 in df is stored as NaN (the
+                       raw table never records 0 transactions).
+        """
+        path = path or cls._default_path(config_path)
+        os.makedirs(path, exist_ok=True)
+        print(f"Building sales cube at {path}...")
+
+        dates = pd.to_datetime(df['date'])
+        start = dates.min().normalize()
+        day = ((dates.values - np.datetime64(start)) // np.timedelta64(1, 'D')).astype(np.int64)
+        n_days = int(day.max()) + 1
+
+        stores = np.sort(df['store_nbr'].unique())
+        families = sorted(df['family'].astype(str).unique().tolist())
+        s_idx = np.searchsorted(stores, df['store_nbr'].values)
+        f_idx = np.searchsorted(np.array(families, dtype=object), df['family'].astype(str).values)
+        shape = (len(stores), len(families), n_days)
+
+        for field in cls.PANEL_FIELDS:
+            if field not in df.columns:
+                continue
+            cube = open_memmap(os.path.join(path, f'{field}.npy'), mode='w+',
+                               dtype=np.float32, shape=shape)
+            cube[:] = np.nan
+            cube[s_idx, f_idx, day] = df[field].values
+            cube.flush()
+            del cube
+
+        for field in cls.STORE_FIELDS:
+            if field not in df.columns:
+                continue
+            cube = open_memmap(os.path.join(path, f'{field}.npy'), mode='w+',
+                               dtype=np.float32, shape=shape[::2])
+            cube[:] = np.nan
+            if transactions is not None:
+                txn_day = ((pd.to_datetime(transactions['date']).values - np.datetime64(start))
+                           // np.timedelta64(1, 'D')).astype(np.int64)
+                txn_store = np.searchsorted(stores, transactions['store_nbr'].values)
+                inside = ((txn_day >= 0) & (txn_day < n_days)
+                          & np.isin(transactions['store_nbr'].values, stores))
+                cube[txn_store[inside], txn_day[inside]] = transactions[field].values[inside]
+            else:
+                values = df[field].values.astype(np.float32)
+                cube[s_idx, day] = np.where(values == 0, np.nan, values)
+            cube.flush()
+            del cube
+
+        index = {
+            'stores': [int(s) for s in stores],
+            'families': families,
+            'start_date': start.strftime('%Y-%m-%d'),
+            'n_days': n_days,
+        }
+        with open(os.path.join(path, 'index.json'), 'w') as f:
+            json.dump(index, f, indent=2)
+
+        print(f"Sales cube: {shape[0]} stores × {shape[1]} families × {shape[2]} days")
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path=None, mmap_mode='r', config_path='config/config.yaml'):
+        """Open an existing cube; arrays are memory-mapped, not read into RAM."""
+        path = path or cls._default_path(config_path)
+        with open(os.path.join(path, 'index.json'), 'r') as f:
+            index = json.load(f)
+
+        arrays = {}
+        for field in cls.PANEL_FIELDS + cls.STORE_FIELDS:
+            fpath = os.path.join(path, f'{field}.npy')
+            if os.path.exists(fpath):
+                arrays[field] = np.load(fpath, mmap_mode=mmap_mode)
+        return cls(path, arrays, index['stores'], index['families'], index['start_date'])
+
+    @staticmethod
+    def _default_path(config_path):
+        with open(config_path, 'r') as f:
+            config = yaml.safe_load(f)
+        return config['data'].get(
+            'cube_path', os.path.join(config['data'].get('processed_path', 'data/processed'), 'cube')
+        )
+
+    # ------------------------------------------------------------------
+    # Index helpers
+    # ------------------------------------------------------------------
+
+    @property
+    def dates(self):
+        return pd.date_range(self.start_date, periods=self.n_days, freq='D')
+
+    def day_index(self, date):
+        """Day ordinal of a date on the cube's axis."""
+        return int((pd.Timestamp(date) - self.start_date).days)
+
+    def _day_slice(self, start=None, end=None):
+        # Clamp both ends into [0, n_days]: a negative stop would count from the end
+        lo = 0 if start is None else min(max(self.day_index(start), 0), self.n_days)
+        hi = self.n_days if end is None else max(min(self.day_index(end) + 1, self.n_days), 0)
+        return slice(lo, hi)
+
+    def _select(self, values, index):
+        if values is None:
+            return slice(None)
+        if isinstance(values, (list, tuple, np.ndarray)):
+            return [index[v] for v in values]
+        return index[values]
+
+    # ------------------------------------------------------------------
+    # Accessors
+    # ------------------------------------------------------------------
+
+    def slice(self, field='sales', stores=None, families=None, start=None, end=None):
+        """
+        Sub-array for the given stores/families/date range (inclusive).
+        Scalar store/family drops that axis; basic slices stay zero-copy views.
+        """
+        arr = self.arrays[field]
+        days = self._day_slice(start, end)
+        s = self._select(stores, self.store_index)
+        if field in self.STORE_FIELDS:
+            return arr[s, days]
+        f = self._select(families, self.family_index)
+        if isinstance(s, list) and isinstance(f, list):
+            return arr[np.ix_(s, f)][..., days]
+        return arr[s, f, days]
+
+    def series(self, store_nbr, family, field='sales', start=None, end=None):
+        """One (store, family) daily series as a pandas Series indexed by date."""
+        values = self.slice(field, store_nbr, family, start, end)
+        days = self._day_slice(start, end)
+        return pd.Series(np.asarray(values), index=self.dates[days], name=field)
+
+    def lag(self, k, field='sales', start=None, end=None):
+        """
+        Calendar-day lag k as a zero-copy view: element i holds the value k
+        days before day lo + i. The first k days of the cube have no lagged
+        value, so lo = max(start, day k) — the result lines up with
+        slice(field, start=self.dates[lo], end=end).
+        """
+        days = self._day_slice(start, end)
+        lo = max(days.start, k)
+        hi = max(days.stop, lo)
+        return self.arrays[field][..., lo - k:hi - k]
+
+    def windows(self, window, field='sales'):
+        """
+        Zero-copy trailing windows: shape (..., n_days - window + 1, window),
+        where windows[..., i, :] covers days i .. i + window - 1.
+        """
+        return sliding_window_view(self.arrays[field], window, axis=-1)
+
+    def rolling_mean(self, window, field='sales', shift=1):
+        """
+        Trailing rolling mean per series (NaN-aware), shifted by `shift` days
+        to match FeatureEngineer's leakage-free rolling features.
+        """
+        arr = np.asarray(self.arrays[field])
+        if shift:
+            # NaN for the first `shift` days, then the lagged view
+            pad = min(shift, self.n_days)
+            arr = np.concatenate([np.full(arr.shape[:-1] + (pad,), np.nan, dtype=arr.dtype),
+                                  self.lag(shift, field)], axis=-1)
+        values = np.nan_to_num(arr, nan=0.0).astype(np.float64)
+        counts = (~np.isnan(arr)).astype(np.float64)
+
+        def trailing_sum(x):
+            c = np.cumsum(x, axis=-1)
+            c[..., window:] = c[..., window:] - c[..., :-window]
+            return c
+
+        total, n = trailing_sum(values), trailing_sum(counts)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(n > 0, total / n, np.nan)
+        return mean.astype(np.float32)
@@ -0,0 +1,228 @@
+"""
+Tuning Module — v2.0
+Time-budgeted, per-family hyperparameter search for LightGBMModel: random
+sampling, trials in parallel processes, median pruning on the validation
+curve, results written back to the ModelRegistry. Runs fully locally.
+"""
+
+import os
+import time
+import zlib
+import shutil
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+import yaml
+
+from .model import LightGBMModel, ModelRegistry
+from .lgbm_training import LGBMDatasetCache, run_trial
+
+
+DEFAULT_SEARCH_SPACE = {
+    'num_leaves': [15, 255, 'log_int'],
+    'max_depth': [4, 12, 'int'],
+    'learning_rate': [0.01, 0.2, 'log'],
+    'min_child_samples': [5, 100, 'log_int'],
+    'subsample': [0.5, 1.0, 'uniform'],
+    'colsample_bytree': [0.5, 1.0, 'uniform'],
+    'reg_lambda': [1e-3, 10.0, 'log'],
+}
+
+
+class LightGBMTuner:
+    """
+    Random search over model.lightgbm.tuning.search_space, run per family.
+
+    Every family is tuned on the same 'holdout' split LightGBMModel trains on,
+    so trials read the binned Datasets from its cache instead of re-binning;
+    the trial tasks carry only the Dataset digest, never the data. Trial 0 of
+    each family re-scores the family's current params (the baseline). Trials
+    are handed out round-robin over the families to n_workers processes with
+    cpu_budget // n_workers threads each. Every prune_interval rounds a trial's
+    best validation RMSE so far is compared with the median of the family's
+    finished trials at the same round; once prune_warmup trials have finished,
+    a trial worse than that median is stopped. Nothing new starts after
+    time_budget_s, and running trials stop at it.
+    """
+
+    def __init__(self, config_path='config/config.yaml', model=None, registry=None):
+        with open(config_path, 'r') as f:
+            self.config = yaml.safe_load(f)
+
+        tune_cfg = self.config['model']['lightgbm'].get('tuning', {})
+        self.n_trials = tune_cfg.get('n_trials', 30)
+        self.time_budget = tune_cfg.get('time_budget_s', 3600)
+        self.prune_interval = tune_cfg.get('prune_interval', 25)
+        self.prune_warmup = tune_cfg.get('prune_warmup', 4)
+        self.seed = tune_cfg.get('seed', 42)
+        self.search_space = tune_cfg.get('search_space') or DEFAULT_SEARCH_SPACE
+
+        self.model = model or LightGBMModel(config_path)
+        self.registry = registry or ModelRegistry(config_path)
+
+        cpu_count = os.cpu_count() or 1
+        self.n_workers = tune_cfg.get('n_workers', 0) or cpu_count
+        self.cpu_budget = self.model.cpu_budget
+        self.threads_per_trial = max(1, self.cpu_budget // self.n_workers)
+
+    # ------------------------------------------------------------------
+    # PUBLIC API
+    # ------------------------------------------------------------------
+
+    def tune(self, df, feature_cols, target_col='sales', val_ratio=0.15, time_budget=None):
+        """
+        Tune every family in df and save the best params to the registry.
+
+        Parameters
+        ----------
+        df : feature frame (as passed to LightGBMModel.train_per_family)
+        feature_cols : list of feature column names
+        target_col : target column name
+        val_ratio : held-out share of each family's rows (the training cut)
+        time_budget : seconds for the whole search (default tuning.time_budget_s)
+
+        Returns
+        -------
+        dict of {family: {'params', 'score', 'baseline_score', 'best_iteration', ...}}
+        """
+        t0 = time.time()
+        deadline = t0 + (time_budget or self.time_budget)
+
+        # Workers can only share Datasets through disk: use a scratch cache if
+        # the registry one is disabled
+        scratch = None
+        datasets = self.model.datasets
+        if self.n_workers > 1 and not datasets.path:
+            scratch = tempfile.mkdtemp(prefix='lgbm_tuning_')
+            datasets = LGBMDatasetCache(scratch, self.model.dataset_params)
+
+        try:
+            families = {}
+            for fam, X_train, y_train, X_val, y_val in self.model.holdout_splits(df, feature_cols,
+                                                                                 target_col, val_ratio):
+                digest = datasets.digest(X_train, y_train, X_val, y_val)
+                datasets.get(fam, 'holdout', X_train, y_train, X_val, y_val, digest=digest)
+                families[fam] = digest
+
+            print(f"🔎 Tuning {len(families)} families — up to {self.n_trials} trials each, "
+                  f"{deadline - time.time():.0f}s budget, {self.n_workers} processes × "
+                  f"{self.threads_per_trial} threads")
+            trials = self._run(families, datasets, deadline)
+        finally:
+            if scratch:
+                shutil.rmtree(scratch, ignore_errors=True)
+
+        best = self._best(trials)
+        self.registry.save_tuned_params(best, trials)
+        self.model.family_params.update(best)
+
+        states = [t['state'] for t in trials]
+        print(f"🏁 Tuning complete in {time.time() - t0:.1f}s — {len(trials)} trials "
+              f"({states.count('complete')} complete, {states.count('pruned')} pruned, "
+              f"{states.count('timeout')} timed out)")
+        return best
+
+    def sample(self, rng):
+        """Draw one set of param overrides from the search space."""
+        params = {}
+        for name, (low, high, kind) in self.search_space.items():
+            if kind in ('log', 'log_int'):
+                value = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+            else:
+                value = float(rng.uniform(low, high))
+            if kind in ('int', 'log_int'):
+                value = int(round(value))
+            params[name] = value
+        if 'subsample' in params:
+            params['subsample_freq'] = 1  # bagging is off unless a frequency is set
+        return params
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _run(self, families, datasets, deadline):
+        """Run trials round-robin over families until done or out of time."""
+        names = list(families)
+        # Seeded per family and by its trials so far, so a re-run samples new candidates
+        rngs = {fam: np.random.default_rng([self.seed, zlib.crc32(str(fam).encode()), self._trials_so_far(fam)])
+                for fam in names}
+        submitted = {fam: 0 for fam in names}
+        curves = {fam: [] for fam in names}  # finished trials' learning curves
+        trials = []
+
+        def next_task():
+            open_families = [fam for fam in names if submitted[fam] < self.n_trials]
+            if not open_families or time.time() >= deadline:
+                return None
+            fam = min(open_families, key=lambda f: submitted[f])
+            number = submitted[fam]
+            submitted[fam] += 1
+            overrides = (self.model.family_params.get(fam, {}).get('params', {}) if number == 0
+                         else self.sample(rngs[fam]))
+            return {
+                'family': fam, 'trial': number, 'overrides': overrides,
+                'params': dict(self.model.params, **overrides, n_jobs=self.threads_per_trial),
+                'early_stopping': self.model.early_stopping,
+                'cache': (datasets.path, datasets.params), 'digest': families[fam],
+                'curves': list(curves[fam]), 'prune_interval': self.prune_interval,
+                'prune_warmup': self.prune_warmup, 'deadline': deadline,
+            }
+
+        def record(result):
+            trials.append(result)
+            if result['state'] == 'complete':
+                curves[result['family']].append(result['curve'])
+            print(f"  → {result['family']} #{result['trial']}: {result['state']}, "
+                  f"rmse {result['score']:.4f} @ {result['best_iteration']} "
+                  f"({result['seconds']:.1f}s)")
+
+        if self.n_workers == 1:
+            task = next_task()
+            while task is not None:
+                record(run_trial(task, datasets))
+                task = next_task()
+            return trials
+
+        running = set()
+        with ProcessPoolExecutor(max_workers=self.n_workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            while True:
+                while len(running) < self.n_workers:
+                    task = next_task()
+                    if task is None:
+                        break
+                    running.add(pool.submit(run_trial, task))
+                if not running:
+                    break
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record(future.result())
+        return trials
+
+    def _best(self, trials):
+        """Lowest-RMSE complete trial per family."""
+        best = {}
+        for fam in dict.fromkeys(t['family'] for t in trials):
+            fam_trials = [t for t in trials if t['family'] == fam]
+            done = [t for t in fam_trials if t['state'] == 'complete']
+            if not done:
+                print(f"[WARNING] No complete trial for {fam} — params left unchanged")
+                continue
+            winner = min(done, key=lambda t: t['score'])
+            baseline = next((t for t in done if t['trial'] == 0), None)
+            best[fam] = {
+                'params': winner['overrides'],
+                'score': winner['score'],
+                'baseline_score': baseline['score'] if baseline else None,
+                'best_iteration': winner['best_iteration'],
+                'trial': winner['trial'],
+                'n_trials': len(fam_trials),
+                'total_trials': self._trials_so_far(fam) + len(fam_trials),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }
+        return best
+
+    def _trials_so_far(self, family):
+        return self.model.family_params.get(family, {}).get('total_trials', 0)